@@ -61,14 +61,56 @@ class SSEManager:
         except asyncio.CancelledError:
             self.remove_subscriber(queue)
 
+    def reset_evidence(self):
+        """새 게임(사건)을 시작할 때 이전 게임의 증거 목록 비우기 (증거 id가 게임마다 1번부터 다시 시작함)"""
+        with self.evidence_lock:
+            self.initial_evidence = []
+
+    def _store_evidence(self, evidence: Dict):
+        # 같은 id는 새 상태로 교체, 없으면 추가 (evidence_lock 안에서 호출)
+        for i, stored in enumerate(self.initial_evidence):
+            if stored.get("id") == evidence.get("id"):
+                self.initial_evidence[i] = evidence
+                return
+        self.initial_evidence.append(evidence)
+
     async def add_evidence(self, evidence: Dict):
         """새로운 증거를 저장하고 모든 구독자에게 즉시 브로드캐스트"""
         # 초기 증거 목록에 저장
         with self.evidence_lock:
-            self.initial_evidence.append(evidence)
+            self._store_evidence(evidence)
         # 구독자들에게 전송
         await self.broadcast('evidence', evidence)
 
+    async def update_evidence(self, evidence: Dict, delta: Dict):
+        """
+        저장된 증거를 최신 상태로 바꾸고 구독자에게는 변경분(delta)만 전송
+        구독자는 자기 리비전이 delta["rev"] - 1일 때만 적용하고, 아니면 GET /evidence/{id}/state로 다시 받음
+        """
+        with self.evidence_lock:
+            self._store_evidence(evidence)
+        await self.broadcast('evidence_delta', delta)
+
+    def get_evidence(self, evidence_id: int) -> Optional[Dict]:
+        """재동기화용 증거 전체 상태"""
+        with self.evidence_lock:
+            for evidence in self.initial_evidence:
+                if evidence.get("id") == evidence_id:
+                    return evidence
+        return None
+
+    async def update_evidence_picture(self, evidence_id: int, picture: str, frame: Dict = None):
+        """저장된 증거의 그림 경로(와 e-ink 프레임 정보)를 바꾸고 구독자에게 알림 (로컬 픽토그램 → Replicate 그림 교체)"""
+        with self.evidence_lock:
+            for evidence in self.initial_evidence:
+                # 증거 목록은 게임마다 비우므로 현재 게임의 증거 하나만 바꿈
+                if evidence.get("id") == evidence_id:
+                    evidence["picture"] = picture
+                    if frame:
+                        evidence["frame"] = frame
+                    break
+        await self.broadcast('evidence_picture', {"id": evidence_id, "picture": picture, "frame": frame})
+
 # WebSocket 관리 클래스
 class WebSocketManager:
     def __init__(self):
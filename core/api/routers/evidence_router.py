@@ -1,7 +1,8 @@
 # routers/evidence_router.py
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from api.manager import sse_manager, state_manager
+from tools.eink_frame import EinkFrameStore
 import asyncio
 
 router = APIRouter(prefix="/evidence", tags=["Evidence"])
@@ -26,6 +27,36 @@ async def evidence_ack(data: dict):
         return {"id" : data.get("id"), "status": "fail"}
 
 
+@router.get("/{id}/frame", response_class=Response)
+async def evidence_frame_latest(id: int):
+    rev = EinkFrameStore.latest_rev(id)
+    if rev is None:
+        raise HTTPException(status_code=404, detail="Frame not found")
+    return await evidence_frame(id, rev)
+
+@router.get("/{id}/frame/{rev}", response_class=Response)
+async def evidence_frame(id: int, rev: int):
+    # 미러링 + 1-bit 패킹된 400x300 프레임 (15000 bytes), 하드웨어는 그대로 디스플레이로 전송
+    frame = EinkFrameStore.get(id, rev)
+    if frame is None:
+        latest = EinkFrameStore.latest_rev(id)
+        if latest is None:
+            raise HTTPException(status_code=404, detail="Frame not found")
+        raise HTTPException(status_code=409, detail=f"Stale revision (latest: {latest})")
+    return Response(
+        content=frame,
+        media_type="application/octet-stream",
+        headers={"ETag": f'"{id}-{rev}"', "X-Frame-Rev": str(rev)}
+    )
+
+@router.get("/{id}/state")
+async def evidence_state(id: int):
+    # 리비전이 맞지 않는 delta를 받은 구독자의 재동기화용 전체 상태
+    evidence = sse_manager.get_evidence(id)
+    if evidence is None:
+        raise HTTPException(status_code=404, detail="Evidence not found")
+    return evidence
+
 @router.post("/{id}")
 async def handle_nfc(id: str):
     if id in ["1", "2", "3", "4"] :
@@ -0,0 +1,53 @@
+"""
+사건 생성 방식 비교 벤치마크
+- staged : 사건 개요 → 등장인물 → 증거품 → 사건의 진실 (LLM 4회 호출)
+- bundle : 하나의 structured output 호출 (bundle_builder.py)
+같은 캐릭터 조합으로 두 방식을 번갈아 실행하고 소요 시간과 토큰 사용량을 비교함
+이미지 생성(Replicate)은 두 방식이 같으므로 제외
+
+실행 (core 디렉토리에서) :
+    python -m case_generation.benchmark --runs 3
+"""
+import argparse
+from typing import Dict, List
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from tools.bench import alternate, measure, report
+
+
+def run_staged(selected_characters: List[Dict]):
+    from case_generation.case_pool import build_case_bundle
+    return build_case_bundle(selected_characters, with_images=False, mode="staged")
+
+
+def run_bundle(selected_characters: List[Dict]):
+    from case_generation.bundle_builder import generate_case_bundle
+    return generate_case_bundle(selected_characters, with_images=False)
+
+
+def main(runs: int = 3):
+    from case_generation.case_builder import select_random_characters
+
+    runners = {"staged": run_staged, "bundle": run_bundle}
+    results = {"staged": [], "bundle": []}
+    for i in range(runs):
+        selected_characters = select_random_characters(4)
+        print(f"[benchmark] {i + 1}/{runs}: {[c['name'] for c in selected_characters]}")
+        for name in alternate(["staged", "bundle"], i):
+            try:
+                r = measure(runners[name], selected_characters)
+            except Exception as e:
+                print(f"  - {name}: 실패 ({e})")
+                continue
+            results[name].append(r)
+            print(f"  - {name}: {r['seconds']:.2f}s, {r['total_tokens']} tokens")
+
+    report(results, baseline="staged", candidate="bundle")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="staged vs bundle 사건 생성 벤치마크")
+    parser.add_argument("--runs", type=int, default=3)
+    main(parser.parse_args().runs)
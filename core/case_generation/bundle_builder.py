@@ -0,0 +1,102 @@
+"""
+사건 번들 한 번에 생성하기 (one-shot 모드)
+- 사건 개요, 등장인물, 증거품, 사건의 진실을 하나의 JSON 스키마로 한 번에 요청
+- pydantic으로 검증한 뒤 바로 CaseData로 변환
+- 단계별 생성(case_builder + evidence)과 비교는 case_generation/benchmark.py 참고
+"""
+from typing import List, Dict, Literal, Optional, Tuple
+from pydantic import BaseModel, Field
+from langchain_core.prompts import ChatPromptTemplate
+
+from data_models import CaseData, Case, Profile, Evidence
+from evidence import EvidenceModel, validate_evidences
+from .case_builder import get_llm, map_character_info, select_random_characters
+from .character_registry import CharacterRegistry
+from .prompt_templates.ex_case_templates import CASE_BUNDLE_TEMPLATE
+
+
+PROFILE_TYPES = ["defendant", "victim", "witness", "reference"]  # map_character_info 순서와 동일
+
+
+class CaseModel(BaseModel):
+    outline: str = Field(description="마크다운 형식의 사건 개요")
+    behind: str = Field(description="사건의 진실")
+
+class ProfileModel(BaseModel):
+    type: Literal["defendant", "victim", "witness", "reference"] = Field(description="재판 참석 유형")
+    name: str = Field(description="이름")
+    gender: str = Field(description="성별")
+    age: int = Field(description="나이")
+    personality: str = Field(description="성격 특성")
+    context: str = Field(description="재판 출석 배경")
+
+class CaseBundleModel(BaseModel):
+    case: CaseModel
+    profiles: List[ProfileModel] = Field(description="피고, 피해자, 목격자, 참고인 순서의 등장인물 4명")
+    evidences: List[EvidenceModel] = Field(description="증거품 4개 (attorney 2개, prosecutor 2개)")
+
+
+def build_case_bundle_chain(selected_characters: List[Dict]):
+    """선택된 캐릭터로 CaseBundleModel을 바로 반환하는 체인"""
+    formatted_template = CASE_BUNDLE_TEMPLATE.format(**map_character_info(selected_characters))
+    llm = get_llm(temperature=0.8, chain="case_bundle")
+    prompt = ChatPromptTemplate.from_template(formatted_template)
+    return prompt | llm.with_structured_output(CaseBundleModel)
+
+
+def validate_bundle(bundle: CaseBundleModel, selected_characters: List[Dict]) -> None:
+    """스키마로 잡을 수 없는 게임 규칙 검증 (실패 시 ValueError)"""
+    if [p.type for p in bundle.profiles] != PROFILE_TYPES:
+        raise ValueError(f"등장인물 유형/순서 오류: {[p.type for p in bundle.profiles]}")
+    expected_names = [c['name'] for c in selected_characters]
+    if [p.name.strip() for p in bundle.profiles] != expected_names:
+        raise ValueError(f"등장인물 이름 불일치: {[p.name for p in bundle.profiles]}")
+    # 증거 구성은 단계별 생성과 같은 규칙으로 검증 (EvidenceModel도 name/type/description을 가짐)
+    validate_evidences(bundle.evidences)
+
+
+def bundle_to_case_data(bundle: CaseBundleModel) -> CaseData:
+    """검증된 번들을 CaseData로 변환 (사건 개요는 단계별 생성과 같이 HTML로 저장)"""
+    from tools.service import markdown_to_html
+
+    profiles = []
+    for p in bundle.profiles:
+        name = p.name.strip()
+        info = CharacterRegistry.get(name) or {}
+        profiles.append(Profile(
+            type=p.type,
+            name=name,
+            gender=info.get('gender', p.gender),
+            age=int(info.get('age', p.age)),
+            personality=p.personality,
+            context=p.context,
+            voice=info.get('voice', ""),
+            image=info.get('image', "")
+        ))
+
+    evidences = [Evidence.from_dict(e.model_dump()) for e in bundle.evidences]
+    # 증거 id는 게임마다 1번부터 (Evidence._cnt는 프로세스 전체에서 이어지므로 NFC 태그 id와 맞춤)
+    for i, evidence in enumerate(evidences, 1):
+        evidence.id = i
+    case = Case(outline=markdown_to_html(bundle.case.outline), behind=bundle.case.behind)
+    return CaseData(case=case, profiles=profiles, evidences=evidences)
+
+
+def generate_case_bundle(selected_characters: Optional[List[Dict]] = None,
+                         with_images: bool = True) -> Tuple[CaseData, List[Dict]]:
+    """
+    한 번의 LLM 호출로 CaseData 생성 (동기, 별도 스레드에서 실행)
+    with_images=False이면 증거품 이미지는 만들지 않음 (evidence.make_evidence_images로 따로 생성)
+    """
+    if selected_characters is None:
+        selected_characters = select_random_characters(4)
+
+    bundle = build_case_bundle_chain(selected_characters).invoke({})
+    validate_bundle(bundle, selected_characters)
+    case_data = bundle_to_case_data(bundle)
+
+    if with_images:
+        from evidence import make_evidence_images
+        make_evidence_images(case_data.evidences)
+
+    return case_data, selected_characters
@@ -1,40 +1,27 @@
-import json
-import random
-from pathlib import Path
 from typing import List, Dict
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from tools.llm_gateway import get_llm
 
 from dotenv import load_dotenv
 load_dotenv()
 
 
+from .character_registry import CharacterRegistry, ROLE_ORDER
 from .prompt_templates.ex_case_templates import (
     CASE_SUMMARY_TEMPLATE,
     CHARACTER_TEMPLATE,
     CASE_BEHIND_TEMPLATE,
 )
 
-def get_llm(model="gpt-4o-mini", temperature=1.0):
-    if model == "gpt-5-mini":
-        llm = ChatOpenAI(model=model, temperature=1.0)
-    else:
-        llm = ChatOpenAI(model=model, temperature=temperature)
-    return llm
-
 #----------------------------
 def load_characters() -> List[Dict]:
-    """profil.json에서 캐릭터 정보를 로드"""
-    profile_path = Path(__file__).parent.parent / "assets" / "profile" / "profil.json"
-    with open(profile_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    return data['characters']
+    """profil.json에서 캐릭터 정보를 로드 (CharacterRegistry 캐시 사용)"""
+    return CharacterRegistry.all()
 
 def select_random_characters(num_characters: int = 4) -> List[Dict]:
     """지정 수의 캐릭터 랜덤 선택"""
-    characters = load_characters()
-    return random.sample(characters, num_characters)
+    return CharacterRegistry.sample(num_characters)
 
 # ---------------------------- 사건 요약 체인 ----------------------------
 
@@ -43,23 +30,14 @@ def map_character_info(selected_characters: List[Dict]) -> Dict[str, str]:
     선택된 캐릭터 정보를 템플릿 변수로 매핑
     순서: 피고(0), 피해자(1), 목격자(2), 참고인(3)
     """
-    return {
-        "피고_이름": selected_characters[0]['name'],
-        "피고_나이": selected_characters[0]['age'],
-        "피고_성별": selected_characters[0]['gender'],
-        
-        "피해자_이름": selected_characters[1]['name'],
-        "피해자_나이": selected_characters[1]['age'],
-        "피해자_성별": selected_characters[1]['gender'],
-        
-        "목격자_이름": selected_characters[2]['name'],
-        "목격자_나이": selected_characters[2]['age'],
-        "목격자_성별": selected_characters[2]['gender'],
-        
-        "참고인_이름": selected_characters[3]['name'],
-        "참고인_나이": selected_characters[3]['age'],
-        "참고인_성별": selected_characters[3]['gender'],
-    }
+    info = {}
+    for role, character in zip(ROLE_ORDER, selected_characters):
+        # 선택 이후 profil.json이 바뀌었을 수 있으므로 저장소 값 우선
+        character = CharacterRegistry.get(character['name']) or character
+        info[f"{role}_이름"] = character['name']
+        info[f"{role}_나이"] = character['age']
+        info[f"{role}_성별"] = character['gender']
+    return info
 
 def build_case_chain(selected_characters: List[Dict]):
     """
@@ -67,7 +45,7 @@ def build_case_chain(selected_characters: List[Dict]):
     """
     character_roles = map_character_info(selected_characters)
     formatted_template = CASE_SUMMARY_TEMPLATE.format(**character_roles)
-    llm = get_llm()
+    llm = get_llm(temperature=1.0, chain="case")
     prompt = ChatPromptTemplate.from_template(formatted_template)
     chain = prompt | llm | StrOutputParser()
 
@@ -84,7 +62,7 @@ def build_character_chain(case_summary: str, selected_characters: List[Dict]):
     }
     
     formatted_template = CHARACTER_TEMPLATE.format(**template_vars)
-    llm = get_llm(temperature=0.7)
+    llm = get_llm(temperature=0.7, chain="character")
     prompt = ChatPromptTemplate.from_template(formatted_template)
     chain = prompt | llm | StrOutputParser()
     return chain
@@ -102,7 +80,7 @@ def build_case_behind_chain(case_summary: str, character: str, selected_characte
     }
     
     formatted_template = CASE_BEHIND_TEMPLATE.format(**template_vars)
-    llm = get_llm(temperature=0.5)
+    llm = get_llm(temperature=0.5, chain="case_behind")
     prompt = ChatPromptTemplate.from_template(formatted_template)
     chain = prompt | llm | StrOutputParser()
     return chain
@@ -0,0 +1,175 @@
+"""
+미리 만들어 둔 사건 번들(CaseData) 풀
+- 사건 개요, 등장인물, 증거품(이미지 포함), 사건의 진실까지 완성된 번들을 data/case_files/pool/ 아래에 JSON으로 저장
+- 게임 시작 시 pop()으로 바로 꺼내 쓰고, 비어 있는 자리는 백그라운드에서 다시 채움
+- 풀이 비어 있을 때만 기존처럼 실시간 생성으로 넘어감
+"""
+import asyncio
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from threading import Lock
+from typing import List, Dict, Optional, Tuple
+
+from data_models import CaseData, Case
+
+
+POOL_DIR = Path(__file__).parent.parent.parent / "data" / "case_files" / "pool"
+
+# 사건 생성 방식: staged(단계별 생성, 기본값) / bundle(한 번의 structured output 호출)
+CASE_GENERATION_MODE = os.getenv("CASE_GENERATION_MODE", "staged")
+
+
+def build_case_bundle(selected_characters: Optional[List[Dict]] = None,
+                      with_images: bool = True,
+                      mode: Optional[str] = None) -> Tuple[CaseData, List[Dict]]:
+    """
+    사건 번들 하나를 처음부터 끝까지 생성 (동기, 별도 스레드에서 실행)
+    CaseDataManager의 클래스 상태는 건드리지 않으므로 게임 진행 중에도 안전하게 돌릴 수 있음
+    mode가 bundle이면 한 번의 호출로 생성 (bundle_builder.py), None이면 CASE_GENERATION_MODE를 따름
+    """
+    if (mode or CASE_GENERATION_MODE) == "bundle":
+        from case_generation.bundle_builder import generate_case_bundle
+        return generate_case_bundle(selected_characters, with_images=with_images)
+
+    from case_generation.case_builder import build_case_chain, select_random_characters
+    from controller import CaseDataManager
+    from evidence import make_evidence
+    from tools.service import run_chain_invoke
+
+    if selected_characters is None:
+        selected_characters = select_random_characters(4)
+
+    outline = run_chain_invoke(build_case_chain(selected_characters), as_markdown=True)
+    case = Case(outline=outline, behind="")
+
+    profiles = CaseDataManager.build_profiles_sync(outline, selected_characters)
+    evidences = make_evidence(case_data=case, profiles=profiles, with_images=with_images)
+    case.behind = CaseDataManager.build_case_behind_sync(outline, profiles, selected_characters)
+    return CaseData(case, profiles, evidences), selected_characters
+
+
+def _bundle_pictures(case_data: Dict) -> List[str]:
+    # 번들은 그림 경로만 저장하므로 꺼낼 때까지 파일이 남아 있어야 함
+    return [e["picture"] for e in case_data.get("evidences", []) if isinstance(e.get("picture"), str)]
+
+
+class CasePool:
+    """
+    사용 예시 :
+        bundle = CasePool.pop()        # 없으면 None
+        CasePool.ensure_refill()       # 이벤트 루프 안에서 호출, 부족한 만큼 백그라운드 생성
+    """
+    _lock = Lock()
+    _refill_task : asyncio.Task = None
+    target_size : int = int(os.getenv("CASE_POOL_SIZE", "2"))
+    max_failures : int = 5       # 연속으로 이만큼 실패하면 다음 ensure_refill() 호출까지 멈춤
+    retry_base : float = 5.0     # 실패 후 재시도 대기 시간 (초, 실패할 때마다 2배)
+    retry_max : float = 120.0
+    _pictures_registered : bool = False
+    _in_use_pictures : List[str] = []  # 지금 게임에서 쓰는 번들의 그림 (다음 pop 때 해제)
+
+    @classmethod
+    def size(cls) -> int:
+        return len(cls._bundle_files())
+
+    @classmethod
+    def pop(cls) -> Optional[Tuple[CaseData, List[Dict]]]:
+        """가장 오래된 번들을 꺼내 (CaseData, 선택된 캐릭터) 반환. 풀이 비었으면 None"""
+        from tools.pictogram_store import PictogramStore
+        cls._register_pictures()
+        with cls._lock:
+            for path in cls._bundle_files():
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    path.unlink()
+                except Exception as e:
+                    print(f"[CasePool] 번들 읽기 실패, 삭제: {path.name} ({e})")
+                    path.unlink(missing_ok=True)
+                    continue
+
+                case_data = CaseData.from_dict(data["case_data"])
+                # 증거 id는 게임마다 1번부터 (NFC 태그 id와 맞춤)
+                for i, evidence in enumerate(case_data.evidences, 1):
+                    evidence.id = i
+                print(f"[CasePool] 번들 사용: {path.name} (남은 번들: {cls.size()}개)")
+                PictogramStore.unpin(cls._in_use_pictures)
+                cls._in_use_pictures = _bundle_pictures(data["case_data"])
+                return case_data, data.get("selected_characters", [])
+        return None
+
+    @classmethod
+    def push(cls, case_data: CaseData, selected_characters: List[Dict]) -> Path:
+        """완성된 번들을 풀에 저장 (임시 파일에 쓴 뒤 교체해서 반쯤 쓰인 파일이 보이지 않게 함)"""
+        from tools.pictogram_store import PictogramStore
+        POOL_DIR.mkdir(parents=True, exist_ok=True)
+        PictogramStore.pin(e.picture for e in case_data.evidences if isinstance(e.picture, str))
+        name = f"case-{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}.json"
+        path = POOL_DIR / name
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "case_data": case_data.to_dict(),
+                "selected_characters": selected_characters,
+            }, f, ensure_ascii=False, indent=2)
+        with cls._lock:
+            os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def ensure_refill(cls) -> None:
+        """풀이 target_size보다 적으면 백그라운드 생성 태스크 시작 (이미 돌고 있으면 무시)"""
+        cls._register_pictures()
+        if cls._refill_task is not None and not cls._refill_task.done():
+            return
+        if cls.size() >= cls.target_size:
+            return
+        cls._refill_task = asyncio.create_task(cls._refill())
+
+    @classmethod
+    async def _refill(cls) -> None:
+        failures = 0
+        while cls.size() < cls.target_size:
+            print(f"[CasePool] 번들 생성 시작 ({cls.size()}/{cls.target_size})")
+            start = time.perf_counter()
+            try:
+                case_data, selected_characters = await asyncio.to_thread(build_case_bundle)
+            except Exception as e:
+                failures += 1
+                if failures >= cls.max_failures:
+                    # 계속 실패하면(네트워크 / API 키 문제 등) 다음 ensure_refill() 호출 때 다시 시도
+                    print(f"[CasePool] 번들 생성 {failures}회 연속 실패, 채우기 중단: {e}")
+                    return
+                delay = min(cls.retry_max, cls.retry_base * (2 ** (failures - 1)))
+                print(f"[CasePool] 번들 생성 실패 ({failures}/{cls.max_failures}), {delay:.0f}초 후 재시도: {e}")
+                await asyncio.sleep(delay)
+                continue
+            failures = 0
+            path = cls.push(case_data, selected_characters)
+            print(f"[CasePool] 번들 저장 완료: {path.name} ({time.perf_counter() - start:.1f}초)")
+
+    @classmethod
+    def _register_pictures(cls) -> None:
+        """이전 실행에서 저장된 번들의 그림을 픽토그램 저장소에 한 번 등록 (LRU로 지워지지 않도록)"""
+        if cls._pictures_registered:
+            return
+        cls._pictures_registered = True
+        from tools.pictogram_store import PictogramStore
+        pictures = []
+        with cls._lock:
+            for path in cls._bundle_files():
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        pictures += _bundle_pictures(json.load(f).get("case_data", {}))
+                except (OSError, ValueError):
+                    continue
+        PictogramStore.pin(pictures)
+
+    @staticmethod
+    def _bundle_files() -> List[Path]:
+        if not POOL_DIR.exists():
+            return []
+        return sorted(POOL_DIR.glob("case-*.json"))
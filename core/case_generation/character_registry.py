@@ -0,0 +1,115 @@
+"""
+캐릭터 정보 저장소 (assets/profile/profil.json)
+- 한 번만 읽어서 이름/음성/성별로 색인해 두고, 파일 수정 시각(mtime)이 바뀌면 다시 읽음
+- 이미지 파일 경로도 읽을 때 한 번만 확인 (없는 이미지는 경고 후 빈 문자열로 처리)
+- 재판 역할(피고/피해자/목격자/참고인)은 게임마다 정해지므로 역할 이름 ↔ 유형 매핑만 여기서 관리
+
+사용 예시 :
+    CharacterRegistry.get("유승표")            # 없으면 None
+    CharacterRegistry.sample(4)                # 랜덤 4명 (복사본)
+    CharacterRegistry.image_path("유승표")     # Path 또는 None
+"""
+import os
+import json
+import random
+from pathlib import Path
+from threading import Lock
+from typing import List, Dict, Optional
+
+
+PROFILE_DIR = Path(__file__).parent.parent / "assets" / "profile"
+PROFILE_PATH = PROFILE_DIR / "profil.json"
+
+# 선택된 캐릭터 순서 = 역할 순서 (map_character_info, 등장인물 템플릿과 동일)
+ROLE_ORDER = ["피고", "피해자", "목격자", "참고인"]
+ROLE_TYPES = {
+    "피고": "defendant",
+    "피해자": "victim",
+    "목격자": "witness",
+    "참고인": "reference",
+}
+
+
+class CharacterRegistry:
+    _lock = Lock()
+    _mtime : float = None
+    _characters : List[Dict] = []
+    _by_name : Dict[str, Dict] = {}
+    _by_voice : Dict[str, Dict] = {}
+    _by_gender : Dict[str, List[Dict]] = {}
+    _image_paths : Dict[str, Path] = {}
+
+    @classmethod
+    def all(cls) -> List[Dict]:
+        cls._ensure_loaded()
+        return [dict(c) for c in cls._characters]
+
+    @classmethod
+    def get(cls, name: str) -> Optional[Dict]:
+        """이름으로 캐릭터 조회 (앞뒤 공백 무시)"""
+        cls._ensure_loaded()
+        character = cls._by_name.get(name.strip())
+        return dict(character) if character else None
+
+    @classmethod
+    def by_voice(cls, voice: str) -> Optional[Dict]:
+        cls._ensure_loaded()
+        character = cls._by_voice.get(voice)
+        return dict(character) if character else None
+
+    @classmethod
+    def by_gender(cls, gender: str) -> List[Dict]:
+        cls._ensure_loaded()
+        return [dict(c) for c in cls._by_gender.get(gender.strip(), [])]
+
+    @classmethod
+    def sample(cls, num_characters: int) -> List[Dict]:
+        cls._ensure_loaded()
+        return [dict(c) for c in random.sample(cls._characters, num_characters)]
+
+    @classmethod
+    def image_path(cls, name: str) -> Optional[Path]:
+        """확인된 이미지 파일의 절대 경로 (이미지가 없으면 None)"""
+        cls._ensure_loaded()
+        return cls._image_paths.get(name.strip())
+
+    @classmethod
+    def _ensure_loaded(cls) -> None:
+        mtime = os.stat(PROFILE_PATH).st_mtime
+        if mtime == cls._mtime:
+            return
+        with cls._lock:
+            if mtime == cls._mtime:
+                return
+            cls._load(mtime)
+
+    @classmethod
+    def _load(cls, mtime: float) -> None:
+        with open(PROFILE_PATH, 'r', encoding='utf-8') as f:
+            characters = json.load(f)['characters']
+
+        by_name, by_voice, by_gender, image_paths = {}, {}, {}, {}
+        for character in characters:
+            character['name'] = character['name'].strip()
+            image = character.get('image', "")
+            if image:
+                path = PROFILE_DIR / image
+                if path.is_file():
+                    image_paths[character['name']] = path
+                else:
+                    print(f"[CharacterRegistry] 이미지 없음: {character['name']} ({image})")
+                    character['image'] = ""
+
+            by_name[character['name']] = character
+            if character.get('voice'):
+                by_voice[character['voice']] = character
+            by_gender.setdefault(character['gender'].strip(), []).append(character)
+
+        # 색인을 모두 만든 뒤 한 번에 교체 (읽는 쪽이 반쯤 만든 색인을 보지 않도록)
+        cls._characters = characters
+        cls._by_name = by_name
+        cls._by_voice = by_voice
+        cls._by_gender = by_gender
+        cls._image_paths = image_paths
+        cls._mtime = mtime
+        print(f"[CharacterRegistry] 캐릭터 {len(characters)}명 로드")
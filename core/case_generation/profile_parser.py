@@ -0,0 +1,150 @@
+"""
+등장인물 템플릿(CHARACTER_TEMPLATE) 파서
+- parse_character_block : 등장인물 블록 하나를 Profile로 변환 (profil.json 정보로 보정)
+- validate_profiles     : 선택된 캐릭터가 역할 순서대로 모두 있는지 검증
+- ProfileStreamParser   : 스트리밍 토큰을 받아 블록이 닫히는 즉시 Profile을 내보내는 push 파서
+
+블록이 닫히는 시점 :
+    1. 구분선(--------------------------------)이 도착했을 때
+    2. 구분선이 없어도 성격/배경 줄이 모두 줄바꿈으로 끝났을 때 (마지막 등장인물은 구분선이 없음)
+
+사용 예시 :
+    parser = ProfileStreamParser(expected=4)
+    async for chunk in chain.astream({}):
+        for profile in parser.feed(chunk.content):
+            ...  # 등장인물 하나 완성
+        if parser.done:
+            break
+    rest = parser.close()
+"""
+import re
+from typing import List, Optional
+
+from data_models import Profile
+from .character_registry import CharacterRegistry, ROLE_ORDER, ROLE_TYPES
+
+
+SEPARATOR = "--------------------------------"
+HEADER_PATTERN = re.compile(r'(피고|피해자|목격자|참고인) *: *([^(]+) *\(나이: *([0-9]+)세?, *성별: *([^)]+)\)')
+
+
+def parse_character_block(block: str) -> Optional[Profile]:
+    """등장인물 블록 하나를 Profile로 변환. 첫 줄 형식이 맞지 않으면 None"""
+    lines = [line.strip() for line in block.strip().split('\n') if line.strip()]
+    if not lines:
+        return None
+
+    # 첫 줄에서 이름, 나이, 성별 추출
+    m = HEADER_PATTERN.match(lines[0])
+    if not m:
+        return None
+    role_kor, name, age, gender = m.groups()
+    name = name.strip()  # 이름 앞뒤 공백 제거
+
+    # 배경 추출
+    context = ""
+    # 성격 추출
+    personality = ""
+
+    for line in lines:
+        if line.startswith("- 배경") or line.startswith("배경"):
+            context = line.split(":", 1)[1].strip()
+        elif line.startswith("- 성격") or line.startswith("성격"):
+            personality = line.split(":", 1)[1].strip()
+
+    # profil.json에서 정보 보정
+    character_info = CharacterRegistry.get(name)
+    voice = ""  # 기본값 설정
+    image = ""
+    if character_info:
+        gender = character_info['gender']
+        age = character_info['age']
+        voice = character_info.get('voice', "")
+        image = character_info.get('image', "")
+
+    return Profile(
+        type=ROLE_TYPES[role_kor],
+        name=name,
+        gender=gender,
+        age=int(age),
+        personality=personality,
+        context=context,
+        voice=voice,
+        image=image
+    )
+
+
+def parse_character_template(template: str) -> List[Profile]:
+    """전체 텍스트를 한 번에 파싱"""
+    profiles = []
+    for block in template.strip().split(SEPARATOR):
+        profile = parse_character_block(block)
+        if profile:
+            profiles.append(profile)
+    return profiles
+
+
+def validate_profiles(profiles: List[Profile], selected_characters: List[dict]) -> None:
+    """선택된 캐릭터가 역할 순서대로 모두 파싱됐는지 검증 (실패 시 ValueError)"""
+    expected = [(ROLE_TYPES[role], c['name'].strip()) for role, c in zip(ROLE_ORDER, selected_characters)]
+    parsed = [(p.type, p.name) for p in profiles]
+    if parsed != expected:
+        raise ValueError(f"등장인물 파싱 결과 불일치: {parsed}")
+    for p in profiles:
+        if not p.personality or not p.context:
+            raise ValueError(f"등장인물 성격/배경 누락: {p.name}")
+
+
+class ProfileStreamParser:
+    def __init__(self, expected: int = 4):
+        self.expected = expected
+        self.profiles : List[Profile] = []
+        self._buffer = ""
+        self._block_emitted = False  # 현재 블록을 구분선 전에 이미 내보냈는지
+
+    @property
+    def done(self) -> bool:
+        return len(self.profiles) >= self.expected
+
+    def feed(self, chunk: str) -> List[Profile]:
+        """토큰을 추가하고 이번에 새로 닫힌 Profile 목록 반환"""
+        self._buffer += chunk
+        emitted = []
+
+        while SEPARATOR in self._buffer:
+            block, self._buffer = self._buffer.split(SEPARATOR, 1)
+            if not self._block_emitted:
+                self._emit(block, emitted)
+            self._block_emitted = False
+
+        if not self._block_emitted and self._is_block_complete(self._buffer):
+            self._emit(self._buffer, emitted)
+            self._block_emitted = True
+        return emitted
+
+    def close(self) -> List[Profile]:
+        """스트림 종료 시 남은 블록 처리"""
+        emitted = []
+        if not self._block_emitted:
+            self._emit(self._buffer, emitted)
+        self._buffer = ""
+        self._block_emitted = False
+        return emitted
+
+    def _emit(self, block: str, emitted: List[Profile]) -> None:
+        if self.done:
+            return
+        profile = parse_character_block(block)
+        if profile:
+            self.profiles.append(profile)
+            emitted.append(profile)
+
+    @staticmethod
+    def _is_block_complete(block: str) -> bool:
+        # 줄바꿈으로 끝난 줄만 확인 (아직 쓰는 중인 마지막 줄은 제외)
+        lines = [line.strip() for line in block.split('\n')[:-1] if line.strip()]
+        if not lines or not HEADER_PATTERN.match(lines[0]):
+            return False
+        has_personality = any(l.startswith("- 성격") or l.startswith("성격") for l in lines)
+        has_context = any(l.startswith("- 배경") or l.startswith("배경") for l in lines)
+        return has_personality and has_context
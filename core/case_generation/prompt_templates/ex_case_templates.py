@@ -84,4 +84,37 @@ CASE_BEHIND_TEMPLATE = """
 [사건의 진실]:
 - 피고 : 유죄? 무죄?
 - 범인 : 누구?
-"""
\ No newline at end of file
+"""
+# 사건 개요, 등장인물, 증거품, 사건의 진실을 한 번에 생성하기 위한 템플릿 (structured output 사용)
+CASE_BUNDLE_TEMPLATE = """
+재판 게임에 필요한 사건 데이터를 한 번에 생성해주세요.
+선택된 캐릭터4명을 활용해 이야기를 만들어주세요
+살인사건은 안됩니다.
+피고의 유무죄를 판단하는 게임입니다.
+반드시 한국어로 작성
+
+[피고]: {피고_이름} (나이: {피고_나이}세, 성별: {피고_성별})
+[피해자]: {피해자_이름} (나이: {피해자_나이}세, 성별: {피해자_성별})
+[목격자]: {목격자_이름} (나이: {목격자_나이}세, 성별: {목격자_성별})
+[참고인]: {참고인_이름} (나이: {참고인_나이}세, 성별: {참고인_성별})
+
+1. case.outline : 사건 개요 (마크다운, 주요한 키워드(이름 제외)에 볼드체로 강조 표시)
+    [사건 제목]: (간단한 제목)
+    [사건 배경]: (사건 발생 이전의 상황, 네 사람의 관계 등 2-3문장)
+    [사건 개요]: (3-4문장으로 상세한 사건 설명)
+
+2. profiles : 위 순서(피고, 피해자, 목격자, 참고인)대로 4명
+    - type : defendant, victim, witness, reference 중 하나
+    - name, gender, age : 위에 주어진 값 그대로
+    - personality : 성격 2줄, 게임의 재미를 위하여 각자 다른 특성이 드러나도록
+    - context : 재판 출석 배경 2줄
+
+3. evidences : 증거품 4개 (attorney 2개, prosecutor 2개)
+    - 모든 증거는 재판에 참석한 인원과 연관이 있어야 함
+    - name : 한 단어의 증거품 이름(명사형)
+    - description : 20자 이상 35자 이하, 완성된 문장 하나를 담은 리스트
+
+4. case.behind : 모든 사실을 알고 있는 나레이터 입장에서의 '사건의 진실'
+    - 범인은 등장인물 중 한 명, 현실적인 내용
+    - 범인의 동기와 사건의 진실, 피고의 유무죄와 범인을 포함
+"""
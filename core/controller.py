@@ -5,9 +5,6 @@ from typing import List, Dict
 from case_generation.case_builder import build_character_chain,build_case_behind_chain
 from data_models import CaseData, Case, Profile, Evidence
 import asyncio
-import json
-from pathlib import Path
-import re
 
 
 # 싱글톤 패턴 적용
@@ -52,52 +49,185 @@ class CaseDataManager:
         cls._evidences = cls._case_data.evidences
         return cls._case_data
 
+    @classmethod
+    def load_case_data(cls, case_data: CaseData, selected_characters: List[Dict]) -> CaseData:
+        """미리 생성된 사건 번들(CasePool)로 상태 초기화"""
+        cls._case_data = case_data
+        cls._case = case_data.case
+        cls._profiles = case_data.profiles
+        cls._evidences = case_data.evidences
+        cls._selected_characters = selected_characters
+        return cls._case_data
+
 
     @classmethod
     async def generate_case_stream(cls, callback=None):
-        """먼저 캐릭터들을 선택하고 클래스 변수에 저장"""
+        """
+        먼저 캐릭터들을 선택하고 클래스 변수에 저장
+        callback(content, html)을 넘기면 토큰이 생성될 때마다 지금까지의 사건 개요 HTML을 전달
+        """
         print("[CaseDataManager] generate_case_stream 실행")
         from case_generation.case_builder import build_case_chain, select_random_characters
         cls._selected_characters = select_random_characters(4)
         chain = build_case_chain(cls._selected_characters)
 
-        from tools.service import run_chain_invoke
-        result = run_chain_invoke(chain, as_markdown=True)  # chain 객체를 제대로 처리
+        if callback is None:
+            from tools.service import arun_chain_invoke
+            result = await arun_chain_invoke(chain, as_markdown=True)  # UI 루프를 막지 않도록 ainvoke
+        else:
+            result = await cls._handle_markdown_astream(chain, callback)
         cls._case = Case(outline=result, behind="")
         print(f"[CaseDataManager] generate_case_stream 완료: {len(result) if result else 0}자")
         return cls._case
     
     @classmethod
-    async def generate_profiles_stream(cls, callback=None):
+    async def generate_case_bundle(cls) -> CaseData:
+        """사건 개요, 등장인물, 증거품(이미지 제외), 사건의 진실을 한 번의 호출로 생성"""
+        print("[CaseDataManager] generate_case_bundle 실행")
+        from case_generation.bundle_builder import generate_case_bundle
+        case_data, selected_characters = await asyncio.to_thread(generate_case_bundle, with_images=False)
+        return cls.load_case_data(case_data, selected_characters)
+    
+    @classmethod
+    async def generate_profiles_stream(cls, callback=None, on_profile=None):
+        """
+        on_profile(profile)을 넘기면 등장인물 블록이 닫힐 때마다 바로 전달
+        마지막 등장인물까지 파싱되면 남은 토큰은 기다리지 않고 스트림을 닫음
+        """
+        from case_generation.profile_parser import ProfileStreamParser
+        from tools.speculative import speculative_candidates
         chain = build_character_chain(cls._case.outline, cls._selected_characters)
-        # 스트리밍 작업을 별도 스레드에서 실행하여 UI 블로킹 방지
-        result = await asyncio.to_thread(cls._handle_stream, chain, callback)
+        parser = ProfileStreamParser(expected=len(cls._selected_characters))
 
-        await cls._parse_and_store_profiles(result)
+        def emit(profiles):
+            for profile in profiles:
+                print(f"[Debug] {profile.type}: {profile.name}")
+                if on_profile:
+                    on_profile(profile)
 
+        if speculative_candidates("profiles") > 1:
+            # 후보 여러 개 중 검증을 통과한 결과를 쓰므로 토큰 스트리밍 없이 한 번에 전달
+            profiles = await cls._generate_profiles_speculative(chain)
+            emit(profiles)
+            cls.set_profiles(profiles)
+            return cls._profiles
+
+        result = ""
+        stream = chain.astream({})
+        try:
+            async for chunk in stream:
+                content = chunk.content if hasattr(chunk, 'content') else chunk
+                result += content
+                if callback:
+                    callback(content, result)
+                emit(parser.feed(content))
+                if parser.done:
+                    break
+        finally:
+            await stream.aclose()
+        emit(parser.close())
+
+        cls.set_profiles(parser.profiles)
         return cls._profiles
     
     @classmethod
-    async def generate_evidences(cls, callbacks=None):
-        # 데이터가 준비된 경우 바로 처리
-        if cls._case is not None and cls._profiles is not None:
-            from evidence import make_evidence
+    async def _generate_profiles_speculative(cls, chain) -> List[Profile]:
+        from case_generation.profile_parser import parse_character_template, validate_profiles
+        from tools.speculative import run_speculative
+
+        async def candidate():
+            return parse_character_template(await chain.ainvoke({}))
+
+        return await run_speculative(
+            "profiles", candidate,
+            lambda profiles: validate_profiles(profiles, cls._selected_characters)
+        )
+
+    @classmethod
+    async def generate_evidences(cls, callbacks=None, with_images: bool = True):
+        if cls._case is None or cls._profiles is None:
+            raise RuntimeError("사건 개요와 등장인물이 먼저 생성되어야 합니다.")
+
+        from evidence import make_evidence
+        from tools.speculative import speculative_candidates
+        if speculative_candidates("evidences") > 1:
+            evidences = await cls._generate_evidences_speculative()
+        else:
             # 무거운 동기 작업을 별도 스레드에서 실행하여 UI 블로킹 방지
             evidences = await asyncio.to_thread(
                 make_evidence,
                 case_data=cls._case,
-                profiles=cls._profiles
+                profiles=cls._profiles,
+                with_images=False
             )
-            cls._evidences = evidences
-            cls._case_data = CaseData(cls._case, cls._profiles, cls._evidences)
+        cls._evidences = evidences
+        cls._case_data = CaseData(cls._case, cls._profiles, cls._evidences)
+        if with_images:
+            # local_first 전략의 그림 교체는 이벤트 루프의 작업으로 진행하고 교체될 때마다 SSE로 전송
+            from tools.service import handler_send_evidence_picture
+            await cls.generate_evidence_images(on_upgrade=handler_send_evidence_picture)
 
-            if callbacks:
-                for callback in callbacks:
-                    callback(evidences)
+        if callbacks:
+            for callback in callbacks:
+                callback(evidences)
 
-            return evidences
+        return evidences
+
+    @classmethod
+    async def generate_evidences_stream(cls, on_evidence=None):
+        """
+        on_evidence(evidence)를 넘기면 증거 객체 하나가 닫힐 때마다 바로 전달 (이미지 생성은 호출한 쪽에서)
+        speculative 모드면 검증된 결과를 한 번에 전달
+        """
+        if cls._case is None or cls._profiles is None:
+            raise RuntimeError("사건 개요와 등장인물이 먼저 생성되어야 합니다.")
 
-        return await cls._wait_for_data(callbacks) #데이터가 제대로 안 담긴 경우 대기하거나 재시도 
+        from evidence import astream_evidence
+        from tools.speculative import speculative_candidates
+        if speculative_candidates("evidences") > 1:
+            evidences = await cls._generate_evidences_speculative()
+            for evidence in evidences:
+                if on_evidence:
+                    on_evidence(evidence)
+        else:
+            evidences = []
+            async for evidence in astream_evidence(cls._case, cls._profiles):
+                # 건너뛴 항목이나 이전 사건도 Evidence id를 소비하므로 1번부터 다시 매김 (NFC 태그 id와 맞춤)
+                evidence.id = len(evidences) + 1
+                evidences.append(evidence)
+                print(f"[Debug] 증거 {evidence.id}: {evidence.name} ({evidence.type})")
+                if on_evidence:
+                    on_evidence(evidence)
+
+        cls._evidences = evidences
+        cls._case_data = CaseData(cls._case, cls._profiles, cls._evidences)
+        return evidences
+
+    @classmethod
+    async def _generate_evidences_speculative(cls) -> List[Evidence]:
+        from evidence import build_evidence_chain, convert_data_class, validate_evidences
+        from tools.speculative import run_speculative
+        chain = build_evidence_chain(cls._case, cls._profiles)
+
+        async def candidate():
+            return convert_data_class(await chain.ainvoke({}))
+
+        evidences = await run_speculative("evidences", candidate, validate_evidences)
+        # 취소된 후보들도 Evidence id를 소비했으므로 1번부터 다시 매김 (NFC 태그 id와 맞춤)
+        for i, evidence in enumerate(evidences, 1):
+            evidence.id = i
+        return evidences
+
+    @classmethod
+    async def generate_evidence_images(cls, on_image=None, on_upgrade=None):
+        """
+        generate_evidences(with_images=False)로 만든 증거품의 이미지 생성
+        on_image(evidence)를 넘기면 이미지가 하나 완성될 때마다 바로 전달
+        on_upgrade(evidence)는 local_first 전략에서 로컬 픽토그램이 Replicate 그림으로 바뀔 때 호출
+        """
+        from evidence import amake_evidence_images
+        await amake_evidence_images(cls._evidences, on_image=on_image, on_upgrade=on_upgrade)
+        return cls._evidences
     
     # 호출 시점 : 최종 판결과 함께 또는 최종 판결을 읽고 있을 때 
     # 매개변수로 변경된 증거 리스트도 포함 
@@ -106,17 +236,31 @@ class CaseDataManager:
         chain = build_case_behind_chain(cls._case.outline, cls._profiles, cls._selected_characters)
         # 스트리밍 작업을 별도 스레드에서 실행하여 UI 블로킹 방지
         result = await asyncio.to_thread(cls._handle_stream, chain, callback)
-        cls._case_data.case.behind = result
+        # 증거 생성과 동시에 돌 수 있으므로 _case_data 대신 공유 중인 Case 객체에 기록
+        cls._case.behind = result
         return result
     
     @classmethod
     def check_contextual_relevance(cls, user_input : str) -> dict:
         """입력이 현재 재판 역할극의 문맥과 관련 있는지 판단합니다."""
+        result = cls._build_relevance_chain().invoke({"case_summary": cls._case.outline, "user_input": user_input})
+        print(f"결과 : {result}")
+    
+        return result
+
+    @classmethod
+    async def acheck_contextual_relevance(cls, user_input : str) -> dict:
+        """check_contextual_relevance의 비동기 버전 (이벤트 루프를 막지 않음)"""
+        result = await cls._build_relevance_chain().ainvoke({"case_summary": cls._case.outline, "user_input": user_input})
+        print(f"결과 : {result}")
+
+        return result
+
+    @staticmethod
+    def _build_relevance_chain():
         from langchain_core.prompts import PromptTemplate
-        from langchain_openai import ChatOpenAI
         from langchain_core.output_parsers import JsonOutputParser
-
-        case_summary = cls._case.outline
+        from tools.llm_gateway import get_llm
 
         prompt = PromptTemplate.from_template("""
             당신은 역할극 기반 재판 시뮬레이션의 판사입니다.
@@ -139,16 +283,11 @@ class CaseDataManager:
                 {{"relevant": "false", "answer": "갑자기 뜬금없이 갈비찜 레시피라뇨? 재판과 상관 없는 발언 같습니다."}}  
             """)
 
-        chain = (
+        return (
             prompt
-            | ChatOpenAI(model="gpt-4o-mini", temperature=0.8)
+            | get_llm(temperature=0.8, chain="relevance")
             | JsonOutputParser()
         )
-        
-        result = chain.invoke({"case_summary": case_summary, "user_input": user_input})
-        print(f"결과 : {result}")
-    
-        return result
     
     
     # 프로필 파싱 및 저장하는 내부 메소드 
@@ -160,65 +299,44 @@ class CaseDataManager:
             print(f"[Debug] {profile.type}: {profile.name}")
         cls.set_profiles(profiles)
 
+    @staticmethod
+    def build_profiles_sync(outline: str, selected_characters: List[Dict]) -> List[Profile]:
+        """
+        사건 개요로 등장인물 생성 (동기, 별도 스레드에서 실행)
+        클래스 상태는 건드리지 않으므로 게임 진행 중에도 사건 풀 생성에 사용 가능
+        """
+        text = CaseDataManager._handle_stream(build_character_chain(outline, selected_characters))
+        return CaseDataManager._parse_character_template(text)
+
+    @staticmethod
+    def build_case_behind_sync(outline: str, profiles: List[Profile], selected_characters: List[Dict]) -> str:
+        """사건의 진실 생성 (동기, 클래스 상태를 건드리지 않음)"""
+        return CaseDataManager._handle_stream(build_case_behind_chain(outline, profiles, selected_characters))
+
     @staticmethod
     def _parse_character_template(template: str) -> List[Profile]:
-        profiles = []
-        profile_path = Path(__file__).parent / "assets" / "profile" / "profil.json"
-        with open(profile_path, 'r', encoding='utf-8') as f:
-            profile_data = json.load(f)
-            characters = profile_data['characters']
-
-        character_blocks = template.strip().split('--------------------------------')
-        for block in character_blocks:
-            lines = [line.strip() for line in block.strip().split('\n') if line.strip()]
-            if not lines:
-                continue
+        from case_generation.profile_parser import parse_character_template
+        return parse_character_template(template)
+    
+    @staticmethod
+    async def _handle_markdown_astream(chain, callback) -> str:
+        """이벤트 루프에서 토큰을 받아 HTML로 점진 변환하며 callback(content, html) 호출"""
+        from tools.service import IncrementalMarkdownRenderer
+        import time
 
-            # 첫 줄에서 이름, 나이, 성별 추출
-            m = re.match(r'(피고|피해자|목격자|참고인) *: *([^(]+) *\(나이: *([0-9]+)세?, *성별: *([^)]+)\)', lines[0])
-            if not m:
+        renderer = IncrementalMarkdownRenderer()
+        start = time.perf_counter()
+        first_token_at = None
+        async for chunk in chain.astream({}):
+            content = chunk.content if hasattr(chunk, 'content') else chunk
+            if not content:
                 continue
-            role_kor, name, age, gender = m.groups()
-            name = name.strip()  # 이름 앞뒤 공백 제거
-            profile_type = {
-                "피고": "defendant",
-                "피해자": "victim",
-                "목격자": "witness",
-                "참고인": "reference"
-            }[role_kor]
-
-            # 배경 추출
-            context = ""
-            # 성격 추출
-            personality = ""
-            
-            for line in lines:
-                if line.startswith("- 배경") or line.startswith("배경"):
-                    context = line.split(":", 1)[1].strip()
-                elif line.startswith("- 성격") or line.startswith("성격"):
-                    personality = line.split(":", 1)[1].strip()
-
-            # profil.json에서 정보 보정
-            character_info = next((char for char in characters if char['name'].strip() == name.strip()), None)
-            voice = ""  # 기본값 설정
-            if character_info:
-                gender = character_info['gender']
-                age = character_info['age']
-                voice = character_info.get('voice', "")  # voice 정보 가져오기 (.get으로 안전하게)
-                image = character_info.get('image', "")  # image 정보 가져오기 (.get으로 안전하게)
-
-            profiles.append(Profile(
-                type=profile_type,
-                name=name,
-                gender=gender,
-                age=int(age),
-                personality=personality,
-                context=context,
-                voice=voice,
-                image=image
-            ))
-        return profiles
-    
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+                print(f"[CaseDataManager] 첫 토큰까지 {first_token_at - start:.2f}초")
+            callback(content, renderer.feed(content))
+        return renderer.close()
+
     @staticmethod
     def _handle_stream(chain, callback=None):
         result = ""
@@ -230,23 +348,6 @@ class CaseDataManager:
                 callback(content, result)
         return result
     
-    # 증거 만들기 전에 데이터가 없다면 준비될 때까지 대기
-    @classmethod
-    async def _wait_for_data(cls, callbacks=None):
-        MAX_RETRIES = 5
-        retry_count = 0
-        
-        while retry_count < MAX_RETRIES:
-            print(f"데이터 준비 중... (시도: {retry_count + 1})")
-            await asyncio.sleep(0.5)
-            retry_count += 1
-            
-            if cls._case is not None and cls._profiles is not None:
-                return await cls.generate_evidences(callbacks)
-                
-        print("데이터 준비 실패")
-        return None
-    
     #==============================================
     # getter/ setter 메소드 추가 
     # 호출 방식 예시 : CaseDataManager.get_case_data()
@@ -33,6 +33,11 @@ class Evidence:
 
     _cnt : int = 0  
 
+    @property
+    def rev(self) -> int:
+        """설명 리비전 (설명은 뒤에 추가만 되므로 문장 수 = 리비전, 처음 생성 시 1)"""
+        return len(self.description or [])
+
     @classmethod
     def from_dict(cls, data: dict) -> 'Evidence':
         cls._cnt += 1
@@ -53,6 +58,19 @@ class CaseData:
     profiles: List[Profile]
     evidences: List[Evidence]
 
+    def to_dict(self) -> dict:
+        """JSON 저장용 dict로 변환"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CaseData':
+        """to_dict()로 저장한 dict에서 CaseData 복원 (증거 id는 저장된 값 그대로 사용)"""
+        return cls(
+            case=Case(**data["case"]),
+            profiles=[Profile(**p) for p in data.get("profiles", [])],
+            evidences=[Evidence(**e) for e in data.get("evidences", [])]
+        )
+
 
 #==============================================
 # 게임 상태 변수
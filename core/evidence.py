@@ -1,4 +1,3 @@
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate, ChatPromptTemplate
 from langchain_core.output_parsers import (
     JsonOutputParser,
@@ -6,7 +5,11 @@ from langchain_core.output_parsers import (
 )
 from pydantic import BaseModel, Field
 from data_models import Case, Profile, Evidence, CaseData
-from typing import List, Literal
+from typing import AsyncIterator, Callable, Dict, List, Literal, Optional
+import asyncio
+from pathlib import Path
+from tools.llm_gateway import get_llm
+from tools.chain_config import get_chain_config
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -34,6 +37,13 @@ CREATE_EVIDENCE_TEMPLATE = """
 """
 
 ## make_evidence(Case, List[Profile]) -> List[Evidence]: 최초 증거 생성
+## build_evidence_chain(Case, List[Profile]) -> chain: 증거 생성 체인 (invoke/ainvoke 결과는 convert_data_class로 변환)
+## astream_evidence(Case, List[Profile]) -> AsyncIterator[Evidence]: 증거 객체 하나가 닫힐 때마다 바로 Evidence로 내보냄
+## validate_evidences(List[Evidence]): 증거 구성 검증 (attorney 2개, prosecutor 2개)
+## make_evidence_images(List[Evidence]) -> List[Evidence]: 증거 이미지 생성 (make_evidence(with_images=False)와 함께 사용)
+## amake_evidence_images(List[Evidence], on_image, on_upgrade) -> List[Evidence]: 이미지 동시 생성, 하나 끝날 때마다 on_image(evidence) 호출
+##     local_first 전략이면 로컬 픽토그램으로 바로 끝내고, Replicate 그림이 나오면 on_upgrade(evidence) 호출
+## get_evidence_names_for_prompt(List[str]) -> Dict[str, str]: 증거 이름들을 한 번의 호출로 이미지용 영어 키워드로 변환
 ## update_evidence_description(Evidence, CaseData) -> Evidence: 넘겨준 Evidence의 설명 추가
 
 class EvidenceModel(BaseModel):
@@ -41,36 +51,191 @@ class EvidenceModel(BaseModel):
     type: Literal["attorney", "prosecutor"] = Field(description="제출 주체")
     description: List[str] = Field(description="한 문장의 증거 설명")
 
-def get_llm():
-    # return ChatOpenAI(model="gpt-4o-mini", temperature=1.0)
-    return ChatOpenAI(model="gpt-4o-mini")
+class EvidenceKeywordModel(BaseModel):
+    name: str = Field(description="입력으로 받은 증거 이름 그대로")
+    keyword: str = Field(description="픽토그램으로 그리기 쉬운 1~3 단어의 영어 키워드")
 
-def make_evidence(case_data: Case, profiles: List[Profile]) -> List[Evidence]:
-    str_case_data = format_case(case_data)
-    str_profiles_data = format_profiles(profiles)
+class EvidenceKeywordBatchModel(BaseModel):
+    keywords: List[EvidenceKeywordModel]
 
-    llm = get_llm()
+def build_evidence_chain(case_data: Case, profiles: List[Profile], parse: bool = True):
+    """parse=False면 JSON 파싱 없이 텍스트를 내보내는 체인 (astream_evidence에서 직접 파싱)"""
+    llm = get_llm(chain="evidence")
     parser = JsonOutputParser(pydantic_object=EvidenceModel)
     prompt = PromptTemplate(
         template = CREATE_EVIDENCE_TEMPLATE,
-        input_variables=["case_data", "profile"],
-        partial_variables={"format_instructions": parser.get_format_instructions()}
+        input_variables=[],
+        partial_variables={
+            "format_instructions": parser.get_format_instructions(),
+            "case_data": format_case(case_data),
+            "profile": format_profiles(profiles),
+        }
     )
-    chain = prompt | llm | parser
+    if not parse:
+        return prompt | llm | StrOutputParser()
+    return prompt | llm | parser
 
-    response = chain.invoke({
-        "case_data": str_case_data,
-        "profile": str_profiles_data
-    })
+async def astream_evidence(case_data: Case, profiles: List[Profile]) -> AsyncIterator[Evidence]:
+    """
+    증거 생성 결과를 스트리밍으로 읽으며 객체 하나가 닫힐 때마다 Evidence로 내보냄
+    (1번 증거의 이미지 생성/SSE 전송을 나머지 증거가 쓰이는 동안 시작할 수 있음)
+    배열을 하나도 읽지 못했으면 전체 텍스트를 기존 방식(JsonOutputParser → convert_data_class)으로 변환
+    """
+    from tools.json_stream import JsonArrayStreamParser
+    parser = JsonArrayStreamParser()
+    stream = build_evidence_chain(case_data, profiles, parse=False).astream({})
+    try:
+        async for chunk in stream:
+            for item in parser.feed(chunk):
+                evidence = _to_evidence(item)
+                if evidence:
+                    yield evidence
+            if parser.done:
+                break
+    finally:
+        await stream.aclose()
+    parser.close()
+
+    if not parser.items:
+        print("[Evidence] 스트리밍 파싱 결과 없음, 전체 텍스트로 다시 파싱")
+        for evidence in convert_data_class(JsonOutputParser().parse(parser.text)):
+            yield evidence
+
+def _to_evidence(item: dict) -> Optional[Evidence]:
+    try:
+        return Evidence.from_dict(item)
+    except KeyError as e:
+        print(f"[Evidence] 증거 항목 필드 누락, 건너뜀: {e} | {item}")
+        return None
+
+def make_evidence(case_data: Case, profiles: List[Profile], with_images: bool = True,
+                  strategy: str = None) -> List[Evidence]:
+    response = build_evidence_chain(case_data, profiles).invoke({})
     evidences = convert_data_class(response)
 
-    for e in evidences:
-        e.picture = make_evidence_image(e.name)
+    if with_images:
+        make_evidence_images(evidences, strategy=strategy)
+
+    return evidences
+
+ROOT_DIR = Path(__file__).parent.parent  # picture 경로는 저장소 루트 기준 (실행 위치와 무관)
+
+# 증거 이미지 생성 전략 (chain_config.yaml의 evidence_images.strategy)
+#   remote      : Replicate로만 생성 (실패하면 picture = -1)
+#   local       : 로컬 픽토그램(tools/local_pictogram.py)만 사용, 네트워크/LLM 호출 없음
+#   local_first : 로컬 픽토그램으로 먼저 채우고 Replicate 그림이 나오면 교체
+IMAGE_STRATEGIES = ("remote", "local", "local_first")
+
+# 백그라운드 교체 작업 (가비지 컬렉션으로 취소되지 않도록 참조 유지)
+_upgrade_tasks = set()
+
+def _image_concurrency() -> int:
+    """증거 이미지 동시 생성 수 (Replicate 호출 + 키워드 변환 LLM 호출)"""
+    return max(1, int(get_chain_config("evidence_images").get("concurrency", 4)))
+
+def _resolve_strategy(strategy: Optional[str]) -> str:
+    strategy = strategy or get_chain_config("evidence_images").get("strategy", "remote")
+    if strategy not in IMAGE_STRATEGIES:
+        print(f"[Evidence] 알 수 없는 이미지 전략 '{strategy}', remote로 처리")
+        return "remote"
+    return strategy
+
+def make_local_evidence_image(name: str, prompt_name: str = None) -> str:
+    """로컬 픽토그램 경로 (키워드가 없으면 전에 쓴 키워드만 확인하고 LLM은 부르지 않음)"""
+    from tools.evidence_assets import build_renditions
+    from tools.local_pictogram import render_local_pictogram
+    from tools.pictogram_store import PictogramStore
+    path = render_local_pictogram(name, prompt_name or PictogramStore.keyword_for_name(name))
+    build_renditions(path)
+    return path
 
+def make_evidence_images(evidences: List[Evidence], strategy: str = None) -> List[Evidence]:
+    """
+    증거품마다 이미지를 생성해서 picture에 경로 저장 (스레드 풀로 동시에 생성)
+    이벤트 루프 밖(사건 풀 등)에서 쓰는 동기 버전, 게임 중에는 amake_evidence_images 사용
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    strategy = _resolve_strategy(strategy)
+    if strategy != "remote":
+        for e in evidences:
+            e.picture = make_local_evidence_image(e.name)
+        if strategy == "local_first":
+            # 미리 만들어 두는 사건은 꺼낼 때까지 시간이 있으므로 저장하기 전에 교체까지 끝냄
+            _upgrade_evidence_images(evidences)
+        return evidences
+
+    names = [e.name for e in evidences]
+    keywords = get_evidence_names_for_prompt(names)
+    with ThreadPoolExecutor(max_workers=_image_concurrency()) as pool:
+        pictures = list(pool.map(make_evidence_image, names, [keywords.get(n) for n in names]))
+    for e, picture in zip(evidences, pictures):
+        e.picture = picture
     return evidences
 
+def _upgrade_evidence_images(evidences: List[Evidence]) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+    keywords = get_evidence_names_for_prompt([e.name for e in evidences])
+    with ThreadPoolExecutor(max_workers=_image_concurrency()) as pool:
+        pictures = list(pool.map(make_evidence_image, [e.name for e in evidences],
+                                 [keywords.get(e.name) for e in evidences]))
+    for e, picture in zip(evidences, pictures):
+        if picture != -1:
+            e.picture = picture
+
+async def amake_evidence_images(evidences: List[Evidence],
+                                on_image: Optional[Callable[[Evidence], None]] = None,
+                                on_upgrade: Optional[Callable[[Evidence], None]] = None,
+                                strategy: str = None) -> List[Evidence]:
+    """
+    이벤트 루프용 이미지 생성: 증거마다 별도 스레드에서 동시에 생성 (최대 evidence_images.concurrency개)
+    전체 시간은 네 개의 합이 아니라 가장 느린 하나 정도가 됨
+    local_first면 로컬 픽토그램으로 바로 반환하고, Replicate 교체는 백그라운드 작업으로 진행
+    """
+    strategy = _resolve_strategy(strategy)
+    if strategy != "remote":
+        for e in evidences:
+            e.picture = make_local_evidence_image(e.name)
+            print(f"[Evidence] 로컬 이미지: {e.id} {e.name} → {e.picture}")
+            if on_image:
+                on_image(e)
+        if strategy == "local_first":
+            task = asyncio.create_task(_aupgrade_evidence_images(evidences, on_upgrade))
+            _upgrade_tasks.add(task)
+            task.add_done_callback(_upgrade_tasks.discard)
+        return evidences
+
+    await _amake_remote_images(evidences, on_image)
+    return evidences
+
+async def _amake_remote_images(evidences: List[Evidence],
+                               on_done: Optional[Callable[[Evidence], None]],
+                               keep_on_failure: bool = False) -> None:
+    semaphore = asyncio.Semaphore(_image_concurrency())
+    # 키워드는 한 번의 호출로 먼저 받아 둠 (실패한 이름은 make_evidence_image가 따로 변환)
+    keywords = await asyncio.to_thread(get_evidence_names_for_prompt, [e.name for e in evidences])
+
+    async def make_one(e: Evidence):
+        async with semaphore:
+            picture = await asyncio.to_thread(make_evidence_image, e.name, keywords.get(e.name))
+        if picture == -1 and keep_on_failure:
+            print(f"[Evidence] 이미지 교체 실패, 로컬 이미지 유지: {e.id} {e.name}")
+            return
+        e.picture = picture
+        print(f"[Evidence] 이미지 완료: {e.id} {e.name} → {e.picture}")
+        if on_done:
+            on_done(e)
+
+    await asyncio.gather(*(make_one(e) for e in evidences))
+
+async def _aupgrade_evidence_images(evidences: List[Evidence],
+                                    on_upgrade: Optional[Callable[[Evidence], None]]) -> None:
+    try:
+        await _amake_remote_images(evidences, on_upgrade, keep_on_failure=True)
+    except Exception as e:
+        print(f"[Evidence] 이미지 교체 중단: {e}")
+
 def update_evidence_description(evidence: Evidence, casedata: CaseData) -> Evidence:
-    llm = get_llm()
+    llm = get_llm(chain="evidence_update")
     prompt = ChatPromptTemplate.from_messages([
         ("system",
         """
@@ -138,11 +303,40 @@ def convert_data_class(data: List[dict]) -> List[Evidence]:
             data = data["evidence"]
     return [Evidence.from_dict(item) for item in data]
 
-def make_evidence_image(name):
+def validate_evidences(evidences: List[Evidence]) -> None:
+    """증거 구성이 게임 규칙에 맞는지 검증 (실패 시 ValueError)"""
+    types = [e.type for e in evidences]
+    if len(types) != 4 or types.count("attorney") != 2 or types.count("prosecutor") != 2:
+        raise ValueError(f"증거품 구성 오류: {types}")
+    for e in evidences:
+        if not e.name or not e.description:
+            raise ValueError(f"증거품 이름/설명 누락: {e}")
+
+def make_evidence_image(name, prompt_name: str = None, strategy: str = "remote"):
+    """
+    증거 이미지 하나 생성 (저장소 루트 기준 경로, remote 실패 시 -1)
+    local_first로 부르면 Replicate가 실패했을 때 로컬 픽토그램으로 대체
+    UI 썸네일/e-ink 타일 렌디션도 함께 만들어 둠 (tools/evidence_assets.py)
+    """
+    from tools.evidence_assets import build_renditions
+    from tools.pictogram_store import PictogramStore
+    if strategy == "local":
+        return make_local_evidence_image(name, prompt_name)
     try:
-        path = create_image_by_ai(name)
-        resize_img(path, path, 200)
-    except:
+        if not prompt_name:
+            prompt_name = get_evidence_name_for_prompt(name)
+        # 같은 키워드로 그린 적이 있으면 Replicate 호출 없이 재사용
+        cached = PictogramStore.get(prompt_name, name=name)
+        if cached:
+            build_renditions(cached)  # 이미 있으면 매니페스트만 확인
+            return cached
+        path = create_image_by_ai(name, prompt_name)
+        resize_img(ROOT_DIR / path, ROOT_DIR / path, 200)
+        path = PictogramStore.put(prompt_name, path, name=name)
+        build_renditions(path)
+    except Exception:
+        if strategy == "local_first":
+            return make_local_evidence_image(name, prompt_name)
         return -1
     return path
 
@@ -150,16 +344,67 @@ def resize_img(input_path, output_path, target_size):
     from PIL import Image
     try:
         with Image.open(input_path) as img:
-            img = img.resize((target_size, target_size))
+            # 기본 리샘플(BICUBIC) 대신 축소에 맞는 LANCZOS 사용
+            img = img.resize((target_size, target_size), Image.LANCZOS)
             img.save(output_path)
-    except:
+    except Exception:
         return -1
     return 0
 
+KEYWORD_SYSTEM_PROMPT = "You are a language assistant that rewrites Korean terms into simple English phrases or keywords that can be visualized easily as pictograms. Avoid literal translation and aim for intuitive, visual concepts. Output only 1–3 words with no explanations."
+
+def get_evidence_names_for_prompt(names: List[str]) -> Dict[str, str]:
+    """
+    증거 이름 여러 개를 한 번의 structured output 호출로 영어 키워드로 변환 ({이름: 키워드})
+    - 전에 그림을 그린 이름은 픽토그램 저장소에 남은 키워드를 그대로 사용 (호출 없음)
+    - 한 번에 변환하지 못한 이름만 get_evidence_name_for_prompt로 하나씩 변환
+    - 그래도 실패한 이름은 결과에서 빠짐
+    """
+    from tools.pictogram_store import PictogramStore
+    keywords = {}
+    pending = []
+    for name in dict.fromkeys(names):
+        keyword = PictogramStore.keyword_for_name(name)
+        if keyword:
+            keywords[name] = keyword
+        else:
+            pending.append(name)
+
+    if len(pending) > 1:
+        llm = get_llm(temperature=0.2, chain="evidence_keyword")
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", KEYWORD_SYSTEM_PROMPT + " Rewrite every input line and keep each input name exactly as given."),
+            ("human", "inputs:\n{evidence_names}")
+        ])
+        chain = prompt | llm.with_structured_output(EvidenceKeywordBatchModel)
+        try:
+            batch = chain.invoke({"evidence_names": "\n".join(pending)})
+            items = batch.keywords
+            by_name = {item.name.strip(): item.keyword.strip() for item in items}
+            for i, name in enumerate(pending):
+                keyword = by_name.get(name)
+                # 이름을 그대로 돌려주지 않았으면 순서로 맞춤 (개수가 같을 때만)
+                if not keyword and len(items) == len(pending):
+                    keyword = items[i].keyword.strip()
+                if keyword:
+                    keywords[name] = keyword
+        except Exception as e:
+            print(f"[Evidence] 키워드 일괄 변환 실패, 하나씩 변환: {e}")
+
+    for name in pending:
+        if name in keywords:
+            continue
+        try:
+            keywords[name] = get_evidence_name_for_prompt(name)
+        except Exception as e:
+            print(f"[Evidence] 키워드 변환 실패: {name} ({e})")
+    return keywords
+
 def get_evidence_name_for_prompt(name):
-    llm = get_llm()
+    # 같은 이름이면 같은 키워드가 나오도록 낮은 temperature 사용 (응답 캐시 대상)
+    llm = get_llm(temperature=0.2, chain="evidence_keyword")
     prompt = ChatPromptTemplate.from_messages([
-        ("system", "You are a language assistant that rewrites Korean terms into simple English phrases or keywords that can be visualized easily as pictograms. Avoid literal translation and aim for intuitive, visual concepts. Output only 1–3 words with no explanations."),
+        ("system", KEYWORD_SYSTEM_PROMPT),
         ("human", "input: {evidence_name}")
     ])
     chain = prompt | llm | StrOutputParser()
@@ -168,7 +413,7 @@ def get_evidence_name_for_prompt(name):
     })
     return res
 
-def create_image_by_ai(name: str):
+def create_image_by_ai(name: str, prompt_name: str = None):
     import json
     import requests
     import datetime
@@ -181,7 +426,8 @@ def create_image_by_ai(name: str):
     formatted_date = today.strftime("%y-%m-%d")
     new_name = name.replace(" ", "-")
 
-    prompt_name = get_evidence_name_for_prompt(name)
+    if prompt_name is None:
+        prompt_name = get_evidence_name_for_prompt(name)
     save_path = "data/evidence_resource/" + formatted_date + "-" + new_name + ".png"
 
     import replicate
@@ -200,7 +446,7 @@ def create_image_by_ai(name: str):
 
     print(output)
     try:
-        with open(save_path, "wb") as file:
+        with open(ROOT_DIR / save_path, "wb") as file:
             file.write(output.read())
             print(f"[{name}] 이미지 저장 성공: {save_path}")
     except Exception as e:
@@ -1,10 +1,12 @@
 from typing import List, Dict, Optional
 from data_models import CaseData, Evidence, Profile, Case, GameState, Phase, Role
 from controller import CaseDataManager
+from case_generation.case_pool import CasePool, CASE_GENERATION_MODE
+from tools.stage_graph import StageGraph
 from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
 import asyncio
 from interrogation.interrogator import it
-from verdict import get_judge_result
+from verdict import aget_judge_result
 from game_workflow import create_game_workflow, run_workflow
 
 
@@ -20,6 +22,10 @@ class GameController(QObject):
     _state : GameState = None
     _case_data : CaseData = None
     _workflow = None  # LangGraph 워크플로우
+    _pipeline : StageGraph = None  # 사건 생성 단계 그래프
+    _from_pool : bool = False  # 사건 풀에서 꺼낸 사건이면 True (증거까지 이미 준비됨)
+    _image_tasks : List[asyncio.Task] = []  # 증거별 이미지 생성 작업 (evidences 단계에서 시작)
+    _tts_task : Optional[asyncio.Task] = None  # 심문 답변 문장을 차례대로 TTS로 보내는 워커
 
 
     @classmethod
@@ -52,23 +58,49 @@ class GameController(QObject):
     async def initialize(cls) -> None:
         """게임 초기화 및 데이터 로드 (백그라운드 실행)"""
         cls._state = GameState()
+        cls._is_initialized = False
+        cls._from_pool = False
+        cls._cancel_tts()
 
-        print("[GameController] 케이스 데이터 생성 시작 (전체 초기화)...")
-        task = asyncio.create_task(CaseDataManager.generate_case_stream())  # 전체 CaseData 생성
-        task.add_done_callback(cls._on_initialization_complete)
+        # 이전 게임의 증거 정리 (증거 id는 게임마다 1번부터)
+        from tools.service import handler_reset_evidence
+        handler_reset_evidence()
 
         # LangGraph 워크플로우 초기화
         cls._workflow = create_game_workflow()
         print(f"[GameController] LangGraph workflow initialized")
 
+        # 이전 게임에서 돌던 생성 작업 정리
+        if cls._pipeline is not None:
+            cls._pipeline.cancel()
+            cls._pipeline = None
+
+        # 미리 만들어 둔 사건이 있으면 바로 사용
+        bundle = CasePool.pop()
+        if bundle is not None:
+            case_data, selected_characters = bundle
+            print("[GameController] 사건 풀에서 케이스 데이터 로드")
+            cls._case_data = CaseDataManager.load_case_data(case_data, selected_characters)
+            cls._from_pool = True
+            cls._is_initialized = True
+            cls._send_signal("initialized", None)
+            return None
+
+        print("[GameController] 케이스 데이터 생성 시작 (전체 초기화)...")
+        cls._pipeline = cls._create_case_pipeline().on_failure(cls._on_initialization_failed).start()
+
         return None
 
     @classmethod
     def initialize_with_stub(cls) -> None:
         """테스트모드: stub 데이터로 빠르게 초기화"""
         cls._state = GameState()
+        cls._from_pool = False
+        cls._cancel_tts()
 
         print("[GameController] 테스트 모드: stub 데이터로 초기화...")
+        from tools.service import handler_reset_evidence
+        handler_reset_evidence()
         cls._case_data = CaseDataManager.stub_case_data()
         cls._is_initialized = True
 
@@ -81,33 +113,28 @@ class GameController(QObject):
         return None
     
     @classmethod
-    def _on_initialization_complete(cls, task):
-        """초기화 완료 시 자동 호출되는 콜백"""
-        try:
-            result = task.result()
-            cls._is_initialized = True
-            cls._case_data = CaseData(case=result, profiles=[], evidences=[])
-            cls._send_signal("initialized", None)
-        except Exception as e:
-            print(f"[GameController] 초기화 실패: {e}")
-            import traceback
-            traceback.print_exc()
-            cls._send_signal("initialized", str(e))
+    def _on_initialization_failed(cls, stage: str, e: BaseException):
+        """사건 생성 그래프의 어느 단계든 처음 실패하면 호출되는 콜백 (실패 알림용)"""
+        print(f"[GameController] 초기화 실패 ({stage} 단계): {e}")
+        import traceback
+        traceback.print_exception(e)
+        cls._send_signal("initialized", str(e))
         
 
     @classmethod
     async def prepare_case_data(cls) -> bool :
-
-        timeout = 60
-        elapsed = 0
-        while not cls._is_initialized:
-            if elapsed >= timeout:
-                raise TimeoutError("초기화 시간 초과 (60초)")
-            await asyncio.sleep(0.5)
-            elapsed += 0.5
-        
-        task_profiles = asyncio.create_task(CaseDataManager.generate_profiles_stream())
-        task_profiles.add_done_callback(cls._on_profiles_created)
+        # 사건 풀에서 꺼낸 경우 증거까지 이미 준비되어 있음
+        if cls._from_pool:
+            cls._on_case_data_ready()
+            return True
+        if cls._pipeline is None:
+            raise RuntimeError("initialize()로 사건 생성을 먼저 시작해야 합니다.")
+
+        # 나머지 단계(등장인물, 증거 등)는 그래프가 이어서 진행
+        try:
+            await asyncio.wait_for(asyncio.shield(cls._pipeline.wait("case")), timeout=60)
+        except asyncio.TimeoutError:
+            raise TimeoutError("초기화 시간 초과 (60초)")
         
         return True
 
@@ -128,18 +155,105 @@ class GameController(QObject):
 
     
     @classmethod
-    def _on_profiles_created(cls, task):
-        cls._case_data.profiles = task.result()
-        task_evidences = asyncio.create_task(CaseDataManager.generate_evidences())
-        task_evidences.add_done_callback(cls._on_evidences_created)
+    def _create_case_pipeline(cls) -> StageGraph:
+        """
+        사건 생성 단계 그래프
+        case → profiles → evidences → images → push
+                        └→ behind (증거 생성과 동시에 진행)
+        증거 이미지는 evidences 단계에서 증거 하나가 닫힐 때마다 시작하고, images 단계는 그 완료를 기다림
+        """
+        graph = StageGraph("case", max_concurrency=3)
+        if CASE_GENERATION_MODE == "bundle":
+            # 한 번의 호출로 사건 번들 생성 → images → push
+            graph.add_stage("case", cls._bundle_stage)
+            graph.add_stage("images", cls._images_stage, deps=["case"])
+            graph.add_stage("push", cls._push_stage, deps=["images"])
+            return graph
+
+        graph.add_stage("case", cls._case_stage)
+        graph.add_stage("profiles", cls._profiles_stage, deps=["case"])
+        graph.add_stage("evidences", cls._evidences_stage, deps=["profiles"])
+        graph.add_stage("behind", lambda r: CaseDataManager.generate_case_behind(), deps=["profiles"])
+        graph.add_stage("images", cls._images_stage, deps=["evidences"])
+        graph.add_stage("push", cls._push_stage, deps=["images"])
+        return graph
+
+    @classmethod
+    async def _case_stage(cls, results) -> Case:
+        case = await CaseDataManager.generate_case_stream(callback=cls._on_case_chunk)
+        cls._case_data = CaseData(case=case, profiles=[], evidences=[])
+        cls._is_initialized = True
+        cls._send_signal("initialized", None)
+        return case
+
+    @classmethod
+    async def _bundle_stage(cls, results) -> Case:
+        cls._case_data = await CaseDataManager.generate_case_bundle()
+        cls._is_initialized = True
+        cls._send_signal("initialized", None)
+        return cls._case_data.case
+
+    @classmethod
+    def _on_case_chunk(cls, content: str, html: str) -> None:
+        """사건 개요 토큰이 도착할 때마다 지금까지의 HTML을 UI로 전달"""
+        cls._send_signal("case_stream", html)
+
+    @classmethod
+    async def _profiles_stage(cls, results) -> List[Profile]:
+        # 등장인물 목록은 이 단계에서만 채움 (_on_profile은 UI 알림만 담당)
+        cls._case_data.profiles = await CaseDataManager.generate_profiles_stream(on_profile=cls._on_profile)
+        return cls._case_data.profiles
+
+    @classmethod
+    def _on_profile(cls, profile: Profile) -> None:
+        """등장인물 블록 하나가 완성될 때마다 UI로 전달 (프로필 버튼 먼저 갱신)"""
+        cls._send_signal("profile", profile)
+
+    @classmethod
+    async def _evidences_stage(cls, results) -> List[Evidence]:
+        cls._image_tasks = []
+        return await CaseDataManager.generate_evidences_stream(on_evidence=cls._on_evidence)
+
+    @classmethod
+    def _on_evidence(cls, evidence: Evidence) -> None:
+        """증거 하나가 파싱되면 나머지 증거를 기다리지 않고 이미지 생성 시작"""
+        from evidence import amake_evidence_images
+        cls._image_tasks.append(asyncio.create_task(
+            amake_evidence_images([evidence], **cls._image_callbacks())
+        ))
+
+    @classmethod
+    def _image_callbacks(cls) -> dict:
+        # 이미지가 하나 완성될 때마다 바로 SSE(e-ink)로 전송, 나중에 교체된 그림은 evidence_picture로 전송
+        from tools.service import handler_send_initial_evidence, handler_send_evidence_picture
+        return {
+            "on_image": lambda evidence: handler_send_initial_evidence([evidence]),
+            "on_upgrade": handler_send_evidence_picture,
+        }
 
     @classmethod
-    def _on_evidences_created(cls, task):
-        cls._case_data.evidences = task.result()
+    async def _images_stage(cls, results) -> List[Evidence]:
+        if "evidences" in results:
+            # evidences 단계에서 시작한 이미지 작업 완료 대기
+            await asyncio.gather(*cls._image_tasks)
+            return results["evidences"]
+        # bundle 모드: 증거가 사건과 함께 한 번에 만들어지므로 여기서 일괄 생성
+        return await CaseDataManager.generate_evidence_images(**cls._image_callbacks())
+
+    @classmethod
+    def _push_stage(cls, results) -> None:
+        cls._case_data.evidences = results["images"]
+        # 증거는 images 단계에서 이미 하나씩 전송됨
+        cls._on_case_data_ready(send_evidences=False)
+
+    @classmethod
+    def _on_case_data_ready(cls, send_evidences: bool = True):
+        """케이스 데이터가 모두 준비되면 UI와 하드웨어에 알리고, 사건 풀을 다시 채움"""
         cls._send_signal("initialized", cls._case_data)
-        from tools.service import handler_send_initial_evidence
-        handler_send_initial_evidence(cls._case_data.evidences)
-        asyncio.create_task(CaseDataManager.generate_case_behind())
+        if send_evidences:
+            from tools.service import handler_send_initial_evidence
+            handler_send_initial_evidence(cls._case_data.evidences)
+        CasePool.ensure_refill()
 
     @classmethod
     async def record_start(cls) -> None:
@@ -178,13 +292,19 @@ class GameController(QObject):
         if not text.strip():
             return False
 
+        # 심문 중이면 답변을 문장 단위로 바로 심문 화면과 TTS에 전달
+        on_sentence, streamed, finish_tts = None, [], None
+        if cls._state.phase == Phase.INTERROGATE:
+            on_sentence, streamed, finish_tts = cls._interrogation_sentence_pipeline()
+
         # LangGraph 워크플로우 실행
         try:
             result = await run_workflow(
                 cls._workflow,
                 user_input=text,
                 game_state=cls._state,
-                case_data=cls._case_data
+                case_data=cls._case_data,
+                on_sentence=on_sentence
             )
 
             # 결과 처리
@@ -236,7 +356,15 @@ class GameController(QObject):
                 cls._add_message(cls._state.turn, text)
 
                 # 워크플로우 결과를 심문 화면에 전송
-                if signal_code == "interrogation" and signal_data:
+                if signal_code == "interrogation" and signal_data and streamed:
+                    # 문장은 생성되는 동안 이미 화면/TTS로 전송됨
+                    updated_profile = result.get("current_profile")
+                    if updated_profile:
+                        cls._state.current_profile = updated_profile
+                    role_name = cls._state.current_profile.name if cls._state.current_profile else "증인"
+                    cls._add_message(role_name, response)
+
+                elif signal_code == "interrogation" and signal_data:
                     # 스트리밍 효과를 위해 콜백 사용
                     from tools.service import handler_tts_service, run_str_streaming
 
@@ -270,9 +398,68 @@ class GameController(QObject):
             import traceback
             traceback.print_exc()
             return False
+        finally:
+            if finish_tts:
+                finish_tts()
 
         return True
 
+    @classmethod
+    def _interrogation_sentence_pipeline(cls):
+        """
+        심문 답변 문장 처리 콜백 (on_sentence, 전달된 문장 목록, TTS 종료 함수)
+        - 문장마다 바로 심문 화면 Typewriter로 전송
+        - TTS는 순서가 섞이지 않도록 큐 하나로 차례대로 요청
+        - 첫 문장의 TTS 요청 전송까지 걸린 시간을 interrogation.ttfa로 기록 (사용자 입력 시점부터)
+        """
+        from tools.latency_metrics import LatencyMetrics
+        from tools.service import handler_tts_service
+
+        profile = cls._state.current_profile
+        role = profile.name if profile else "증인"
+        voice = profile.voice if profile else "nraewon"
+        timer = LatencyMetrics.timer("interrogation")
+        queue: asyncio.Queue = asyncio.Queue()
+        streamed: List[str] = []
+
+        def on_sentence(sentence: str) -> None:
+            streamed.append(sentence)
+            cls._send_signal("interrogation", {"role": role, "message": sentence})
+            queue.put_nowait(sentence)
+
+        async def tts_worker():
+            while (sentence := await queue.get()) is not None:
+                try:
+                    await handler_tts_service(sentence, voice)
+                    timer.mark("ttfa")
+                except Exception as e:
+                    print(f"[GameController] TTS 요청 실패: {e}")
+
+        # 이전 답변의 TTS가 아직 남아 있으면 새 답변으로 대체
+        cls._cancel_tts()
+        cls._tts_task = asyncio.create_task(tts_worker())
+        cls._tts_task.add_done_callback(cls._on_tts_done)
+
+        def finish_tts() -> None:
+            # 남은 문장을 모두 보낸 뒤 워커 종료 (종료 결과는 _on_tts_done에서 확인)
+            queue.put_nowait(None)
+
+        return on_sentence, streamed, finish_tts
+
+    @classmethod
+    def _cancel_tts(cls) -> None:
+        """진행 중인 심문 TTS 워커 취소 (게임 초기화, 새 심문 답변 시작 시)"""
+        if cls._tts_task is not None and not cls._tts_task.done():
+            cls._tts_task.cancel()
+        cls._tts_task = None
+
+    @classmethod
+    def _on_tts_done(cls, task: asyncio.Task) -> None:
+        if cls._tts_task is task:
+            cls._tts_task = None
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[GameController] TTS 워커 오류: {task.exception()}")
+
     @classmethod
     def interrogation_end(cls) -> None:
         """심문 화면에서 뒤로 가기 버튼을 눌렀을 때 호출, 심문 종료"""
@@ -295,8 +482,8 @@ class GameController(QObject):
             cls._send_signal("judgement", {'role': '판사', 'message': '최종 판결을 내리겠습니다.'})
             cls._add_message("판사", "최종 판결을 내리겠습니다.")
             
-            # 판결 생성 및 스트리밍
-            cls._get_judgement()
+            # 판결 생성 및 스트리밍 (이벤트 루프를 막지 않도록 비동기 태스크로)
+            asyncio.create_task(cls._get_judgement())
 
     @classmethod
     def get_state(cls) -> GameState:
@@ -344,14 +531,14 @@ class GameController(QObject):
         print(f"[GameController] _objection() called: {cls._state.turn.label()}")
 
     @classmethod
-    def _get_judgement(cls) -> str:
+    async def _get_judgement(cls) -> str:
         """판결 단계에서 최종 결과를 얻어와 메시지에 추가하고 반환."""
         # 쌓인 대화 메시지들을 가져와서 판결 생성
         message_list = cls._state.messages
         print(f"[GameController] 판결 생성 시작 - 총 {len(message_list)}개 메시지")
         
-        # 판결 결과 생성 (동기 함수)
-        judgement_result = get_judge_result(message_list)
+        # 판결 결과 생성 (형법 검색은 스레드에서, LLM은 ainvoke)
+        judgement_result = await aget_judge_result(message_list)
         
         from tools.service import handler_tts_service
 
@@ -5,8 +5,9 @@ from typing import TypedDict, Annotated, Sequence, Literal
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
 from langgraph.graph import StateGraph, END, START
 from langgraph.graph.message import add_messages
+from langchain_core.runnables import RunnableConfig
 from data_models import CaseData, Evidence, Profile, Case, GameState, Phase, Role
-from langchain_openai import ChatOpenAI
+from tools.llm_gateway import get_llm
 
 
 # ============================================
@@ -47,9 +48,7 @@ class GameWorkflowState(TypedDict):
 # ============================================
 # LLM 초기화
 # ============================================
-
-def get_llm(model="gpt-4o-mini", temperature=0.3):
-    return ChatOpenAI(model=model, temperature=temperature)
+# 노드에서 LLM이 필요하면 get_llm(temperature=0.3, chain="workflow") 사용 (tools/llm_gateway.py)
 
 
 # ============================================
@@ -70,38 +69,25 @@ def debate_input_node(state: GameWorkflowState) -> GameWorkflowState:
     }
 
 
-def validate_input_node(state: GameWorkflowState) -> GameWorkflowState:
-    """사용자 입력의 문맥 관련성 및 심문 요청 검증"""
-    from controller import CaseDataManager
-    from interrogation.interrogator import it
-
-    user_input = state.get("user_input", "")
-
-    # 1. 문맥 관련성 검사 (CaseDataManager 사용)
-    result = CaseDataManager.get_instance().check_contextual_relevance(user_input)
-
-    # 2. 심문 요청인 경우 Interrogator.check_request() 사용
-    if result.get("relevant") == "true" and result.get("answer") == "interrogation":
-        # Interrogator 클래스의 check_request 메서드 사용
-        interrogation_result = it.check_request(user_input)
-        type_ = interrogation_result.get("type")
+async def validate_input_node(state: GameWorkflowState) -> GameWorkflowState:
+    """
+    사용자 입력의 문맥 관련성 및 심문 요청 검증
+    기본은 LLM 1회로 관련성 / 심문 대상을 함께 판단 (input_classifier.py, INPUT_VALIDATION_MODE=staged면 기존 2회 호출)
+    """
+    from input_classifier import avalidate_input
 
-        # Interrogator가 이미 _current_profile을 설정했음
-        target_profile = it._current_profile
-
-        result.update({
-            "interrogation_type": type_,
-            "interrogation_answer": interrogation_result.get("answer"),
-            "target_profile": target_profile
-        })
+    result = await avalidate_input(state.get("user_input", ""), state.get("case"), state.get("profiles") or [])
 
     return {
         "validation_result": result
     }
 
 
-def interrogate_node(state: GameWorkflowState) -> GameWorkflowState:
-    """심문 모드에서 증인 응답 생성"""
+async def interrogate_node(state: GameWorkflowState, config: RunnableConfig) -> GameWorkflowState:
+    """
+    심문 모드에서 증인 응답 생성 (토큰 스트리밍)
+    config["configurable"]["on_sentence"]가 있으면 문장이 완성될 때마다 바로 전달
+    """
     from interrogation.interrogator import it
 
     user_input = state.get("user_input", "")
@@ -119,7 +105,8 @@ def interrogate_node(state: GameWorkflowState) -> GameWorkflowState:
         current_profile = it._current_profile
 
     # Interrogator가 대화 메모리를 관리하며 응답 텍스트를 직접 반환
-    response_text = it.build_ask_chain(user_input, current_profile)
+    on_sentence = (config.get("configurable") or {}).get("on_sentence")
+    response_text = await it.astream_ask(user_input, current_profile, on_sentence=on_sentence)
 
     # 메시지 추가
     witness_message = AIMessage(
@@ -139,9 +126,9 @@ def interrogate_node(state: GameWorkflowState) -> GameWorkflowState:
     }
 
 
-def judgement_node(state: GameWorkflowState) -> GameWorkflowState:
+async def judgement_node(state: GameWorkflowState) -> GameWorkflowState:
     """최종 판결 생성 (RAG 포함)"""
-    from verdict import get_judge_result
+    from verdict import aget_judge_result
 
     # 메시지를 dict 형식으로 변환
     messages = state.get("messages", [])
@@ -163,7 +150,7 @@ def judgement_node(state: GameWorkflowState) -> GameWorkflowState:
         })
 
     # 판결 생성
-    judgement_result = get_judge_result(message_list)
+    judgement_result = await aget_judge_result(message_list)
 
     # 판결 메시지 추가
     judge_message = AIMessage(content=judgement_result, name="판사")
@@ -287,9 +274,13 @@ async def run_workflow(
     workflow,
     user_input: str,
     game_state: GameState,
-    case_data: CaseData
+    case_data: CaseData,
+    on_sentence=None
 ):
-    """워크플로우 실행"""
+    """
+    워크플로우 실행
+    on_sentence(sentence): 심문 답변이 문장 단위로 생성될 때마다 호출 (LangGraph config로 노드에 전달)
+    """
 
     # Phase enum을 문자열로 변환 (name 사용)
     phase_str = game_state.phase.name.lower() if hasattr(game_state.phase, 'name') else str(game_state.phase).lower()
@@ -314,6 +305,7 @@ async def run_workflow(
     }
 
     # 워크플로우 실행
-    result = await workflow.ainvoke(initial_state)
+    config = {"configurable": {"on_sentence": on_sentence}} if on_sentence else None
+    result = await workflow.ainvoke(initial_state, config=config)
 
     return result
@@ -0,0 +1,92 @@
+"""
+토론 발언 검증 방식 비교 벤치마크
+- staged : check_contextual_relevance → (심문 요청이면) Interrogator.check_request (LLM 최대 2회 호출)
+- fused  : input_classifier.classify_input (LLM 1회 호출)
+예시 사건(tools/stub.py)에 대해 여러 종류의 발언을 두 방식으로 번갈아 검증하고
+발언당 소요 시간 / 토큰 사용량 / 호출 수와 두 방식의 판단 일치율을 비교함
+
+실행 (core 디렉토리에서) :
+    python -m input_benchmark --runs 3
+"""
+import argparse
+from typing import Dict
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from tools.bench import alternate, measure, report
+
+
+UTTERANCES = [
+    "피고인을 심문하겠습니다.",
+    "목격자 최봄달 씨에게 질문하고 싶습니다.",
+    "최봄딸 씨를 심문하겠습니다.",
+    "김철수 씨를 불러주세요.",
+    "피고인은 사고 당시 전시홀에 있었고 전시물의 위치를 바꾸려 했습니다.",
+    "정영화 씨의 주장은 직접 본 것이 아니라 추측에 불과합니다.",
+    "오늘 저녁 메뉴로 갈비찜 어떨까요?",
+    "요즘 날씨가 너무 덥네요.",
+]
+
+
+def setup_case():
+    from controller import CaseDataManager
+    from interrogation.interrogator import it
+    from tools.stub import stub_case_data
+
+    case_data = stub_case_data()
+    CaseDataManager._case = case_data.case
+    CaseDataManager._profiles = case_data.profiles
+    it.set_case_data(case_data)
+    return case_data
+
+
+def decision(result: Dict) -> str:
+    """두 방식의 판단을 비교하기 위한 요약 (관련성 / 심문 대상)"""
+    if result.get("relevant") != "true":
+        return "reject"
+    if result.get("answer") != "interrogation":
+        return "continue"
+    if result.get("interrogation_type") == "retry":
+        return "retry"
+    profile = result.get("target_profile")
+    return f"interrogate:{profile.name if profile else None}"
+
+
+def main(runs: int = 3):
+    from input_classifier import validate_input
+
+    case_data = setup_case()
+
+    def run(mode):
+        # LLM 호출끼리 비교하도록 로컬 사전 판별은 끔
+        return lambda user_input: validate_input(user_input, case_data.case, case_data.profiles, mode=mode, prefilter=False)
+
+    results = {"staged": [], "fused": []}
+    agree = total = 0
+    for i in range(runs):
+        print(f"[benchmark] {i + 1}/{runs}")
+        for j, user_input in enumerate(UTTERANCES):
+            decisions = {}
+            for name in alternate(["staged", "fused"], i + j):
+                try:
+                    r = measure(run(name), user_input)
+                except Exception as e:
+                    print(f"  - {name}: 실패 ({e})")
+                    continue
+                results[name].append(r)
+                decisions[name] = decision(r["result"])
+            print(f"  - {user_input[:20]:<20} | {decisions}")
+            if len(decisions) == 2:
+                total += 1
+                agree += decisions["staged"] == decisions["fused"]
+
+    report(results, baseline="staged", candidate="fused", unit="발언당")
+    if total:
+        print(f"판단 일치율: {agree}/{total} ({agree / total * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="staged vs fused 발언 검증 벤치마크")
+    parser.add_argument("--runs", type=int, default=3)
+    main(parser.parse_args().runs)
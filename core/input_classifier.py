@@ -0,0 +1,194 @@
+"""
+토론 발언 분류기 (문맥 관련성 + 심문 요청을 LLM 한 번으로 판단)
+- 기존(staged) : check_contextual_relevance(사건 개요) → 심문 요청이면 Interrogator.check_request(프로필) 순서로 2회 호출
+- 통합(fused) : 사건 개요와 등장인물 목록을 한 프롬프트에 넣고
+  관련성 / 심문 의도 / 대상 역할 / 대상 이름 / 판사 답변을 하나의 JSON으로 받음
+- 결과는 validate_input_node가 쓰던 validation_result 형식 그대로 반환
+- validate_input은 먼저 로컬 사전 판별(input_prefilter.py)을 거치고 애매한 발언만 LLM으로 보냄
+- INPUT_VALIDATION_MODE=staged 로 기존 방식 사용 (비교는 input_benchmark.py)
+
+사용 예시 :
+    result = validate_input("피고인을 심문하겠습니다", case_data.case, case_data.profiles)
+    result = await avalidate_input(...)  # 같은 판단을 ainvoke로 (워크플로우 노드에서 사용)
+    # {"relevant": "true", "answer": "interrogation", "interrogation_type": "defendant",
+    #  "interrogation_answer": "피고에 대한 심문을 진행하십시오.", "target_profile": Profile(...)}
+"""
+import os
+from typing import Any, Dict, List
+
+from data_models import Case, Profile
+
+
+INPUT_VALIDATION_MODE = os.getenv("INPUT_VALIDATION_MODE", "fused")  # fused / staged
+
+ROLE_NAMES = {"defendant": "피고", "victim": "피해자", "witness": "목격자", "reference": "참고인"}
+
+CLASSIFIER_PROMPT = """
+당신은 역할극 기반 재판 시뮬레이션의 판사입니다.
+사건 개요: {case_summary}
+등장인물:
+{profiles}
+
+사용자의 새 발언: {user_input}
+
+당신의 역할은 재판 역할극 중의 사용자의 부적절한 발언을 감지하고, 심문 요청이라면 심문 대상을 판단하는 것입니다.
+아래 경우 중 하나를 골라 JSON 하나만 출력하세요.
+
+1. 심문 요청이고 대상을 알 수 있는 경우 (역할이 명시되어 있거나 이름이 등장인물과 일치) :
+    - 예시 : "피고인에게 질문하고 싶습니다.", "참고인을 심문하겠습니다."
+    - type은 defendant / victim / witness / reference 중 하나, name은 등장인물 목록에 있는 이름만
+    {{"relevant": "true", "answer": "interrogation", "type": "defendant", "name": "등장인물 이름", "reply": "피고에 대한 심문을 진행하십시오."}}
+
+2. 심문 요청이지만 이름이 틀린 경우 :
+    - 오타로 예상됨 : {{"relevant": "true", "answer": "interrogation", "type": "retry", "name": "", "reply": "OOO 씨에 대해 얘기하시는 겁니까?"}}
+    - 전혀 다른 이름 : {{"relevant": "true", "answer": "interrogation", "type": "retry", "name": "", "reply": "그런 인물은 없습니다"}}
+
+3. 사용자의 발언이 현재 재판과 관련이 있는 경우 (재판과 관련한 주장을 이어가는 중) :
+    {{"relevant": "true", "answer": "", "type": "", "name": "", "reply": ""}}
+
+4. 상관없는 경우 :
+    - 관련 없는 이유를 `answer`에 한두 줄 짧게 설명하며 엄하게 꾸짖으세요
+    {{"relevant": "false", "answer": "갑자기 뜬금없이 갈비찜 레시피라뇨? 재판과 상관 없는 발언 같습니다.", "type": "", "name": "", "reply": ""}}
+"""
+
+
+def format_profiles(profiles: List[Profile]) -> str:
+    return "\n".join(f"- {ROLE_NAMES.get(p.type, p.type)}({p.type}) : {p.name}" for p in profiles)
+
+
+def build_classifier_chain():
+    from langchain_core.prompts import PromptTemplate
+    from langchain_core.output_parsers import JsonOutputParser
+    from tools.llm_gateway import get_llm
+
+    prompt = PromptTemplate.from_template(CLASSIFIER_PROMPT)
+    return prompt | get_llm(temperature=0.8, chain="input_classifier") | JsonOutputParser()
+
+
+def to_validation_result(raw: Dict[str, Any], user_input: str, profiles: List[Profile]) -> Dict[str, Any]:
+    """통합 분류 JSON → validation_result (심문 대상은 Interrogator._current_profile에도 설정)"""
+    from interrogation.interrogator import Interrogator
+    from interrogation.name_resolver import ROLE_ANSWERS
+
+    relevant = str(raw.get("relevant", "true")).lower()
+    result = {"relevant": relevant, "answer": raw.get("answer") or ""}
+    if relevant != "true" or result["answer"] != "interrogation":
+        return result
+
+    type_ = raw.get("type") or "retry"
+    reply = raw.get("reply") or ""
+    target_profile = None
+    if type_ != "retry":
+        # 역할 표현이나 이름이 맞을 때만 대상으로 정함 (모르는 이름은 되물음)
+        target_profile = Interrogator.find_target_profile(user_input, type_, raw.get("name") or "", profiles,
+                                                          by_type=False)
+        if target_profile is None:
+            type_, reply = "retry", "그런 인물은 없습니다"
+        else:
+            Interrogator._current_profile = target_profile
+            reply = reply or ROLE_ANSWERS.get(target_profile.type, "")
+
+    result.update({
+        "interrogation_type": type_,
+        "interrogation_answer": reply,
+        "target_profile": target_profile,
+    })
+    return result
+
+
+def _classifier_inputs(user_input: str, case: Case, profiles: List[Profile]) -> Dict[str, str]:
+    return {
+        "case_summary": case.outline,
+        "profiles": format_profiles(profiles),
+        "user_input": user_input,
+    }
+
+
+def classify_input(user_input: str, case: Case, profiles: List[Profile]) -> Dict[str, Any]:
+    """LLM 1회 호출로 관련성과 심문 요청을 함께 판단"""
+    raw = build_classifier_chain().invoke(_classifier_inputs(user_input, case, profiles))
+    print(f"[InputClassifier] 결과 : {raw}")
+    return to_validation_result(raw, user_input, profiles)
+
+
+async def aclassify_input(user_input: str, case: Case, profiles: List[Profile]) -> Dict[str, Any]:
+    raw = await build_classifier_chain().ainvoke(_classifier_inputs(user_input, case, profiles))
+    print(f"[InputClassifier] 결과 : {raw}")
+    return to_validation_result(raw, user_input, profiles)
+
+
+def staged_validation(user_input: str) -> Dict[str, Any]:
+    """기존 방식: 문맥 관련성 검사 후 심문 요청이면 Interrogator.check_request (LLM 최대 2회)"""
+    from controller import CaseDataManager
+    from interrogation.interrogator import it
+
+    # 1. 문맥 관련성 검사 (CaseDataManager 사용)
+    result = CaseDataManager.get_instance().check_contextual_relevance(user_input)
+
+    # 2. 심문 요청인 경우 Interrogator.check_request() 사용
+    if _is_interrogation(result):
+        _merge_request(result, it.check_request(user_input))
+    return result
+
+
+async def astaged_validation(user_input: str) -> Dict[str, Any]:
+    from controller import CaseDataManager
+    from interrogation.interrogator import it
+
+    result = await CaseDataManager.get_instance().acheck_contextual_relevance(user_input)
+    if _is_interrogation(result):
+        _merge_request(result, await it.acheck_request(user_input))
+    return result
+
+
+def _is_interrogation(result: Dict[str, Any]) -> bool:
+    return result.get("relevant") == "true" and result.get("answer") == "interrogation"
+
+
+def _merge_request(result: Dict[str, Any], interrogation_result: Dict[str, Any]) -> None:
+    from interrogation.interrogator import it
+
+    # Interrogator가 이미 _current_profile을 설정했음
+    result.update({
+        "interrogation_type": interrogation_result.get("type"),
+        "interrogation_answer": interrogation_result.get("answer"),
+        "target_profile": it._current_profile,
+    })
+
+
+def validate_input(user_input: str, case: Case, profiles: List[Profile], mode: str = None,
+                   prefilter: bool = True) -> Dict[str, Any]:
+    """확실한 발언은 로컬 사전 판별(input_prefilter.py)로 바로 처리하고, 애매한 발언만 LLM으로"""
+    from input_prefilter import InputPrefilter
+
+    if prefilter:
+        result = InputPrefilter.check(user_input, case, profiles)
+        if result is not None:
+            return result
+
+    mode = mode or INPUT_VALIDATION_MODE
+    if mode == "staged":
+        result = staged_validation(user_input)
+    else:
+        result = classify_input(user_input, case, profiles)
+    InputPrefilter.log_decision(user_input, result)
+    return result
+
+
+async def avalidate_input(user_input: str, case: Case, profiles: List[Profile], mode: str = None,
+                          prefilter: bool = True) -> Dict[str, Any]:
+    """validate_input의 비동기 버전 (LLM 호출은 ainvoke, 로컬 사전 판별은 그대로)"""
+    from input_prefilter import InputPrefilter
+
+    if prefilter:
+        result = InputPrefilter.check(user_input, case, profiles)
+        if result is not None:
+            return result
+
+    mode = mode or INPUT_VALIDATION_MODE
+    if mode == "staged":
+        result = await astaged_validation(user_input)
+    else:
+        result = await aclassify_input(user_input, case, profiles)
+    await InputPrefilter.alog_decision(user_input, result)
+    return result
@@ -0,0 +1,270 @@
+"""
+토론 발언 로컬 사전 판별 (LLM 호출 전에 CPU에서 수십 µs 안에 처리)
+- 확실한 경우만 바로 validation_result를 만들고, 애매하면 None을 반환해 LLM 분류기(input_classifier.py)로 넘김
+- 심문 요청 : 짧은 발언 + 요청 표현("심문하겠습니다", "질문하고 싶습니다", "불러주세요" 등)
+  + 대상이 하나로 정해질 때 (interrogation/name_resolver.py : 이름 오타 / 역할 표현 포함)
+- 관련 발언 : 요청 표현이 없고, 사건 개요 / 등장인물 / 재판 용어와 겹치는 단어가 min_overlap개 이상이면서
+  그중 하나 이상은 이 사건의 개요 단어나 등장인물 이름일 때 (재판 용어만으로는 "요즘 사건이 많아서 재판이 힘드네요" 같은 잡담도 통과하므로)
+- 관련 없는 발언은 판사의 꾸짖는 답변이 필요하므로 항상 LLM으로 넘김
+- (선택) LLM이 내린 판단을 log_path에 쌓아 두고 학습한 작은 나이브 베이즈 모델이
+  "관련 발언" 확률을 model_threshold 이상으로 보면 바로 통과
+
+설정 : chain_config.yaml 의 input_prefilter 섹션
+
+사용 예시 :
+    result = InputPrefilter.check("피고인을 심문하겠습니다", case, profiles)  # 확실하면 validation_result, 아니면 None
+    InputPrefilter.log_decision(user_input, llm_result)  # LLM 판단 기록 (모델 학습용)
+    await InputPrefilter.alog_decision(user_input, llm_result)  # 이벤트 루프에서는 파일 쓰기를 스레드로
+    python -m input_prefilter --train                    # 기록으로 모델 학습 (core 디렉토리에서)
+"""
+import asyncio
+import json
+import math
+import re
+import time
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from data_models import Case, Profile
+from tools.chain_config import get_chain_config
+
+
+ROOT_DIR = Path(__file__).parent.parent
+
+# 요청 표현: 심문 키워드 뒤에 짧은 거리 안에 요청/의지 어미가 오는 경우만
+INTENT_RE = re.compile(
+    r"(심문|신문|질문|소환|불러)[^.?!]{0,12}?"
+    r"(하겠|하고\s*싶|할게|할래|해도|요청|신청|드리|부탁|주세요|주십시오|해\s*주|하죠|시작)"
+)
+MAX_INTENT_LENGTH = 60  # 이보다 긴 발언 속 요청 표현은 주장 중 인용일 수 있어서 LLM으로
+
+# 재판 진행에서 자주 쓰는 단어 (사건 개요에 없어도 관련 발언으로 셈)
+TRIAL_TERMS = frozenset({
+    "재판", "사건", "증거", "증언", "진술", "주장", "무죄", "유죄", "판결", "판사", "재판장",
+    "검사", "검찰", "변호인", "변호사", "피고인", "피고", "피해자", "목격자", "참고인", "증인",
+    "알리바이", "혐의", "범행", "고의", "과실", "책임", "기소", "이의", "반박", "정황", "동기",
+})
+
+WORD_RE = re.compile(r"[가-힣A-Za-z0-9]+")
+PARTICLES = ("에게서", "으로서", "에서는", "에게", "에서", "으로", "까지", "부터", "라고", "이라고",
+             "와의", "과의", "에는", "은", "는", "이", "가", "을", "를", "에", "의", "와", "과", "도", "로", "만")
+# 서술어는 사건 단어로 쓰지 않음
+PREDICATE_RE = re.compile(r"(습니다|니다|었다|였다|했다|한다|하고|하며|하는|했던|하였|이며|있는|없는|있었|없었)$")
+
+_FEATURE_N = 2
+
+
+def _stem(word: str) -> str:
+    for particle in PARTICLES:
+        if word.endswith(particle) and len(word) - len(particle) >= 2:
+            return word[:-len(particle)]
+    return word
+
+
+def terms(text: str) -> FrozenSet[str]:
+    """조사를 뗀 2글자 이상 단어 (서술어 제외)"""
+    result = set()
+    for word in WORD_RE.findall(text):
+        if PREDICATE_RE.search(word):
+            continue
+        word = _stem(word)
+        if len(word) >= 2:
+            result.add(word)
+    return frozenset(result)
+
+
+@lru_cache(maxsize=8)
+def _case_terms(outline: str, names: tuple) -> FrozenSet[str]:
+    # 이 사건에만 해당하는 단어 (사건이 바뀔 때만 다시 만듦, 재판 용어는 제외)
+    return (terms(outline) | frozenset(names)) - TRIAL_TERMS
+
+
+def _features(text: str) -> List[str]:
+    # 띄어쓰기 오류/STT 변형에 강하도록 글자 bigram + 단어
+    compact = re.sub(r"\s+", "", text)
+    grams = [compact[i:i + _FEATURE_N] for i in range(len(compact) - _FEATURE_N + 1)]
+    return grams + [f"w:{t}" for t in terms(text)]
+
+
+class InputPrefilter:
+    _lock = Lock()
+    _model : Optional[Dict[str, Any]] = None
+    _model_mtime : Optional[float] = None
+    _stats : Counter = Counter()
+
+    @classmethod
+    def check(cls, user_input: str, case: Case, profiles: List[Profile]) -> Optional[Dict[str, Any]]:
+        """확실한 경우 validation_result, 애매하면 None (LLM으로)"""
+        conf = get_chain_config("input_prefilter")
+        if not conf.get("enabled", True) or not user_input.strip():
+            return None
+
+        start = time.perf_counter()
+        result = cls._check_interrogation(user_input, profiles)
+        if result is None and not INTENT_RE.search(user_input):
+            result = cls._check_relevance(user_input, case, profiles, conf)
+        elapsed_us = (time.perf_counter() - start) * 1e6
+
+        with cls._lock:
+            cls._stats["hit" if result else "escalated"] += 1
+        if result:
+            print(f"[InputPrefilter] 로컬 판별 ({result['source']}): {result.get('interrogation_type') or 'continue'} ({elapsed_us:.0f}µs)")
+        return result
+
+    @classmethod
+    def _check_interrogation(cls, user_input: str, profiles: List[Profile]) -> Optional[Dict[str, Any]]:
+        if len(user_input) > MAX_INTENT_LENGTH or not INTENT_RE.search(user_input):
+            return None
+
+        from interrogation.interrogator import Interrogator
+        from interrogation.name_resolver import NameResolver, ROLE_ANSWERS
+
+        # 대상이 없거나 후보가 여럿이면 LLM이 판단
+        resolved = NameResolver.resolve(user_input, profiles)
+        if resolved["status"] != "resolved":
+            return None
+
+        target = resolved["profile"]
+        Interrogator._current_profile = target
+        return {
+            "relevant": "true",
+            "answer": "interrogation",
+            "interrogation_type": target.type,
+            "interrogation_answer": ROLE_ANSWERS.get(target.type, ""),
+            "target_profile": target,
+            "source": "rule",
+        }
+
+    @classmethod
+    def _check_relevance(cls, user_input: str, case: Case, profiles: List[Profile],
+                         conf: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        case_terms = _case_terms(case.outline if case else "", tuple(p.name for p in profiles))
+        words = terms(user_input)
+        # 이름은 조사가 붙어도 잡히도록 원문에서 한 번 더 확인
+        specific = (words & case_terms) | {p.name for p in profiles if p.name in user_input}
+        overlap = specific | (words & TRIAL_TERMS)
+        if specific and len(overlap) >= int(conf.get("min_overlap", 2)):
+            return {"relevant": "true", "answer": "", "source": "overlap"}
+
+        probability = cls.predict(user_input)
+        if probability is not None and probability >= float(conf.get("model_threshold", 0.9)):
+            return {"relevant": "true", "answer": "", "source": "model"}
+        return None
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        with cls._lock:
+            return dict(cls._stats)
+
+    # -------------------- 판단 기록 / 모델 --------------------
+
+    @staticmethod
+    def label(result: Dict[str, Any]) -> str:
+        if result.get("relevant") != "true":
+            return "reject"
+        if result.get("answer") == "interrogation":
+            return "interrogation"
+        return "continue"
+
+    @classmethod
+    def log_decision(cls, user_input: str, result: Dict[str, Any]) -> None:
+        """LLM이 내린 판단을 JSONL로 기록 (로컬 판별 결과는 기록하지 않음)"""
+        conf = get_chain_config("input_prefilter")
+        if not conf.get("log_decisions", True):
+            return
+        path = ROOT_DIR / conf.get("log_path", "data/input_prefilter/decisions.jsonl")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            line = json.dumps({"input": user_input, "label": cls.label(result)}, ensure_ascii=False)
+            with cls._lock, open(path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except Exception as e:
+            print(f"[InputPrefilter] 판단 기록 실패: {e}")
+
+    @classmethod
+    async def alog_decision(cls, user_input: str, result: Dict[str, Any]) -> None:
+        """log_decision을 스레드에서 실행 (UI 이벤트 루프에서 파일 쓰기로 막히지 않도록)"""
+        await asyncio.to_thread(cls.log_decision, user_input, result)
+
+    @classmethod
+    def train(cls) -> Optional[Dict[str, Any]]:
+        """기록된 판단으로 "관련 발언(continue)" vs 나머지 나이브 베이즈 모델 학습 후 저장"""
+        conf = get_chain_config("input_prefilter")
+        log_path = ROOT_DIR / conf.get("log_path", "data/input_prefilter/decisions.jsonl")
+        model_path = ROOT_DIR / conf.get("model_path", "data/input_prefilter/model.json")
+        if not log_path.is_file():
+            print(f"[InputPrefilter] 학습할 기록이 없습니다: {log_path}")
+            return None
+
+        classes = {"continue": Counter(), "other": Counter()}
+        docs = Counter()
+        with open(log_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                cls_name = "continue" if entry.get("label") == "continue" else "other"
+                docs[cls_name] += 1
+                classes[cls_name].update(_features(entry.get("input", "")))
+
+        model = {
+            "docs": dict(docs),
+            "vocab": len(set(classes["continue"]) | set(classes["other"])),
+            "totals": {name: sum(counts.values()) for name, counts in classes.items()},
+            "counts": {name: dict(counts) for name, counts in classes.items()},
+        }
+        model_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(model_path, "w", encoding="utf-8") as f:
+            json.dump(model, f, ensure_ascii=False)
+        print(f"[InputPrefilter] 모델 학습 완료: {dict(docs)} → {model_path}")
+        return model
+
+    @classmethod
+    def _load_model(cls) -> Optional[Dict[str, Any]]:
+        conf = get_chain_config("input_prefilter")
+        model_path = ROOT_DIR / conf.get("model_path", "data/input_prefilter/model.json")
+        try:
+            mtime = model_path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        with cls._lock:
+            if cls._model_mtime != mtime:
+                with open(model_path, encoding="utf-8") as f:
+                    cls._model = json.load(f)
+                cls._model_mtime = mtime
+            return cls._model
+
+    @classmethod
+    def predict(cls, user_input: str) -> Optional[float]:
+        """관련 발언일 확률 (모델이 없거나 학습 데이터가 min_samples보다 적으면 None)"""
+        model = cls._load_model()
+        conf = get_chain_config("input_prefilter")
+        if not model or sum(model["docs"].values()) < int(conf.get("min_samples", 50)):
+            return None
+
+        total_docs = sum(model["docs"].values())
+        vocab = model["vocab"] + 1
+        features = _features(user_input)
+        scores = {}
+        for name in ("continue", "other"):
+            counts, total = model["counts"].get(name, {}), model["totals"].get(name, 0)
+            score = math.log((model["docs"].get(name, 0) + 1) / (total_docs + 2))
+            for feature in features:
+                score += math.log((counts.get(feature, 0) + 1) / (total + vocab))
+            scores[name] = score
+        # 로그 확률 → 정규화된 확률
+        top = max(scores.values())
+        exp = {name: math.exp(score - top) for name, score in scores.items()}
+        return exp["continue"] / sum(exp.values())
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="발언 로컬 사전 판별 모델 학습")
+    parser.add_argument("--train", action="store_true")
+    if parser.parse_args().train:
+        InputPrefilter.train()
@@ -0,0 +1,179 @@
+"""
+심문 대화 메모리 (인물별)
+- 최근 keep_turns개의 질문/답변은 그대로 프롬프트에 넣고, 그보다 오래된 턴은 요약 하나로 접음
+- 요약은 fold_batch개 이상 쌓였을 때 백그라운드 스레드에서 갱신 (답변 생성을 기다리게 하지 않음)
+- 요약이 아직 안 끝났으면 접히지 않은 턴을 그대로 넣으므로 대화 내용이 빠지지 않음
+- 요약 길이는 summary_token_budget 토큰 이내로 유지
+- 턴마다 "전체 대화를 그대로 넣었을 때" 대비 줄어든 프롬프트 토큰 수를 기록
+
+설정 : chain_config.yaml 의 interrogation_memory 섹션
+
+사용 예시 :
+    memory = ConversationMemory("김민준")
+    messages, text = memory.prompt_messages()  # [요약 SystemMessage, Human, AI, ...] + 같은 내용의 텍스트
+    memory.add_turn(question, answer)  # 답변 후 기록 (필요하면 백그라운드 요약 시작)
+    memory.stats()                     # {"turns": 7, "folded": 3, "saved_tokens": 412, ...}
+"""
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Dict, List, Tuple
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+from tools.chain_config import get_chain_config
+
+
+SUMMARY_PROMPT = """당신은 법정 심문 기록을 정리하는 서기입니다.
+아래는 {name}에 대한 지금까지의 심문 요약과, 요약에 새로 합칠 질문/답변입니다.
+
+기존 요약:
+{summary}
+
+새 질문/답변:
+{turns}
+
+기존 요약과 새 질문/답변을 합쳐 요약을 갱신하세요.
+- {name}이(가) 진술한 사실, 주장, 말 바꾸기, 감정 변화를 빠짐없이 남기세요.
+- 인사말이나 반복되는 내용은 빼세요.
+- {budget} 토큰 이내의 한국어 문장으로만 출력하세요."""
+
+# 요약은 순서대로 하나씩 (같은 인물의 요약이 겹쳐서 갱신되지 않도록)
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-summary")
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """gpt-4o 계열 토크나이저 기준 토큰 수 (tiktoken이 없으면 대략 2글자당 1토큰)"""
+    global _encoding
+    if not text:
+        return 0
+    try:
+        if _encoding is None:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("o200k_base")
+        return len(_encoding.encode(text))
+    except Exception:
+        return len(text) // 2
+
+
+def _truncate_tokens(text: str, budget: int) -> str:
+    if count_tokens(text) <= budget:
+        return text
+    if _encoding is None:
+        return text[:budget * 2]
+    return _encoding.decode(_encoding.encode(text)[:budget])
+
+
+def format_turns(turns: List[Dict[str, str]], start: int = 1) -> str:
+    return "".join(f"Q{i}: {t['question']}\nA{i}: {t['answer']}\n" for i, t in enumerate(turns, start))
+
+
+class ConversationMemory:
+    def __init__(self, name: str):
+        conf = get_chain_config("interrogation_memory")
+        self.name = name
+        self.enabled = conf.get("enabled", True)
+        self.keep_turns = int(conf.get("keep_turns", 4))
+        self.fold_batch = max(1, int(conf.get("fold_batch", 2)))
+        self.summary_token_budget = int(conf.get("summary_token_budget", 300))
+
+        self.turns : List[Dict[str, Any]] = []  # 전체 질문/답변 (get_conversation_history용)
+        self.summary = ""
+        self.folded = 0                          # 요약에 들어간 턴 수 (turns[:folded])
+        self.saved_tokens = 0                    # 지금까지 줄인 프롬프트 토큰 합
+        self.summary_tokens = 0                  # 요약 호출에 쓴 토큰 (입력 + 출력)
+        self._lock = Lock()
+        self._summarizing = False
+
+    def prompt_messages(self) -> Tuple[List[BaseMessage], str]:
+        """
+        고정 system 프롬프트 뒤에 붙일 메시지 (요약 SystemMessage + 접히지 않은 턴의 Human/AI 메시지)
+        와 같은 내용의 텍스트(토큰 절약량 계산용)
+        요약은 fold 때만 바뀌므로 그 사이의 턴들은 앞부분이 같아서 프롬프트 캐시가 계속 적중함
+        """
+        with self._lock:
+            summary, folded, recent = self.summary, self.folded, self.turns[self.folded:]
+        messages : List[BaseMessage] = []
+        if summary:
+            messages.append(SystemMessage(content=f"이전 대화 요약 (Q1~Q{folded}):\n{summary}"))
+        for turn in recent:
+            messages.append(HumanMessage(content=turn["question"]))
+            messages.append(AIMessage(content=turn["answer"]))
+        return messages, self._render(summary, folded, recent)
+
+    def render(self) -> str:
+        """대화 기록 텍스트 (요약 + 접히지 않은 턴)"""
+        with self._lock:
+            summary, folded, recent = self.summary, self.folded, self.turns[self.folded:]
+        return self._render(summary, folded, recent)
+
+    @staticmethod
+    def _render(summary: str, folded: int, recent: List[Dict[str, Any]]) -> str:
+        history = ""
+        if summary:
+            history += f"\n\n이전 대화 요약 (Q1~Q{folded}):\n{summary}"
+        if recent:
+            history += "\n\n이전 대화 내역:\n" + format_turns(recent, start=folded + 1)
+        return history
+
+    def add_turn(self, question: str, answer: str, prompt_history: str = None) -> Dict[str, Any]:
+        """
+        턴 기록. prompt_history(이번 답변에 실제로 넣은 대화 기록)를 넘기면
+        전체 대화를 그대로 넣었을 때와의 토큰 차이를 saved_tokens로 남김
+        """
+        turn = {"question": question, "answer": answer, "saved_tokens": 0}
+        with self._lock:
+            if prompt_history is not None and self.turns:
+                naive = "\n\n이전 대화 내역:\n" + format_turns(self.turns)
+                turn["saved_tokens"] = max(0, count_tokens(naive) - count_tokens(prompt_history))
+                self.saved_tokens += turn["saved_tokens"]
+            self.turns.append(turn)
+        self._maybe_fold()
+        return turn
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "turns": len(self.turns),
+                "folded": self.folded,
+                "summary_tokens_in_prompt": count_tokens(self.summary),
+                "saved_tokens": self.saved_tokens,
+                "summary_call_tokens": self.summary_tokens,
+            }
+
+    # -------------------- 요약 --------------------
+
+    def _maybe_fold(self) -> None:
+        with self._lock:
+            end = len(self.turns) - self.keep_turns
+            if not self.enabled or self._summarizing or end - self.folded < self.fold_batch:
+                return
+            self._summarizing = True
+            start, summary, pending = self.folded, self.summary, list(self.turns[self.folded:end])
+        _executor.submit(self._fold, start, end, summary, pending)
+
+    def _fold(self, start: int, end: int, summary: str, pending: List[Dict[str, Any]]) -> None:
+        from langchain_core.output_parsers import StrOutputParser
+        from langchain_core.prompts import PromptTemplate
+        from tools.llm_gateway import get_llm
+        try:
+            inputs = {
+                "name": self.name,
+                "summary": summary or "(없음)",
+                "turns": format_turns(pending, start=start + 1),
+                "budget": self.summary_token_budget,
+            }
+            chain = PromptTemplate.from_template(SUMMARY_PROMPT) | get_llm(temperature=0.3, chain="interrogation_summary") | StrOutputParser()
+            new_summary = _truncate_tokens(chain.invoke(inputs).strip(), self.summary_token_budget)
+            with self._lock:
+                self.summary = new_summary
+                self.folded = end
+                self.summary_tokens += count_tokens(SUMMARY_PROMPT.format(**inputs)) + count_tokens(new_summary)
+            print(f"[ConversationMemory] {self.name} Q1~Q{end} 요약 완료 | {self.stats()}")
+        except Exception as e:
+            # 실패하면 접지 않은 턴을 그대로 쓰고 다음 턴에 다시 시도
+            print(f"[ConversationMemory] {self.name} 요약 실패: {e}")
+        finally:
+            with self._lock:
+                self._summarizing = False
+        self._maybe_fold()
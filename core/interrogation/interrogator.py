@@ -1,9 +1,11 @@
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
 from langchain_core.output_parsers import StrOutputParser, JsonOutputParser
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
 from data_models import CaseData, Case, Profile, Evidence
 from typing import List, Dict, Optional
+from tools.llm_gateway import get_llm
+from .conversation_memory import ConversationMemory
+from .name_resolver import NameResolver, ROLE_ANSWERS
 
 
 # 템플릿 임포트
@@ -23,13 +25,8 @@ from .prompt_templates.ex_witness_templates import (
 
 # ... existing code ...
 
-def get_llm(model="gpt-4o-mini"):
-    llm = ChatOpenAI(model=model)  
-    return llm
-
-
 def ask_witness(question, name, wtype, case_summary):
-    llm = get_llm()
+    llm = get_llm(chain="interrogation_answer")
     
     if wtype == "expert":
         context = ASK_WITNESS_EXPERT_TEMPLATE.format(name=name, case_summary=case_summary)
@@ -48,7 +45,7 @@ def ask_witness(question, name, wtype, case_summary):
 
 
 def ask_defendant(question, defendant_name, case_summary):
-    llm = get_llm()
+    llm = get_llm(chain="interrogation_answer")
     
     context = ASK_DEFENDANT_TEMPLATE.format(defendant_name=defendant_name, case_summary=case_summary)
 
@@ -75,10 +72,11 @@ class Interrogator:
     _profiles : List[Profile] = None
     _role = None
     _current_profile : Profile = None
-    llm = get_llm("gpt-5-mini")  # 기본 LLM 설정
+    llm = get_llm(chain="interrogation_answer")  # 기본 LLM 설정 (게이트웨이가 클라이언트 재사용)
     
     # 각 인물별 대화 히스토리를 관리 (인물명을 키로 사용)
-    _chat_histories: Dict[str, List] = {}
+    # messages는 전체 질문/답변, memory는 프롬프트에 넣을 요약 + 최근 턴 (conversation_memory.py)
+    _chat_histories: Dict[str, Dict] = {}
 
     def __new__(cls):
         if cls._instance is None:
@@ -100,10 +98,63 @@ class Interrogator:
         cls._case = case_data.case
         cls._profiles = case_data.profiles
         cls._evidence = case_data.evidences
+        NameResolver.build(case_data.profiles)
         return True
 
     @classmethod
     def build_ask_chain(cls, question: str, profile: Profile):
+        memory, messages, conversation_history = cls._prepare_ask(question, profile)
+        
+        # LLM 실행 (캐시 적중량은 게이트웨이가 TokenUsageStats에 기록)
+        answer = cls.llm.invoke(messages).content
+        
+        cls._record_turn(profile, memory, question, answer, conversation_history)
+        return answer
+
+    @classmethod
+    async def abuild_ask_chain(cls, question: str, profile: Profile) -> str:
+        """build_ask_chain의 비동기 버전 (이벤트 루프를 막지 않음)"""
+        memory, messages, conversation_history = cls._prepare_ask(question, profile)
+        answer = (await cls.llm.ainvoke(messages)).content
+        cls._record_turn(profile, memory, question, answer, conversation_history)
+        return answer
+
+    @classmethod
+    async def astream_ask(cls, question: str, profile: Profile, on_sentence=None) -> str:
+        """
+        build_ask_chain의 스트리밍 버전: 토큰을 받으면서 문장이 완성될 때마다 on_sentence(sentence) 호출
+        (심문 화면 Typewriter / TTS가 답변 전체를 기다리지 않고 첫 문장부터 시작)
+        첫 토큰(ttfw), 첫 문장(first_sentence), 완료(total) 시간은 LatencyMetrics에 기록
+        """
+        from tools.latency_metrics import LatencyMetrics
+        from tools.service import SentenceSplitter
+        memory, messages, conversation_history = cls._prepare_ask(question, profile)
+        timer = LatencyMetrics.timer("interrogation")
+        splitter = SentenceSplitter()
+        answer = ""
+
+        def emit(sentences):
+            for sentence in sentences:
+                timer.mark("first_sentence")
+                if on_sentence:
+                    on_sentence(sentence)
+
+        async for chunk in cls.llm.astream(messages):
+            if not chunk.content:
+                continue
+            timer.mark("ttfw")
+            answer += chunk.content
+            emit(splitter.feed(chunk.content))
+        emit(splitter.close())
+        timer.mark("total")
+        print(f"[Interrogator] {profile.name} 답변 스트리밍: {timer.report()}")
+
+        cls._record_turn(profile, memory, question, answer, conversation_history)
+        return answer
+
+    @classmethod
+    def _prepare_ask(cls, question: str, profile: Profile):
+        """(대화 메모리, LLM에 보낼 메시지, 토큰 절약량 계산용 대화 기록 텍스트)"""
         profile_key = f"{profile.name}_{profile.type}"
         
         # 해당 인물과의 대화 히스토리가 없으면 초기화 (최초 1회만)
@@ -118,25 +169,35 @@ class Interrogator:
                     "age": profile.age
 
                 },
-                "messages": []  # 질문-답변 히스토리
+                "memory": ConversationMemory(profile.name)
             }
+            cls._chat_histories[profile_key]["messages"] = cls._chat_histories[profile_key]["memory"].turns  # 질문-답변 히스토리
             # print(f"[대화 메모리] {profile.name}({profile.type})와의 새로운 심문 시작")
             print(f"{profile.personality}")
+            cls._chat_histories[profile_key]["system_prompt"] = cls._build_system_prompt(cls._chat_histories[profile_key]["context"])
         # 이전 대화 히스토리 가져오기
         history_data = cls._chat_histories[profile_key]
-        context = history_data["context"]
-        messages = history_data["messages"]
+        memory = history_data["memory"]
         
-        # 이전 대화를 텍스트로 포맷팅
-        conversation_history = ""
-        if messages:
-            conversation_history = "\n\n이전 대화 내역:\n"
-            for i, msg in enumerate(messages, 1):
-                conversation_history += f"Q{i}: {msg['question']}\nA{i}: {msg['answer']}\n"
+        # 고정된 system 프롬프트(인물/사건/프로필) 뒤에 실제 Human/AI 메시지로 대화를 이어 붙임
+        # → 매 턴 요청의 앞부분이 바이트 단위로 같아서 OpenAI 프롬프트 캐시가 적중함
+        # 오래된 대화는 요약으로, 최근 대화만 그대로 포함 (턴이 늘어도 프롬프트 길이가 일정하게 유지됨)
+        history_messages, conversation_history = memory.prompt_messages()
+        messages = [SystemMessage(content=history_data["system_prompt"]), *history_messages, HumanMessage(content=question)]
+        return memory, messages, conversation_history
+
+    @staticmethod
+    def _record_turn(profile: Profile, memory: ConversationMemory, question: str, answer: str,
+                     conversation_history: str) -> None:
+        # 대화 히스토리에 추가 (필요하면 백그라운드에서 오래된 턴 요약)
+        turn = memory.add_turn(question, answer, prompt_history=conversation_history)
         
-        # ChatPromptTemplate으로 명확하게 system role 지정
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", f"""당신은 재판에 참석한 {context['role']}입니다.
+        print(f"[대화 메모리] 현재 {profile.name}와의 대화 턴: {len(memory.turns)}턴, 절약 토큰 {turn['saved_tokens']} (누적 {memory.saved_tokens})")
+
+    @staticmethod
+    def _build_system_prompt(context: Dict) -> str:
+        """인물별로 한 번만 만드는 고정 system 프롬프트 (대화 내용이 들어가지 않음)"""
+        return f"""당신은 재판에 참석한 {context['role']}입니다.
 당신의 역할은 사건에 대한 질문에 인간적으로 답변하는 것입니다.
 
 사건 개요:
@@ -155,24 +216,7 @@ class Interrogator:
 - 답변은 4줄을 넘지 않게 간결하게 하고 "제 진술이 사건 해결에 도움이 되기를 바랍니다." 같이 쓸데없는 소리는 하지 마세요.
 - 계속 대화를 이어가는 말투로 답변하세요.
 - 당신의 프로필 속 성격과 성별, 나이를 반영한 말투로 답변하세요.
-- 이전 대화 내용을 참고하여 일관성 있게 답변하세요.{conversation_history}"""),
-            ("human", "{question}")
-        ])
-        
-        # LLM 체인 실행
-        cls.llm = get_llm()
-        chain = prompt | cls.llm | StrOutputParser()
-        answer = chain.invoke({"question": question})
-        
-        # 대화 히스토리에 추가
-        messages.append({
-            "question": question,
-            "answer": answer
-        })
-        
-        print(f"[대화 메모리] 현재 {profile.name}와의 대화 턴: {len(messages)}턴")
-        
-        return answer
+- 이전 대화 내용을 참고하여 일관성 있게 답변하세요."""
     
     @classmethod
     def reset_conversation(cls, profile: Profile = None):
@@ -207,7 +251,39 @@ class Interrogator:
     
     @classmethod
     def check_request(cls, user_input: str) -> Optional[Dict]:
-        """사용자의 심문 요청을 분석하여 JSON 형식으로 반환합니다."""
+        """
+        사용자의 심문 요청을 분석하여 JSON 형식으로 반환합니다.
+        이름/역할로 대상이 확실하면 로컬에서 바로 결정하고, 확실하지 않으면(후보가 비슷하거나 점수가 낮거나 없음) LLM 호출
+        """
+        result = cls._resolve_request_locally(user_input)
+        if result is not None:
+            return result
+
+        result = cls._build_request_chain().invoke({"profile_data": cls._profiles.__str__(), "user_input": user_input})
+        return cls._apply_request_result(user_input, result)
+
+    @classmethod
+    async def acheck_request(cls, user_input: str) -> Optional[Dict]:
+        """check_request의 비동기 버전 (이벤트 루프를 막지 않음)"""
+        result = cls._resolve_request_locally(user_input)
+        if result is not None:
+            return result
+
+        result = await cls._build_request_chain().ainvoke({"profile_data": cls._profiles.__str__(), "user_input": user_input})
+        return cls._apply_request_result(user_input, result)
+
+    @classmethod
+    def _resolve_request_locally(cls, user_input: str) -> Optional[Dict]:
+        resolved = NameResolver.resolve(user_input, cls._profiles)
+        print(f"[Interrogator] 이름 판별: {resolved['status']} {resolved['candidates']}")
+        if resolved["status"] == "resolved":
+            cls._current_profile = resolved["profile"]
+            return {"type": cls._current_profile.type, "answer": ROLE_ANSWERS.get(cls._current_profile.type, "")}
+        # suggest / ambiguous / none은 LLM이 되물을지 결정
+        return None
+
+    @staticmethod
+    def _build_request_chain():
         prompt = PromptTemplate.from_template("""
         당신은 법정 역할극을 조정하는 AI입니다. 사용자가 심문을 진행하려고 합니다.
         사용자 발언: {user_input}
@@ -228,32 +304,47 @@ class Interrogator:
             - 전혀 다른 이름 : {{"type": "retry", "answer": "그런 인물은 없습니다"}}
         """)
 
-        llm = get_llm()
-        chain = prompt | llm | JsonOutputParser()
-        result = chain.invoke({"profile_data": cls._profiles.__str__(), "user_input": user_input})
+        llm = get_llm(chain="interrogation_request")
+        return prompt | llm | JsonOutputParser()
+
+    @classmethod
+    def _apply_request_result(cls, user_input: str, result: Dict) -> Dict:
         type = result.get("type")
 
         if type != "retry":
             # 심문 요청이 유효한 경우, 프로필 리스트에서 해당 타입과 일치하는 프로필 찾기
-            target_profile = None
-            
-            # 사용자가 이름을 직접 언급했는지 확인
-            for profile in cls._profiles:
-                if profile.name in user_input:
-                    target_profile = profile
-                    break
-            
-            # 이름이 없으면 타입으로 찾기
-            if not target_profile:
-                for profile in cls._profiles:
-                    if profile.type == type:
-                        target_profile = profile
-                        break
-            
-            cls._current_profile = target_profile
+            cls._current_profile = cls.find_target_profile(user_input, type)
 
         return result
 
+    @classmethod
+    def find_target_profile(cls, user_input: str, type: str, name: str = "",
+                            profiles: Optional[List[Profile]] = None, by_type: bool = True) -> Optional[Profile]:
+        """
+        발언 속 이름/역할(오타 포함) → LLM이 고른 이름(name) → 역할(type) 순으로 심문 대상 프로필 찾기
+        by_type=False이면 이름이 맞을 때만 반환 (틀린 이름이 그 역할의 인물로 바뀌지 않도록)
+        """
+        profiles = profiles if profiles is not None else cls._profiles or []
+
+        # 사용자가 이름을 직접 언급했는지 확인 (STT 오타는 자모 단위로 비교)
+        resolved = NameResolver.resolve(user_input, profiles)
+        if resolved["status"] == "resolved":
+            return resolved["profile"]
+
+        if name:
+            for profile in profiles:
+                if profile.name == name:
+                    return profile
+
+        if not by_type:
+            return None
+
+        # 이름이 없으면 타입으로 찾기
+        for profile in profiles:
+            if profile.type == type:
+                return profile
+        return None
+
 
 # 싱글톤 인스턴스 생성
     
@@ -0,0 +1,196 @@
+"""
+심문 대상 이름 로컬 판별 (자모 분해 + 편집 거리)
+- STT가 이름을 자주 틀리게 받아 적음 (최봄달 → 최봄딸, 최 봄달, 채봄달 ...)
+- 한글 음절을 초성/중성/종성 자모로 분해한 뒤 편집 거리로 비교해서 한 글자 안의 작은 차이는 작게 계산
+- 피고/피고인/목격자 같은 역할 표현도 해당 역할의 인물 후보로 계산 (단어 단위로 비교, "피고소인"은 "고소인"이 아님)
+- 성을 뺀 이름만 부른 경우("민준 씨" → 김민준)도 이름을 그대로 부른 것으로 계산
+- 1등 점수가 accept_score 이상이고 2등과의 차이가 margin 이상이면 바로 결정 (LLM 호출 없음)
+- 1등과 2등이 margin 안이면 ambiguous, 1등이 suggest_score ~ accept_score 사이면 suggest
+  → 둘 다 LLM(check_request)이 판단
+
+설정 : chain_config.yaml 의 name_resolver 섹션
+
+사용 예시 :
+    NameResolver.build(case_data.profiles)      # 사건이 정해질 때 한 번 (인물 4명 색인)
+    result = NameResolver.resolve("최봄딸 씨를 심문하겠습니다")
+    # {"status": "resolved", "profile": Profile(최봄달), "score": 0.88, "candidates": [("최봄달", 0.88), ...]}
+"""
+import re
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from data_models import Profile
+from tools.chain_config import get_chain_config
+
+
+# 역할 표현 → 프로필 type ("증인"은 목격자/참고인 둘 다 될 수 있어서 제외)
+ROLE_ALIASES = {
+    "피고인": "defendant", "피고": "defendant", "피의자": "defendant",
+    "피해자": "victim", "고소인": "victim",
+    "목격자": "witness",
+    "참고인": "reference",
+}
+ROLE_ANSWERS = {
+    "defendant": "피고에 대한 심문을 진행하십시오.",
+    "victim": "피해자에 대한 심문을 진행하십시오.",
+    "witness": "목격자에 대한 심문을 진행하십시오.",
+    "reference": "참고인에 대한 심문을 진행하십시오.",
+}
+
+_CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+
+# 이름 뒤에 붙는 호칭/조사
+SUFFIXES = ("씨에게서", "님에게서", "씨에게", "님에게", "씨한테", "님한테", "에게서", "에게", "한테",
+            "씨를", "씨는", "씨가", "씨의", "님을", "님은", "님이", "씨", "님",
+            "을", "를", "은", "는", "이", "가", "의", "와", "과")
+HANGUL_RE = re.compile(r"[가-힣]+")
+# 역할 표현 뒤에 붙을 수 있는 말 ("피고인을", "피해자 측", "목격자분")
+ROLE_TAILS = frozenset(SUFFIXES) | {"", "측", "분", "께", "께서", "분을", "분께", "측을"}
+GIVEN_NAME_SCORE = 0.95  # 성을 뺀 이름이 그대로 있을 때 (같은 이름이 둘이면 margin에서 걸러짐)
+
+
+@lru_cache(maxsize=1024)
+def decompose(text: str) -> str:
+    """한글 음절을 자모로 분해 (최봄달 → ㅊㅚㅂㅗㅁㄷㅏㄹ, 한글이 아니면 그대로)"""
+    result = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            result.append(_CHO[code // 588])
+            result.append(_JUNG[(code % 588) // 28])
+            if code % 28:
+                result.append(_JONG[code % 28])
+        else:
+            result.append(ch)
+    return "".join(result)
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """레벤슈타인 거리 (limit을 넘으면 limit + 1로 조기 종료)"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def _strip_suffix(word: str) -> str:
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) > len(suffix):
+            return word[:-len(suffix)]
+    return word
+
+
+def role_types(text: str) -> FrozenSet[str]:
+    """발언 속 역할 표현 → 프로필 type (단어 앞부분이 역할 표현이고 나머지가 조사/호칭일 때만)"""
+    types = set()
+    for word in HANGUL_RE.findall(text):
+        for alias, type_ in ROLE_ALIASES.items():
+            if word.startswith(alias) and word[len(alias):] in ROLE_TAILS:
+                types.add(type_)
+    return frozenset(types)
+
+
+def candidates(text: str) -> List[str]:
+    """이름 후보 단어 (호칭/조사를 뗀 단어 + 띄어쓰기가 잘못 들어간 경우를 위한 인접 두 단어 결합)"""
+    words = HANGUL_RE.findall(text)
+    result = [_strip_suffix(w) for w in words]
+    result += [_strip_suffix(a + b) for a, b in zip(words, words[1:])]
+    return result
+
+
+class NameResolver:
+    _lock = Lock()
+    _profiles : List[Profile] = []
+    _index : List[Tuple[Profile, str, int, FrozenSet[str]]] = []  # (프로필, 자모 분해한 이름, 음절 수, 음절 집합)
+
+    @classmethod
+    def build(cls, profiles: List[Profile]) -> None:
+        index = [(p, decompose(p.name), len(p.name), frozenset(p.name)) for p in profiles]
+        with cls._lock:
+            cls._profiles = list(profiles)
+            cls._index = index
+
+    @classmethod
+    def score(cls, text: str, profiles: Optional[List[Profile]] = None,
+              min_score: float = 0.5) -> Dict[str, Tuple[Profile, float]]:
+        """인물별 점수 (1.0 = 이름이나 역할 표현이 그대로 있음, min_score 미만은 제외)"""
+        if profiles is not None and profiles != cls._profiles:
+            cls.build(profiles)
+        with cls._lock:
+            index = cls._index
+
+        scores : Dict[str, Tuple[Profile, float]] = {}
+
+        def keep(profile: Profile, value: float):
+            if value > scores.get(profile.name, (None, 0.0))[1]:
+                scores[profile.name] = (profile, value)
+
+        roles = role_types(text)
+        words = set(candidates(text))
+        for profile, jamo, length, syllables in index:
+            if profile.type in roles or profile.name in text:
+                keep(profile, 1.0)
+                continue
+            if length >= 3 and profile.name[1:] in words:
+                keep(profile, GIVEN_NAME_SCORE)
+                continue
+            limit = int(len(jamo) * (1 - min_score))
+            windows = set()
+            for word in words:
+                # 음절 수가 크게 다르면 이름 길이만큼 잘라서 비교
+                if len(word) > length + 1:
+                    windows.update(word[i:i + length] for i in range(len(word) - length + 1))
+                elif len(word) >= length - 1:
+                    windows.add(word)
+            for window in windows:
+                # 겹치는 음절이 하나도 없으면 음절마다 자모가 달라서 높은 점수가 나올 수 없으므로 건너뜀
+                if syllables.isdisjoint(window):
+                    continue
+                distance = edit_distance(decompose(window), jamo, limit)
+                if distance <= limit:
+                    keep(profile, 1 - distance / len(jamo))
+        return scores
+
+    @classmethod
+    def resolve(cls, text: str, profiles: Optional[List[Profile]] = None) -> Dict[str, Any]:
+        """
+        status
+        - resolved : profile로 결정
+        - ambiguous : 1, 2등이 margin 안 (LLM이 판단)
+        - suggest : 비슷한 이름이 있지만 확신할 수 없음 (profile = 되물을 후보)
+        - none : 후보 없음
+        """
+        conf = get_chain_config("name_resolver")
+        accept = float(conf.get("accept_score", 0.75))
+        suggest = float(conf.get("suggest_score", 0.6))
+        margin = float(conf.get("margin", 0.1))
+
+        ranked = sorted(cls.score(text, profiles, min_score=suggest).values(), key=lambda item: item[1], reverse=True)
+        result = {
+            "status": "none",
+            "profile": None,
+            "score": 0.0,
+            "candidates": [(p.name, round(s, 2)) for p, s in ranked],
+        }
+        if not ranked or ranked[0][1] < suggest:
+            return result
+
+        top, top_score = ranked[0]
+        result.update({"profile": top, "score": round(top_score, 2)})
+        if len(ranked) > 1 and top_score - ranked[1][1] < margin:
+            result.update({"status": "ambiguous", "profile": None})
+        elif top_score >= accept:
+            result["status"] = "resolved"
+        else:
+            result["status"] = "suggest"
+        return result
@@ -55,6 +55,10 @@ def wait_for_server_ready(max_wait_time=30):
 
 # ---------------- PyQt + asyncio 통합 실행 ----------------
 async def main_async():
+    # 이벤트 루프를 50ms 이상 막는 동기 호출 감시 (tools/loop_watchdog.py, LOOP_WATCHDOG=1일 때만)
+    from tools.loop_watchdog import LoopWatchdog
+    LoopWatchdog.start()
+
     # FastAPI 서버를 별도 스레드에서 시작
     print("FastAPI 서버 스레드 시작...")
     fastapi_thread = threading.Thread(target=run_fastapi_server, daemon=True)
@@ -71,6 +75,10 @@ async def main_async():
     gc = GameController.get_instance()
     uiController = UiController.get_instance()
 
+    # 시작 화면에 머무는 동안 사건 풀 채우기
+    from case_generation.case_pool import CasePool
+    CasePool.ensure_refill()
+
     # PyQt 이벤트 루프 실행 (qasync로 asyncio와 통합)
     await qasync.asyncio.sleep(0)  # 이벤트 루프가 시작되도록 함
 
@@ -0,0 +1,82 @@
+import pytest
+from langchain_community.llms.fake import FakeListLLM
+
+import interrogation.conversation_memory as conversation_memory
+import tools.llm_gateway as llm_gateway
+from interrogation.conversation_memory import ConversationMemory
+
+
+def wait_for_summaries():
+    # 요약 스레드는 하나이므로 빈 작업이 끝나면 앞선 요약도 끝난 것 (요약이 다음 요약을 예약할 수 있어 두 번)
+    for _ in range(2):
+        conversation_memory._executor.submit(lambda: None).result()
+
+
+@pytest.fixture
+def memory(monkeypatch):
+    conf = {"enabled": True, "keep_turns": 2, "fold_batch": 2, "summary_token_budget": 50}
+    monkeypatch.setattr(conversation_memory, "get_chain_config", lambda section: conf)
+    llm = FakeListLLM(responses=["요약 1", "요약 2", "요약 3"])
+    monkeypatch.setattr(llm_gateway, "get_llm", lambda **kwargs: llm)
+    return ConversationMemory("최봄달")
+
+
+def add_turns(memory, count, start=1):
+    for i in range(start, start + count):
+        memory.add_turn(f"질문 {i}", f"답변 {i}")
+    wait_for_summaries()
+
+
+def test_recent_turns_are_kept_verbatim_until_batch_is_full(memory):
+    add_turns(memory, 3)
+
+    # 접을 턴이 fold_batch(2)보다 적으면 요약하지 않음
+    assert memory.folded == 0
+    assert memory.render() == "\n\n이전 대화 내역:\n" + "".join(f"Q{i}: 질문 {i}\nA{i}: 답변 {i}\n" for i in (1, 2, 3))
+
+
+def test_older_turns_are_folded_into_one_summary(memory):
+    add_turns(memory, 4)
+
+    text = memory.render()
+    assert memory.folded == 2
+    assert text.startswith("\n\n이전 대화 요약 (Q1~Q2):\n요약 1")
+    assert "Q3: 질문 3" in text and "Q4: 질문 4" in text and "Q1:" not in text
+    # 전체 기록은 그대로 남음
+    assert len(memory.turns) == 4
+
+
+def test_summary_is_updated_per_batch(memory):
+    add_turns(memory, 6)
+
+    assert memory.folded == 4
+    assert memory.summary == "요약 2"
+    assert memory.stats()["turns"] == 6
+
+
+def test_failed_summary_keeps_turns_and_retries(memory, monkeypatch):
+    def broken(**kwargs):
+        raise RuntimeError("network down")
+    monkeypatch.setattr(llm_gateway, "get_llm", broken)
+    add_turns(memory, 4)
+
+    assert memory.folded == 0
+    assert "Q1: 질문 1" in memory.render()
+
+    monkeypatch.setattr(llm_gateway, "get_llm", lambda **kwargs: FakeListLLM(responses=["복구된 요약"]))
+    add_turns(memory, 1, start=5)
+    assert (memory.folded, memory.summary) == (3, "복구된 요약")
+
+
+def test_saved_tokens_compare_against_full_history(memory):
+    add_turns(memory, 4)
+    turn = memory.add_turn("질문 5", "답변 5", prompt_history=memory.render())
+
+    assert turn["saved_tokens"] > 0
+    assert memory.saved_tokens == turn["saved_tokens"]
+
+
+def test_disabled_memory_never_folds(memory):
+    memory.enabled = False
+    add_turns(memory, 6)
+    assert memory.folded == 0
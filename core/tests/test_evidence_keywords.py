@@ -0,0 +1,78 @@
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+import evidence
+from evidence import EvidenceKeywordModel, get_evidence_names_for_prompt
+from tools.pictogram_store import PictogramStore
+
+
+class FakeKeywordLLM:
+    """with_structured_output 결과로 미리 정한 키워드 목록을 돌려주는 LLM 대역 (호출 기록 포함)"""
+    def __init__(self, items=None, error=None):
+        self.items = items or []
+        self.error = error
+        self.inputs = []
+
+    def with_structured_output(self, schema):
+        def run(prompt_value):
+            self.inputs.append(prompt_value.to_string())
+            if self.error:
+                raise self.error
+            return schema(keywords=[EvidenceKeywordModel(name=n, keyword=k) for n, k in self.items])
+        return RunnableLambda(run)
+
+
+@pytest.fixture
+def setup(monkeypatch):
+    stored = {}
+    single = []
+    monkeypatch.setattr(PictogramStore, "keyword_for_name", classmethod(lambda cls, name: stored.get(name)))
+
+    def fake_single(name):
+        single.append(name)
+        return f"single {name}"
+    monkeypatch.setattr(evidence, "get_evidence_name_for_prompt", fake_single)
+
+    def use(llm):
+        monkeypatch.setattr(evidence, "get_llm", lambda **kwargs: llm)
+        return llm
+    return stored, single, use
+
+
+def test_batch_result_is_matched_by_name(setup):
+    stored, single, use = setup
+    llm = use(FakeKeywordLLM([("칼", "knife"), ("CCTV 영상", "cctv footage")]))
+
+    keywords = get_evidence_names_for_prompt(["CCTV 영상", "칼", "칼"])
+
+    assert keywords == {"CCTV 영상": "cctv footage", "칼": "knife"}
+    assert len(llm.inputs) == 1 and single == []
+
+
+def test_rewritten_names_fall_back_to_position(setup):
+    stored, single, use = setup
+    use(FakeKeywordLLM([("knife?", "knife"), ("footage?", "cctv footage")]))
+
+    assert get_evidence_names_for_prompt(["칼", "CCTV 영상"]) == {"칼": "knife", "CCTV 영상": "cctv footage"}
+
+
+def test_missing_and_failed_names_use_single_calls(setup):
+    stored, single, use = setup
+    use(FakeKeywordLLM([("칼", "knife"), ("메모", "")]))
+    keywords = get_evidence_names_for_prompt(["칼", "메모", "영수증"])
+    assert keywords == {"칼": "knife", "메모": "single 메모", "영수증": "single 영수증"}
+
+    use(FakeKeywordLLM(error=RuntimeError("timeout")))
+    single.clear()
+    assert get_evidence_names_for_prompt(["칼", "메모"]) == {"칼": "single 칼", "메모": "single 메모"}
+    assert single == ["칼", "메모"]
+
+
+def test_known_names_skip_the_llm(setup):
+    stored, single, use = setup
+    stored.update({"칼": "knife", "메모": "memo note"})
+    llm = use(FakeKeywordLLM())
+
+    assert get_evidence_names_for_prompt(["칼", "메모", "영수증"]) == {
+        "칼": "knife", "메모": "memo note", "영수증": "single 영수증"}
+    assert llm.inputs == []  # 남은 이름이 하나면 일괄 호출 없이 하나만 변환
@@ -0,0 +1,64 @@
+import pytest
+
+from data_models import Profile
+
+
+def profile(type_, name):
+    return Profile(type=type_, name=name, gender="여성", age=30, personality="", context="", voice="", image="")
+
+
+PROFILES = [
+    profile("defendant", "유승표"),
+    profile("victim", "정영화"),
+    profile("witness", "최봄달"),
+    profile("reference", "강주안"),
+]
+
+
+@pytest.fixture
+def to_validation_result(monkeypatch):
+    # Interrogator가 클래스 정의 때 ChatOpenAI를 만들므로 키만 채워 둠 (호출은 하지 않음)
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    from input_classifier import to_validation_result
+    return to_validation_result
+
+
+def interrogation(type_, name="", reply=""):
+    return {"relevant": "true", "answer": "interrogation", "type": type_, "name": name, "reply": reply}
+
+
+def test_irrelevant_and_plain_statements_pass_through(to_validation_result):
+    raw = {"relevant": "False", "answer": "재판과 상관 없는 발언입니다.", "type": "", "name": "", "reply": ""}
+    assert to_validation_result(raw, "갈비찜 어떨까요", PROFILES) == {
+        "relevant": "false", "answer": "재판과 상관 없는 발언입니다."}
+
+    raw = {"relevant": "true", "answer": "", "type": "", "name": "", "reply": ""}
+    assert to_validation_result(raw, "피고인은 현장에 있었습니다", PROFILES) == {"relevant": "true", "answer": ""}
+
+
+def test_role_request_targets_that_role(to_validation_result):
+    result = to_validation_result(interrogation("defendant"), "피고인을 심문하겠습니다", PROFILES)
+    assert result["interrogation_type"] == "defendant"
+    assert result["target_profile"].name == "유승표"
+    assert result["interrogation_answer"] == "피고에 대한 심문을 진행하십시오."
+
+
+def test_name_chosen_by_llm_is_used(to_validation_result):
+    result = to_validation_result(interrogation("witness", "최봄달", "목격자 심문을 진행하세요."),
+                                  "그 여자분께 묻겠습니다", PROFILES)
+    assert result["target_profile"].name == "최봄달"
+    assert result["interrogation_answer"] == "목격자 심문을 진행하세요."
+
+
+def test_unknown_name_asks_again_instead_of_using_the_role(to_validation_result):
+    result = to_validation_result(interrogation("defendant", "김철수"), "김철수 씨를 심문하겠습니다", PROFILES)
+    assert result["interrogation_type"] == "retry"
+    assert result["target_profile"] is None
+    assert result["interrogation_answer"] == "그런 인물은 없습니다"
+
+
+def test_retry_from_llm_keeps_its_reply(to_validation_result):
+    result = to_validation_result(interrogation("retry", reply="최봄달 씨에 대해 얘기하시는 겁니까?"),
+                                  "최봄딸 씨를 심문하겠습니다", PROFILES)
+    assert result["interrogation_type"] == "retry"
+    assert result["interrogation_answer"] == "최봄달 씨에 대해 얘기하시는 겁니까?"
@@ -0,0 +1,54 @@
+import json
+
+from tools.json_stream import JsonArrayStreamParser
+
+
+ITEMS = [
+    {"name": "CCTV 영상", "type": "attorney", "description": ["출입구 {녹화} 기록"]},
+    {"name": "메모", "type": "prosecutor", "description": ["\"이스케이프\" 된 따옴표와 ] 괄호"]},
+]
+
+
+def feed_all(parser, text, size):
+    emitted = []
+    for i in range(0, len(text), size):
+        emitted += parser.feed(text[i:i + size])
+    return emitted + parser.close()
+
+
+def test_emits_objects_for_any_chunk_size():
+    text = json.dumps(ITEMS, ensure_ascii=False)
+    for size in (1, 4, 13, len(text)):
+        parser = JsonArrayStreamParser()
+        assert feed_all(parser, text, size) == ITEMS
+        assert parser.items == ITEMS
+
+
+def test_object_is_emitted_as_soon_as_it_closes():
+    parser = JsonArrayStreamParser()
+    first = json.dumps(ITEMS[0], ensure_ascii=False)
+    assert parser.feed("[" + first[:-1]) == []
+    assert parser.feed("}, {") == [ITEMS[0]]
+    assert not parser.done
+
+
+def test_skips_preamble_code_fence_and_wrapper_key():
+    body = json.dumps({"증거품": ITEMS}, ensure_ascii=False)
+    text = f"다음은 증거품입니다.\n```json\n{body}\n```"
+    parser = JsonArrayStreamParser()
+    assert feed_all(parser, text, 7) == ITEMS
+
+
+def test_stops_at_closing_bracket():
+    parser = JsonArrayStreamParser()
+    parser.feed('[{"a": 1}] [{"b": 2}]')
+    assert parser.done
+    assert parser.items == [{"a": 1}]
+
+
+def test_unfinished_and_malformed_objects_are_dropped():
+    parser = JsonArrayStreamParser()
+    emitted = parser.feed('[{"a": 1,}, {"b": 2}, {"c": ')
+    emitted += parser.close()
+    assert emitted == [{"b": 2}]
+    assert parser.done
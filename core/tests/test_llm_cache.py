@@ -0,0 +1,72 @@
+import json
+import time
+
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+from tools.llm_cache import SQLiteLLMCache, parse_llm_string
+
+
+LLM_STRING = json.dumps({"kwargs": {"model_name": "gpt-4o-mini", "temperature": 0.2}}) + "---[('stop', None)]"
+
+
+def generation(text):
+    return [ChatGeneration(message=AIMessage(content=text))]
+
+
+def test_miss_then_hit_returns_stored_generation(tmp_path):
+    cache = SQLiteLLMCache(tmp_path / "cache.sqlite3")
+
+    assert cache.lookup("prompt", LLM_STRING) is None
+    cache.update("prompt", LLM_STRING, generation("응답"))
+    hit = cache.lookup("prompt", LLM_STRING)
+
+    assert [g.message.content for g in hit] == ["응답"]
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+def test_key_includes_llm_settings(tmp_path):
+    cache = SQLiteLLMCache(tmp_path / "cache.sqlite3")
+    cache.update("prompt", LLM_STRING, generation("응답"))
+
+    other = LLM_STRING.replace("0.2", "0.9")
+    assert cache.lookup("prompt", other) is None
+    assert cache.lookup("other prompt", LLM_STRING) is None
+
+
+def test_entries_survive_reopen(tmp_path):
+    SQLiteLLMCache(tmp_path / "cache.sqlite3").update("prompt", LLM_STRING, generation("응답"))
+
+    hit = SQLiteLLMCache(tmp_path / "cache.sqlite3").lookup("prompt", LLM_STRING)
+
+    assert hit[0].message.content == "응답"
+
+
+def test_expired_entry_is_a_miss(tmp_path):
+    cache = SQLiteLLMCache(tmp_path / "cache.sqlite3", ttl_seconds=60)
+    cache.update("prompt", LLM_STRING, generation("응답"))
+    with cache._conn:
+        cache._conn.execute("UPDATE llm_cache SET created_at = ?", (time.time() - 120,))
+
+    assert cache.lookup("prompt", LLM_STRING) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = SQLiteLLMCache(tmp_path / "cache.sqlite3", max_entries=2)
+    cache.update("a", LLM_STRING, generation("a"))
+    time.sleep(0.01)
+    cache.update("b", LLM_STRING, generation("b"))
+    time.sleep(0.01)
+    cache.lookup("a", LLM_STRING)  # a를 최근에 사용
+    time.sleep(0.01)
+    cache.update("c", LLM_STRING, generation("c"))
+
+    assert cache.lookup("b", LLM_STRING) is None
+    assert cache.lookup("a", LLM_STRING) is not None
+    assert cache.lookup("c", LLM_STRING) is not None
+
+
+def test_parse_llm_string():
+    assert parse_llm_string(LLM_STRING) == {"model": "gpt-4o-mini", "temperature": 0.2}
+    assert parse_llm_string("not json") == {"model": None, "temperature": None}
@@ -0,0 +1,33 @@
+from tools.service import IncrementalMarkdownRenderer, markdown_to_html
+
+
+OUTLINE = "# 사건 개요\n\n전시회장에서 **작품**이 사라졌다.\n\n- 피고: 우민영\n- 피해자: 김소현\n"
+
+
+def test_feed_matches_full_render_at_every_step():
+    renderer = IncrementalMarkdownRenderer()
+    for i in range(0, len(OUTLINE), 3):
+        html = renderer.feed(OUTLINE[i:i + 3])
+        blocks = [b for b in renderer.text.split("\n\n") if b.strip()]
+        assert html == "".join(markdown_to_html(b) for b in blocks)
+    assert renderer.close() == markdown_to_html(OUTLINE)
+
+
+def test_closed_blocks_are_not_rendered_again(monkeypatch):
+    import tools.service as service
+
+    renderer = IncrementalMarkdownRenderer()
+    renderer.feed("# 제목\n\n본문")
+    rendered = []
+    real = service.markdown_to_html
+    monkeypatch.setattr(service, "markdown_to_html", lambda text: rendered.append(text) or real(text))
+
+    renderer.feed(" 이어서")
+
+    assert rendered == ["본문 이어서"]  # 닫힌 제목 블록은 캐시 사용
+
+
+def test_blank_open_block_returns_closed_html_only():
+    renderer = IncrementalMarkdownRenderer()
+    html = renderer.feed("# 제목\n\n")
+    assert html == markdown_to_html("# 제목")
@@ -0,0 +1,85 @@
+import pytest
+
+import interrogation.name_resolver as name_resolver
+from data_models import Profile
+from interrogation.name_resolver import NameResolver, decompose, edit_distance, role_types
+
+
+def profile(type_, name):
+    return Profile(type=type_, name=name, gender="여성", age=30, personality="", context="", voice="", image="")
+
+
+PROFILES = [
+    profile("defendant", "유승표"),
+    profile("victim", "정영화"),
+    profile("witness", "최봄달"),
+    profile("reference", "강주안"),
+]
+
+
+@pytest.fixture(autouse=True)
+def thresholds(monkeypatch):
+    # chain_config.yaml 값과 무관하게 기본 임계값으로 고정
+    conf = {"accept_score": 0.75, "suggest_score": 0.6, "margin": 0.1}
+    monkeypatch.setattr(name_resolver, "get_chain_config", lambda section: conf)
+    NameResolver.build(PROFILES)
+    return conf
+
+
+def resolve(text, profiles=PROFILES):
+    return NameResolver.resolve(text, profiles)
+
+
+def test_decompose_and_edit_distance():
+    assert decompose("최봄달") == "ㅊㅚㅂㅗㅁㄷㅏㄹ"
+    assert edit_distance(decompose("최봄딸"), decompose("최봄달"), 3) == 1
+    assert edit_distance("abcdef", "a", 2) == 3  # limit + 1로 조기 종료
+
+
+@pytest.mark.parametrize("text, name", [
+    ("최봄달 씨를 심문하겠습니다", "최봄달"),
+    ("최봄딸 씨를 심문하겠습니다", "최봄달"),     # STT 오타 (자모 하나 차이)
+    ("최 봄달 씨에게 질문하겠습니다", "최봄달"),   # 띄어쓰기 오류
+    ("봄달 씨를 불러주세요", "최봄달"),           # 성을 뺀 이름
+    ("피고인을 심문하겠습니다", "유승표"),
+    ("고소인 측에 묻겠습니다", "정영화"),
+])
+def test_resolved(text, name):
+    result = resolve(text)
+    assert result["status"] == "resolved"
+    assert result["profile"].name == name
+
+
+@pytest.mark.parametrize("text", [
+    "오늘 저녁 메뉴로 갈비찜 어떨까요",
+    "피고소인을 심문하겠습니다",   # "고소인"으로 시작하는 단어가 아님
+    "김철수 씨를 불러주세요",
+])
+def test_none(text):
+    assert resolve(text)["status"] == "none"
+
+
+def test_two_close_candidates_are_ambiguous():
+    result = resolve("유승표 씨와 최봄달 씨 중에 심문하겠습니다")
+    assert result["status"] == "ambiguous"
+    assert result["profile"] is None
+
+
+def test_score_between_suggest_and_accept_is_suggest(thresholds):
+    thresholds["accept_score"] = 0.95
+    result = resolve("최봄딸 씨를 심문하겠습니다")
+    assert result["status"] == "suggest"
+    assert result["profile"].name == "최봄달"
+    assert 0.6 <= result["score"] < 0.95
+
+
+def test_role_types_require_role_word_with_particle_only():
+    assert role_types("피고인을 심문") == {"defendant"}
+    assert role_types("목격자분께 묻겠습니다") == {"witness"}
+    assert role_types("피고소인을 심문") == frozenset()
+
+
+def test_profiles_argument_rebuilds_index():
+    other = [profile("witness", "우민영")]
+    assert resolve("우민영 씨", other)["profile"].name == "우민영"
+    assert resolve("최봄달 씨", other)["status"] == "none"
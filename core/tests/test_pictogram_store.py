@@ -0,0 +1,24 @@
+import pytest
+
+from tools.pictogram_store import normalize_keyword
+
+
+@pytest.mark.parametrize("keyword, expected", [
+    ("A Bloody Knife.", "bloody knife"),
+    ("knives bloody", "bloody knife"),
+    ("CCTV footage", "cctv footage"),
+    ("the footage of CCTV", "cctv footage"),
+    ("Broken Glasses", "broken glass"),
+    ("batteries", "battery"),
+    ("boxes of matches", "box match"),
+    ("bus pass", "bus pass"),       # ss/us로 끝나는 단어는 그대로
+    ("iris", "iris"),
+    ("Receipt #2", "2 receipt"),
+])
+def test_normalize_keyword(keyword, expected):
+    assert normalize_keyword(keyword) == expected
+
+
+def test_normalize_keyword_without_words_is_empty():
+    assert normalize_keyword("The...") == ""
+    assert normalize_keyword("") == ""
@@ -0,0 +1,52 @@
+from case_generation.profile_parser import ProfileStreamParser, SEPARATOR
+
+
+BLOCKS = [
+    "피고: 우민영 (나이: 20세, 성별: 남성)\n- 성격: 차분함\n- 배경: 전시회 관리자\n",
+    "피해자: 김소현 (나이: 28세, 성별: 여성)\n- 성격: 꼼꼼함\n- 배경: 전시회 관람객\n",
+    "목격자: 최봄달 (나이: 30세, 성별: 여성)\n- 성격: 관찰력이 좋음\n- 배경: 경비원\n",
+    "참고인: 정영화 (나이: 32세, 성별: 여성)\n- 성격: 신중함\n- 배경: 큐레이터\n",
+]
+TEXT = f"\n{SEPARATOR}\n".join(BLOCKS)
+
+
+def feed_all(parser, text, size):
+    emitted = []
+    for i in range(0, len(text), size):
+        emitted += parser.feed(text[i:i + size])
+    return emitted + parser.close()
+
+
+def test_emits_each_profile_once_in_order_for_any_chunk_size():
+    for size in (1, 3, 17, len(TEXT)):
+        parser = ProfileStreamParser(expected=4)
+        profiles = feed_all(parser, TEXT, size)
+        assert [p.name for p in profiles] == ["우민영", "김소현", "최봄달", "정영화"]
+        assert [p.type for p in profiles] == ["defendant", "victim", "witness", "reference"]
+        assert parser.done
+
+
+def test_block_is_emitted_before_separator_arrives():
+    parser = ProfileStreamParser(expected=4)
+    assert parser.feed(BLOCKS[0][:-1]) == []  # 배경 줄이 아직 끝나지 않음
+    emitted = parser.feed("\n")
+    assert [p.name for p in emitted] == ["우민영"]
+    # 뒤따르는 구분선에서 같은 블록을 다시 내보내지 않음
+    assert parser.feed(f"{SEPARATOR}\n") == []
+
+
+def test_profile_values_are_corrected_from_registry():
+    parser = ProfileStreamParser(expected=1)
+    profile = parser.feed(BLOCKS[0])[0]
+    # 템플릿에는 20세 남성이지만 profil.json 값으로 보정
+    assert (profile.age, profile.gender) == (21, "여성")
+    assert profile.voice == "nminyoung"
+    assert (profile.personality, profile.context) == ("차분함", "전시회 관리자")
+
+
+def test_stops_after_expected_count_and_ignores_malformed_blocks():
+    parser = ProfileStreamParser(expected=2)
+    text = f"잘못된 줄\n{SEPARATOR}\n" + TEXT
+    profiles = feed_all(parser, text, 5)
+    assert [p.name for p in profiles] == ["우민영", "김소현"]
+    assert parser.done
@@ -0,0 +1,66 @@
+import pytest
+from langchain_community.llms.fake import FakeListLLM
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+import interrogation.conversation_memory as conversation_memory
+import tools.llm_gateway as llm_gateway
+from interrogation.conversation_memory import ConversationMemory
+from tools.token_usage import TokenUsageStats
+
+
+def wait_for_summaries():
+    for _ in range(2):
+        conversation_memory._executor.submit(lambda: None).result()
+
+
+@pytest.fixture
+def memory(monkeypatch):
+    conf = {"enabled": True, "keep_turns": 2, "fold_batch": 2, "summary_token_budget": 50}
+    monkeypatch.setattr(conversation_memory, "get_chain_config", lambda section: conf)
+    monkeypatch.setattr(llm_gateway, "get_llm", lambda **kwargs: FakeListLLM(responses=["요약 1", "요약 2"]))
+    return ConversationMemory("최봄달")
+
+
+def add_turn(memory, i):
+    memory.add_turn(f"질문 {i}", f"답변 {i}")
+    wait_for_summaries()
+
+
+def test_messages_extend_previous_prefix_between_folds(memory):
+    add_turn(memory, 1)
+    before, _ = memory.prompt_messages()
+    add_turn(memory, 2)
+    after, _ = memory.prompt_messages()
+
+    assert after[:len(before)] == before
+    assert [type(m) for m in after] == [HumanMessage, AIMessage, HumanMessage, AIMessage]
+
+
+def test_summary_is_a_leading_system_message_and_matches_text(memory):
+    for i in range(1, 5):
+        add_turn(memory, i)
+    messages, text = memory.prompt_messages()
+
+    assert messages[0] == SystemMessage(content="이전 대화 요약 (Q1~Q2):\n요약 1")
+    assert [m.content for m in messages[1:]] == ["질문 3", "답변 3", "질문 4", "답변 4"]
+    assert text == memory.render()
+
+
+def test_braces_in_answers_are_kept_as_is(memory):
+    memory.add_turn("질문", "{name} 같은 중괄호")
+    messages, _ = memory.prompt_messages()
+    assert messages[-1].content == "{name} 같은 중괄호"
+
+
+def test_token_usage_tracks_cached_tokens():
+    chain = "test_prefix_chain"
+    TokenUsageStats.record(chain, {"input_tokens": 1200, "output_tokens": 50,
+                                   "input_token_details": {"cache_read": 1024}})
+    TokenUsageStats.record(chain, {"input_tokens": 800, "output_tokens": 30})
+    TokenUsageStats.record(chain, None)
+
+    assert TokenUsageStats.stats(chain) == {
+        "calls": 2, "input_tokens": 2000, "cached_tokens": 1024, "uncached_tokens": 976,
+        "output_tokens": 80, "cache_hit_rate": 0.51,
+    }
+    assert TokenUsageStats.stats("unknown_chain")["calls"] == 0
@@ -0,0 +1,40 @@
+from tools.service import SentenceSplitter, sentence_streamer
+
+
+def test_splits_completed_sentences_and_keeps_the_rest():
+    splitter = SentenceSplitter()
+    assert splitter.feed("저는 그날 집에 있었") == []
+    assert splitter.feed("습니다. 정말입니까? 네") == ["저는 그날 집에 있었습니다.", "정말입니까?"]
+    assert splitter.feed("!") == ["네!"]
+    assert splitter.close() == []
+
+
+def test_close_flushes_unfinished_sentence():
+    splitter = SentenceSplitter()
+    splitter.feed("마지막 문장은 마침표가 없음")
+    assert splitter.close() == ["마지막 문장은 마침표가 없음"]
+    assert splitter.close() == []
+
+
+def test_token_by_token_matches_whole_text():
+    text = "첫 문장입니다. 두 번째요! 세 번째인가요? 끝"
+    whole = SentenceSplitter()
+    expected = whole.feed(text) + whole.close()
+    splitter = SentenceSplitter()
+    sentences = [s for ch in text for s in splitter.feed(ch)] + splitter.close()
+    assert sentences == expected == ["첫 문장입니다.", "두 번째요!", "세 번째인가요?", "끝"]
+
+
+def test_custom_sentence_endings():
+    splitter = SentenceSplitter(r"[;]")
+    assert splitter.feed("a; b. c;") == ["a;", "b. c;"]
+
+
+def test_sentence_streamer_uses_chunk_content():
+    class Chunk:
+        def __init__(self, content):
+            self.content = content
+
+    sentences = []
+    sentence_streamer(iter([Chunk("안녕하세"), Chunk("요. 반갑"), "습니다"]), sentences.append)
+    assert sentences == ["안녕하세요.", "반갑습니다"]
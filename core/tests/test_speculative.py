@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from tools.speculative import get_speculative_stats, run_speculative
+
+
+def make_candidates(*specs):
+    """(지연 초, 결과) 목록을 호출 순서대로 돌려주는 후보 생성 함수와 취소된 후보 목록"""
+    specs = list(specs)
+    cancelled = []
+
+    async def make_candidate():
+        delay, value = specs.pop(0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(value)
+            raise
+        return value
+
+    return make_candidate, cancelled
+
+
+def validate(value):
+    if value == "bad":
+        raise ValueError("검증 실패")
+
+
+def test_first_valid_candidate_wins_and_rest_are_cancelled():
+    make_candidate, cancelled = make_candidates((0.03, "slow"), (0.01, "fast"), (0.5, "late"))
+
+    result = asyncio.run(run_speculative("test_win", make_candidate, validate, k=3))
+
+    assert result == "fast"
+    assert sorted(cancelled) == ["late", "slow"]
+    stats = get_speculative_stats()["test_win"]
+    assert (stats.candidates, stats.failures, stats.cancelled) == (1, 0, 2)
+
+
+def test_invalid_candidates_are_skipped():
+    make_candidate, _ = make_candidates((0.01, "bad"), (0.03, "ok"))
+
+    result = asyncio.run(run_speculative("test_skip", make_candidate, validate, k=2))
+
+    assert result == "ok"
+    stats = get_speculative_stats()["test_skip"]
+    assert (stats.candidates, stats.failures) == (2, 1)
+    assert stats.failure_rate == 0.5
+
+
+def test_all_failed_raises_last_error():
+    make_candidate, _ = make_candidates((0.01, "bad"), (0.02, "bad"))
+
+    with pytest.raises(ValueError):
+        asyncio.run(run_speculative("test_fail", make_candidate, validate, k=2))
+
+    assert get_speculative_stats()["test_fail"].all_failed == 1
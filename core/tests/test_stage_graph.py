@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from tools.stage_graph import StageGraph
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_stages_run_after_their_dependencies_with_results():
+    order = []
+
+    async def stage(name, value, delay=0.0):
+        await asyncio.sleep(delay)
+        order.append(name)
+        return value
+
+    async def main():
+        graph = StageGraph("test")
+        graph.add_stage("case", lambda r: stage("case", 1, 0.02))
+        graph.add_stage("profiles", lambda r: stage("profiles", r["case"] + 1), deps=["case"])
+        graph.add_stage("evidences", lambda r: stage("evidences", r["profiles"] * 10), deps=["profiles"])
+        graph.add_stage("behind", lambda r: r["profiles"] + 100, deps=["profiles"])  # 동기 함수도 가능
+        graph.start()
+        return await graph.wait("evidences"), await graph.wait_all(), graph
+
+    evidences, results, graph = run(main())
+
+    assert evidences == 20
+    assert results == {"case": 1, "profiles": 2, "evidences": 20, "behind": 102}
+    assert order[:2] == ["case", "profiles"]
+    assert all(t.status == "done" for t in graph.timings.values())
+
+
+def test_independent_stages_run_concurrently():
+    async def main():
+        graph = StageGraph("test", max_concurrency=2)
+        graph.add_stage("a", lambda r: asyncio.sleep(0.05, "a"))
+        graph.add_stage("b", lambda r: asyncio.sleep(0.05, "b"))
+        graph.start()
+        await graph.wait_all()
+        return graph.timings
+
+    timings = run(main())
+    # 두 단계가 겹쳐서 실행됨 (b가 a의 종료를 기다리지 않음)
+    assert timings["b"].started_at < timings["a"].finished_at
+
+
+def test_failure_skips_dependents_and_is_reported_once():
+    failures = []
+
+    def fail(r):
+        raise ValueError("생성 실패")
+
+    async def main():
+        graph = StageGraph("test")
+        graph.add_stage("case", lambda r: "case")
+        graph.add_stage("profiles", fail, deps=["case"])
+        graph.add_stage("evidences", lambda r: "evidences", deps=["profiles"])
+        graph.add_stage("behind", lambda r: "behind", deps=["profiles"])
+        graph.on_failure(lambda name, e: failures.append((name, str(e))))
+        graph.start()
+        with pytest.raises(ValueError):
+            await graph.wait("evidences")
+        return await graph.wait_all(), graph.timings
+
+    results, timings = run(main())
+
+    assert results == {"case": "case"}
+    assert failures == [("profiles", "생성 실패")]
+    assert timings["profiles"].status == "failed"
+    assert timings["evidences"].status == timings["behind"].status == "skipped"
+
+
+def test_cancel_is_not_reported_as_failure():
+    failures = []
+
+    async def main():
+        graph = StageGraph("test")
+        graph.add_stage("slow", lambda r: asyncio.sleep(1))
+        graph.add_stage("next", lambda r: "next", deps=["slow"])
+        graph.on_failure(lambda name, e: failures.append(name))
+        graph.start()
+        await asyncio.sleep(0.01)
+        graph.cancel()
+        await graph.wait_all()
+        return graph.timings
+
+    timings = run(main())
+
+    assert failures == []
+    assert timings["slow"].status == "cancelled"
+
+
+def test_add_stage_rejects_unknown_dependency_and_duplicates():
+    graph = StageGraph("test")
+    graph.add_stage("case", lambda r: None)
+    with pytest.raises(ValueError):
+        graph.add_stage("profiles", lambda r: None, deps=["missing"])
+    with pytest.raises(ValueError):
+        graph.add_stage("case", lambda r: None)
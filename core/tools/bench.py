@@ -0,0 +1,64 @@
+"""
+두 방식 비교 벤치마크 공통 도구 (case_generation/benchmark.py, input_benchmark.py)
+- measure   : 한 번 실행의 소요 시간 / 토큰 수 / LLM 호출 수 (get_openai_callback으로 집계)
+- alternate : 순서에 따른 편향을 줄이기 위해 회차마다 실행 순서를 번갈아 바꿈
+- report    : 방식별 평균과 기준 방식 대비 시간 절감률 출력
+
+사용 예시 :
+    results = {"staged": [], "bundle": []}
+    for i in range(runs):
+        for name in alternate(["staged", "bundle"], i):
+            results[name].append(measure(runners[name], selected_characters))
+    report(results, baseline="staged", candidate="bundle")
+"""
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from langchain_community.callbacks import get_openai_callback
+
+
+def measure(fn: Callable[..., Any], *args) -> Dict[str, Any]:
+    """fn(*args) 한 번 실행의 소요 시간, 토큰 수, LLM 호출 수, 반환값(result)"""
+    with get_openai_callback() as cb:
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+    return {
+        "seconds": elapsed,
+        "prompt_tokens": cb.prompt_tokens,
+        "completion_tokens": cb.completion_tokens,
+        "total_tokens": cb.total_tokens,
+        "requests": cb.successful_requests,
+        "result": result,
+    }
+
+
+def alternate(names: List[str], i: int) -> List[str]:
+    """짝수 회차는 주어진 순서, 홀수 회차는 역순"""
+    return list(names) if i % 2 == 0 else list(reversed(names))
+
+
+def mean(results: List[Dict[str, Any]], key: str) -> float:
+    return statistics.mean(r[key] for r in results)
+
+
+def summarize(name: str, results: List[Dict[str, Any]], unit: str = "") -> str:
+    """unit은 평균 앞에 붙는 단위 (예: "발언당")"""
+    prefix = f"{unit} " if unit else ""
+    return (f"{name:<7} {prefix}평균 {mean(results, 'seconds'):6.2f}s | "
+            f"prompt {mean(results, 'prompt_tokens'):7.0f} / completion {mean(results, 'completion_tokens'):6.0f} / "
+            f"total {mean(results, 'total_tokens'):7.0f} tokens | 호출 {mean(results, 'requests'):.1f}회")
+
+
+def report(results: Dict[str, List[Dict[str, Any]]], baseline: str, candidate: str, unit: str = "") -> None:
+    """방식별 평균과 baseline 대비 candidate의 시간 절감 출력 (측정값이 없는 방식은 건너뜀)"""
+    print("\n=== 결과 ===")
+    for name, rs in results.items():
+        if rs:
+            print(summarize(name, rs, unit))
+    if results.get(baseline) and results.get(candidate):
+        base = mean(results[baseline], "seconds")
+        cand = mean(results[candidate], "seconds")
+        prefix = f"{unit} " if unit else ""
+        print(f"{candidate} 모드 {prefix}시간 절감: {base - cand:.2f}s ({(1 - cand / base) * 100:.0f}%)")
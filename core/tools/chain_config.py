@@ -0,0 +1,39 @@
+"""
+core/chain_config.yaml 로더
+파일이 수정되면 다음 호출 때 다시 읽음
+"""
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict
+
+CONFIG_PATH = Path(__file__).parent.parent / "chain_config.yaml"
+
+_lock = Lock()
+_cache: Dict[str, Any] = {"mtime": None, "data": {}}
+
+
+def load_chain_config() -> Dict[str, Any]:
+    """chain_config.yaml 전체를 dict로 반환 (파일이 없거나 비어 있으면 빈 dict)"""
+    try:
+        mtime = CONFIG_PATH.stat().st_mtime
+    except FileNotFoundError:
+        return {}
+
+    with _lock:
+        if _cache["mtime"] != mtime:
+            import yaml
+            with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+                _cache["data"] = yaml.safe_load(f) or {}
+            _cache["mtime"] = mtime
+        return _cache["data"]
+
+
+def chain_config_version() -> Any:
+    """설정 파일 버전 (수정 시각). 설정으로 만든 객체를 다시 만들어야 하는지 확인할 때 사용"""
+    load_chain_config()
+    return _cache["mtime"]
+
+
+def get_chain_config(section: str) -> Dict[str, Any]:
+    """특정 섹션 설정 반환 (없으면 빈 dict)"""
+    return load_chain_config().get(section) or {}
@@ -0,0 +1,153 @@
+"""
+e-ink 증거 카드 프레임 렌더러 (코어에서 한 번만 그림)
+- 하드웨어의 eink_display.make_epd_image / update_epd_image와 같은 배치로 400×300 카드를 메모리에서 그림
+- 좌우 반전(inversion_image)과 1-bit 패킹(convert_image_to_bytes)까지 끝낸 15000바이트 프레임을 보관
+- 프레임은 (증거 id, 설명 리비전)으로 관리, 리비전 = Evidence.rev (처음 생성 시 1, 설명이 추가될 때마다 +1)
+- 하드웨어는 GET /evidence/{id}/frame/{rev} 로 받은 바이트를 그대로 디스플레이로 전송
+
+사용 예시 :
+    frame = EinkFrameStore.render(evidence)   # {"rev": 1, "url": "/evidence/1/frame/1", "size": 15000}
+    data = EinkFrameStore.get(1, rev=1)       # bytes (없거나 리비전이 다르면 None)
+"""
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont, ImageOps
+
+from data_models import Evidence
+
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+WIDTH, HEIGHT = 400, 300
+FRAME_SIZE = WIDTH * HEIGHT // 8  # 15000 bytes
+
+# 하드웨어와 같은 폰트를 우선 사용하고, 없으면 UI에 포함된 폰트 사용
+_BUNDLED_FONT = Path(__file__).parent.parent / "ui" / "qt_designer" / "assets" / "NanumGothicLight.ttf"
+FONT_PATHS = ("/usr/share/fonts/truetype/nanum/NanumGothic.ttf", str(_BUNDLED_FONT))
+TITLE_FONT_PATHS = ("/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf",) + FONT_PATHS
+
+TITLE_HEIGHT = 30
+PICTURE_SIZE = 150
+FONT_SIZE = 20
+LINE_SPACING = 6
+# 추가 설명이 그려지는 하단 텍스트 영역
+TEXT_REGION_TOP = TITLE_HEIGHT + PICTURE_SIZE + 5
+
+
+@lru_cache(maxsize=None)
+def _load_font(paths: Tuple[str, ...], size: int) -> ImageFont.FreeTypeFont:
+    for path in paths:
+        if Path(path).is_file():
+            return ImageFont.truetype(path, size)
+    return ImageFont.load_default(size)
+
+
+def _wrap(draw: ImageDraw.ImageDraw, text: str, font, max_width: int) -> List[str]:
+    # 띄어쓰기 단위 줄바꿈 (eink_display와 동일)
+    lines = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split(" "):
+            test_line = line + word + " "
+            bbox = draw.textbbox((0, 0), test_line, font=font)
+            if bbox[2] - bbox[0] > max_width and line:
+                lines.append(line)
+                line = word + " "
+            else:
+                line = test_line
+        lines.append(line)
+    return lines
+
+
+def _draw_lines(draw: ImageDraw.ImageDraw, lines: List[str], font, x: int, y: int, max_y: int) -> None:
+    for line in lines:
+        if y + FONT_SIZE > max_y:
+            break
+        draw.text((x, y), line.strip(), font=font, fill=0)
+        y += FONT_SIZE + LINE_SPACING
+
+
+def _load_picture(evidence: Evidence) -> Image.Image:
+    """150px 디더링된 e-ink 타일 렌디션 (없거나 생성 실패(-1)면 로컬 픽토그램)"""
+    from tools.evidence_assets import rendition_path
+    tile = rendition_path(evidence.picture, "eink")
+    if tile is None:
+        from tools.local_pictogram import render_local_pictogram
+        tile = rendition_path(render_local_pictogram(evidence.name), "eink")
+    with Image.open(ROOT_DIR / tile) as img:
+        return img.convert("1")
+
+
+def render_card(evidence: Evidence) -> Image.Image:
+    """반전 전의 400×300 1-bit 카드 (상단 이름, 좌측 그림, 우측 첫 설명, 하단 추가 설명)"""
+    canvas = Image.new("1", (WIDTH, HEIGHT), 1)
+    draw = ImageDraw.Draw(canvas)
+
+    title_font = _load_font(TITLE_FONT_PATHS, 20)
+    bbox = draw.textbbox((0, 0), evidence.name, font=title_font)
+    title_x = (WIDTH - (bbox[2] - bbox[0])) // 2
+    title_y = (TITLE_HEIGHT - (bbox[3] - bbox[1])) // 2
+    draw.text((title_x, title_y), evidence.name, font=title_font, fill=0)
+
+    canvas.paste(_load_picture(evidence), (0, TITLE_HEIGHT))
+
+    font = _load_font(FONT_PATHS, FONT_SIZE)
+    if evidence.description:
+        lines = _wrap(draw, evidence.description[0], font, 250 - 10)
+        _draw_lines(draw, lines, font, PICTURE_SIZE + 15, TITLE_HEIGHT + 15, TITLE_HEIGHT + PICTURE_SIZE - 5)
+
+    if len(evidence.description) > 1:
+        text = "".join(line + "\n" for line in evidence.description[1:])
+        lines = _wrap(draw, text, font, WIDTH - 10)
+        # 그림 아래부터 출력 (그림 영역과 겹치지 않도록)
+        _draw_lines(draw, lines, font, 15, TEXT_REGION_TOP, HEIGHT)
+    return canvas
+
+
+def render_frame(evidence: Evidence) -> bytes:
+    """디스플레이로 바로 보낼 수 있는 좌우 반전 + 1-bit 패킹 프레임 (15000 bytes, MSB 우선, 1 = 흰색)"""
+    frame = ImageOps.mirror(render_card(evidence)).tobytes()
+    assert len(frame) == FRAME_SIZE
+    return frame
+
+
+class EinkFrameStore:
+    _lock = Lock()
+    _frames : Dict[int, Tuple[int, bytes]] = {}  # 증거 id → (리비전, 프레임)
+
+    @classmethod
+    def render(cls, evidence: Evidence) -> Dict:
+        """프레임을 그려서 저장하고 SSE로 보낼 프레임 정보 반환"""
+        rev = evidence.rev
+        frame = render_frame(evidence)
+        with cls._lock:
+            cls._frames[evidence.id] = (rev, frame)
+        print(f"[EinkFrameStore] 프레임 생성: {evidence.id} rev={rev}")
+        return cls.info(evidence.id, rev)
+
+    @classmethod
+    def reset(cls) -> None:
+        """새 게임을 시작할 때 이전 게임의 프레임 비우기"""
+        with cls._lock:
+            cls._frames = {}
+
+    @classmethod
+    def get(cls, evidence_id: int, rev: Optional[int] = None) -> Optional[bytes]:
+        """저장된 프레임 (rev를 넘기면 리비전이 같을 때만)"""
+        with cls._lock:
+            entry = cls._frames.get(evidence_id)
+        if entry is None or (rev is not None and entry[0] != rev):
+            return None
+        return entry[1]
+
+    @classmethod
+    def latest_rev(cls, evidence_id: int) -> Optional[int]:
+        with cls._lock:
+            entry = cls._frames.get(evidence_id)
+        return entry[0] if entry else None
+
+    @staticmethod
+    def info(evidence_id: int, rev: int) -> Dict:
+        return {"rev": rev, "url": f"/evidence/{evidence_id}/frame/{rev}", "size": FRAME_SIZE}
@@ -0,0 +1,113 @@
+"""
+증거 이미지 렌디션(크기별 사본) 생성
+- 원본 하나당 한 번만 만들어서 원본 옆에 저장하고, 매니페스트(<이름>.renditions.json)로 관리
+    thumb : 90×90  Qt 증거품 창용 (LANCZOS 축소, 그대로 setPixmap)
+    eink  : 150×150 e-ink 카드용 (회색조 축소 후 Floyd–Steinberg 디더링한 1-bit)
+    original : 원본 경로 그대로
+- 원본 수정 시간이 매니페스트와 다르면 다시 생성
+
+사용 예시 :
+    manifest = build_renditions("data/evidence_resource/pictograms/knife-1a2b3c4d.png")
+    thumb = rendition_path(evidence.picture, "thumb")   # 없으면 만들어서 경로 반환, 원본이 없으면 None
+"""
+import json
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from PIL import Image
+
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+RENDITIONS = {
+    "thumb": {"size": 90, "mode": "RGB"},
+    "eink": {"size": 150, "mode": "1"},
+}
+MANIFEST_SUFFIX = ".renditions.json"
+
+_lock = Lock()
+
+
+def _abs(path: str) -> Path:
+    return Path(path) if Path(path).is_absolute() else ROOT_DIR / path
+
+
+def _rel(path: Path) -> str:
+    # picture 경로와 같은 형식 (저장소 루트 기준 상대 경로)
+    try:
+        return path.relative_to(ROOT_DIR).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def manifest_path(picture: str) -> Path:
+    source = _abs(picture)
+    return source.with_name(source.stem + MANIFEST_SUFFIX)
+
+
+def _render(img: Image.Image, size: int, mode: str) -> Image.Image:
+    if mode == "1":
+        # 흑백 디스플레이용: 회색조에서 줄인 뒤 디더링 (convert 기본값이 Floyd–Steinberg)
+        return img.convert("L").resize((size, size), Image.LANCZOS).convert("1")
+    return img.convert(mode).resize((size, size), Image.LANCZOS)
+
+
+def build_renditions(picture: str) -> Optional[Dict[str, Any]]:
+    """원본 옆에 렌디션과 매니페스트를 만들고 매니페스트 반환 (원본이 없으면 None)"""
+    source = _abs(picture)
+    if not source.is_file():
+        return None
+    mtime = source.stat().st_mtime
+    with _lock:
+        manifest = _read_manifest(picture)
+        if manifest and manifest.get("source_mtime") == mtime and all(
+            _abs(r["path"]).is_file() for r in manifest["renditions"].values()
+        ):
+            return manifest
+
+        renditions = {}
+        with Image.open(source) as img:
+            img.load()
+            for kind, spec in RENDITIONS.items():
+                path = source.with_name(f"{source.stem}.{kind}{spec['size']}.png")
+                _render(img, spec["size"], spec["mode"]).save(path)
+                renditions[kind] = {"path": _rel(path), "size": spec["size"], "mode": spec["mode"]}
+        renditions["original"] = {"path": _rel(source), "size": list(img.size), "mode": img.mode}
+
+        manifest = {"source": _rel(source), "source_mtime": mtime, "renditions": renditions}
+        tmp_path = manifest_path(picture).with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(manifest_path(picture))
+    print(f"[EvidenceAssets] 렌디션 생성: {_rel(source)}")
+    return manifest
+
+
+def rendition_path(picture: str, kind: str) -> Optional[str]:
+    """크기에 맞는 렌디션 경로 (저장소 루트 기준). 원본이 없거나 picture가 -1/None이면 None"""
+    if not isinstance(picture, str) or not picture:
+        return None
+    manifest = build_renditions(picture)
+    if manifest is None:
+        return None
+    return manifest["renditions"][kind]["path"]
+
+
+def remove_renditions(picture: str) -> None:
+    """원본을 지울 때 렌디션과 매니페스트도 함께 삭제"""
+    with _lock:
+        manifest = _read_manifest(picture)
+        if manifest:
+            for kind, rendition in manifest["renditions"].items():
+                if kind != "original":
+                    _abs(rendition["path"]).unlink(missing_ok=True)
+        manifest_path(picture).unlink(missing_ok=True)
+
+
+def _read_manifest(picture: str) -> Optional[Dict[str, Any]]:
+    # _lock을 잡은 상태에서 호출
+    try:
+        with open(manifest_path(picture), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
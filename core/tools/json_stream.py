@@ -0,0 +1,76 @@
+"""
+스트리밍 JSON 배열 파서
+- LLM이 JSON 배열을 쓰는 도중에도 객체({...})가 닫힐 때마다 dict로 내보내는 push 파서
+- 배열 앞의 설명 문장, ```json 코드 블록, {"증거품": [...]} 같은 감싼 형식도 첫 번째 '['부터 읽음
+- 문자열 안의 괄호/따옴표(이스케이프 포함)는 무시하고 중괄호 깊이만 추적
+
+사용 예시 :
+    parser = JsonArrayStreamParser()
+    async for chunk in chain.astream({}):
+        for item in parser.feed(chunk):
+            ...  # 객체 하나 완성
+        if parser.done:
+            break
+    rest = parser.close()
+"""
+import json
+from typing import Any, Dict, List
+
+
+class JsonArrayStreamParser:
+    def __init__(self):
+        self.text = ""             # 지금까지 받은 전체 텍스트 (실패 시 전체 파싱용)
+        self.items : List[Dict[str, Any]] = []
+        self.done = False          # 배열이 닫혔는지
+        self._pos = 0              # 다음에 읽을 위치
+        self._in_array = False
+        self._depth = 0            # 배열 안에서의 중괄호 깊이
+        self._in_string = False
+        self._escape = False
+        self._item_start = -1
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """텍스트를 추가하고 이번에 새로 닫힌 객체 목록 반환"""
+        self.text += chunk
+        emitted = []
+        while self._pos < len(self.text) and not self.done:
+            ch = self.text[self._pos]
+            if not self._in_array:
+                if ch == "[":
+                    self._in_array = True
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                if self._depth == 0:
+                    self._item_start = self._pos
+                self._depth += 1
+            elif ch == "}" and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(self.text[self._item_start:self._pos + 1], emitted)
+            elif ch == "]" and self._depth == 0:
+                self.done = True
+            self._pos += 1
+        return emitted
+
+    def close(self) -> List[Dict[str, Any]]:
+        """스트림 종료. 배열이 닫히지 않았으면 남은 미완성 객체는 버림"""
+        self.done = True
+        return []
+
+    def _emit(self, raw: str, emitted: List[Dict[str, Any]]) -> None:
+        try:
+            item = json.loads(raw)
+        except ValueError as e:
+            print(f"[JsonArrayStreamParser] 객체 파싱 실패, 건너뜀: {e} | {raw[:80]}")
+            return
+        if isinstance(item, dict):
+            self.items.append(item)
+            emitted.append(item)
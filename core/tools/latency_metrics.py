@@ -0,0 +1,78 @@
+"""
+단계별 지연 시간 집계
+- 이름별로 최근 max_samples개의 측정값(초)을 보관하고 평균 / p50 / p90 / 최대값 계산
+- 심문 답변 스트리밍: interrogation.ttfw(첫 토큰), interrogation.first_sentence(첫 문장),
+  interrogation.total(답변 완료)은 답변 생성 시작부터,
+  interrogation.ttfa(첫 문장 TTS 요청 전송 완료)는 사용자 입력 시점부터 (GameController)
+- 이벤트 루프 멈춤: event_loop.stall (tools/loop_watchdog.py)
+
+사용 예시 :
+    timer = LatencyMetrics.timer("interrogation")
+    ...
+    timer.mark("ttfw")            # 처음 호출될 때만 기록
+    timer.mark("total")
+    LatencyMetrics.summary("interrogation.ttfw")  # {"count": 12, "avg": 0.41, "p50": 0.38, ...}
+"""
+import time
+from collections import deque
+from threading import Lock
+from typing import Deque, Dict, Optional
+
+
+class StageTimer:
+    """시작 시점 기준으로 단계별 경과 시간을 한 번씩만 기록"""
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self.started_at = time.monotonic()
+        self.marks : Dict[str, float] = {}
+
+    def mark(self, stage: str) -> Optional[float]:
+        if stage in self.marks:
+            return None
+        elapsed = time.monotonic() - self.started_at
+        self.marks[stage] = elapsed
+        LatencyMetrics.record(f"{self.prefix}.{stage}", elapsed)
+        return elapsed
+
+    def report(self) -> str:
+        return ", ".join(f"{stage} {elapsed:.2f}s" for stage, elapsed in self.marks.items())
+
+
+class LatencyMetrics:
+    _lock = Lock()
+    _samples : Dict[str, Deque[float]] = {}
+    max_samples : int = 200
+
+    @classmethod
+    def timer(cls, prefix: str) -> StageTimer:
+        return StageTimer(prefix)
+
+    @classmethod
+    def record(cls, name: str, seconds: float) -> None:
+        with cls._lock:
+            cls._samples.setdefault(name, deque(maxlen=cls.max_samples)).append(seconds)
+
+    @classmethod
+    def summary(cls, name: Optional[str] = None) -> Dict:
+        """측정값 요약 (name이 없으면 전체 {이름: 요약})"""
+        with cls._lock:
+            if name is not None:
+                return cls._summarize(list(cls._samples.get(name, [])))
+            return {key: cls._summarize(list(values)) for key, values in cls._samples.items()}
+
+    @staticmethod
+    def _summarize(values) -> Dict:
+        if not values:
+            return {"count": 0}
+        ordered = sorted(values)
+
+        def pct(p: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 3)
+
+        return {
+            "count": len(values),
+            "avg": round(sum(values) / len(values), 3),
+            "p50": pct(0.5),
+            "p90": pct(0.9),
+            "max": round(ordered[-1], 3),
+        }
@@ -0,0 +1,188 @@
+"""
+LLM 응답 캐시 (SQLite)
+- 키: 모델, temperature 등 LLM 설정 문자열 + 렌더링된 프롬프트의 sha256 해시
+- TTL이 지난 항목은 조회 시 삭제, max_entries를 넘으면 가장 오래 안 쓴 항목부터 삭제 (LRU)
+- 체인별 사용 여부는 chain_config.yaml 의 llm_cache 섹션에서 설정
+
+사용 예시 :
+    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.2,
+                     cache=llm_cache_for("evidence_keyword", 0.2))
+    # 보통은 tools/llm_gateway.get_llm(chain=...)이 알아서 붙여줌
+    # invoke() 호출만 캐시됨 (stream()은 LangChain이 캐시를 사용하지 않음)
+"""
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+
+from tools.chain_config import get_chain_config
+
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+DEFAULT_TEMPERATURE = 0.7  # ChatOpenAI에서 temperature를 지정하지 않았을 때의 값
+
+
+def prompt_hash(prompt: str, llm_string: str) -> str:
+    return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+def parse_llm_string(llm_string: str) -> Dict[str, Any]:
+    """LangChain llm_string에서 모델명과 temperature 추출 (기록/통계용)"""
+    try:
+        kwargs = json.loads(llm_string.split("---", 1)[0]).get("kwargs", {})
+    except (ValueError, AttributeError):
+        return {"model": None, "temperature": None}
+    return {
+        "model": kwargs.get("model_name") or kwargs.get("model"),
+        "temperature": kwargs.get("temperature"),
+    }
+
+
+class SQLiteLLMCache(BaseCache):
+    def __init__(self, path: Path, ttl_seconds: float = 7 * 24 * 3600, max_entries: int = 5000):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    model TEXT,
+                    temperature REAL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    hit_count INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache(last_access)")
+        self.purge_expired()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = prompt_hash(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            response, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                with self._conn:
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE llm_cache SET last_access = ?, hit_count = hit_count + 1 WHERE key = ?",
+                    (now, key)
+                )
+            self.hits += 1
+
+        try:
+            return [loads(gen) for gen in json.loads(response)]
+        except Exception as e:
+            print(f"[LLMCache] 캐시 항목 복원 실패, 무시: {e}")
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = prompt_hash(prompt, llm_string)
+        meta = parse_llm_string(llm_string)
+        response = json.dumps([dumps(gen) for gen in return_val])
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """INSERT OR REPLACE INTO llm_cache (key, model, temperature, response, created_at, last_access)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (key, meta["model"], meta["temperature"], response, now, now)
+            )
+            self._evict_lru()
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def purge_expired(self) -> int:
+        """TTL이 지난 항목 삭제 후 삭제 개수 반환"""
+        if not self.ttl_seconds:
+            return 0
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            return cur.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "entries": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def _evict_lru(self) -> None:
+        # _lock을 잡은 상태에서 호출
+        if not self.max_entries:
+            return
+        size = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        overflow = size - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                (overflow,)
+            )
+
+
+_caches: Dict[str, SQLiteLLMCache] = {}
+_caches_lock = Lock()
+
+
+def llm_cache_for(chain: str, temperature: Optional[float] = None) -> Optional[BaseCache]:
+    """
+    체인 이름과 temperature로 사용할 캐시를 결정
+    - chain_config.yaml 의 llm_cache.chains 에 true/false가 있으면 그대로 따름
+    - 없으면 temperature가 deterministic_temperature 이하일 때만 캐시
+    캐시를 쓰지 않으면 None 반환 (ChatOpenAI(cache=None)은 캐시 없이 동작)
+    """
+    conf = get_chain_config("llm_cache")
+    if not conf.get("enabled", False):
+        return None
+
+    enabled = (conf.get("chains") or {}).get(chain)
+    if enabled is None:
+        temp = DEFAULT_TEMPERATURE if temperature is None else temperature
+        enabled = temp <= conf.get("deterministic_temperature", 0.3)
+    if not enabled:
+        return None
+
+    path = ROOT_DIR / conf.get("path", "data/llm_cache.sqlite3")
+    with _caches_lock:
+        cache = _caches.get(str(path))
+        if cache is None:
+            cache = SQLiteLLMCache(
+                path,
+                ttl_seconds=conf.get("ttl_seconds", 7 * 24 * 3600),
+                max_entries=conf.get("max_entries", 5000),
+            )
+            _caches[str(path)] = cache
+        return cache
@@ -0,0 +1,423 @@
+"""
+LLM 게이트웨이 (모든 체인이 여기서 ChatOpenAI를 받아감)
+- 모델별로 HTTP 클라이언트(httpx)를 하나씩 만들어 커넥션/TLS 재사용
+- 같은 (체인, 모델, temperature) 조합은 같은 LLM 객체 재사용 (chain_config.yaml이 바뀌면 새로 만들어 캐시 / 타임아웃 설정 반영)
+- 전체 / 체인별 동시 호출 수 제한
+- 호출마다 마감 시간(deadline) 적용: 대기열 + 재시도를 포함한 전체 시간
+- 일시적인 오류(타임아웃, 연결 오류, 429, 5xx)는 지수 백오프로 재시도
+- 설정은 chain_config.yaml 의 llm_gateway 섹션 (응답 캐시는 llm_cache 섹션)
+- 녹화/재생 모드(tools/llm_replay.py)가 켜져 있으면 실제 호출 대신 기록된 응답을 사용
+- 실제 호출마다 입력 토큰 중 프롬프트 캐시 적중량을 집계 (tools/token_usage.py)
+
+사용 예시 :
+    from tools.llm_gateway import get_llm
+    llm = get_llm(temperature=0.5, chain="case_behind")
+"""
+import asyncio
+import os
+import random
+import time
+from threading import BoundedSemaphore, Lock
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+import openai
+from langchain_core.messages import BaseMessage
+from langchain_core.language_models.chat_models import generate_from_stream
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_openai import ChatOpenAI
+
+from tools.chain_config import chain_config_version, get_chain_config
+from tools.llm_cache import llm_cache_for
+from tools.llm_replay import LLMReplay, request_key as replay_request_key
+from tools.token_usage import TokenUsageStats
+
+
+RETRYABLE_ERRORS = (
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+class ConcurrencyLimiter:
+    """
+    동기(스레드)/비동기 호출이 같이 쓰는 동시 실행 제한
+    비동기 쪽은 자리가 없으면 세마포어 대기를 스레드로 넘겨서 이벤트 루프를 막지 않음
+    """
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._sem = BoundedSemaphore(limit)
+
+    def acquire(self, timeout: Optional[float]) -> None:
+        if not self._sem.acquire(timeout=timeout):
+            raise TimeoutError(f"LLM 동시 호출 대기 시간 초과 (제한 {self.limit})")
+
+    async def aacquire(self, timeout: Optional[float]) -> None:
+        if self._sem.acquire(blocking=False):
+            return
+        waiter = asyncio.ensure_future(asyncio.to_thread(self._sem.acquire, timeout=timeout))
+        try:
+            acquired = await asyncio.shield(waiter)
+        except asyncio.CancelledError:
+            # 호출이 취소돼도 대기 스레드는 끝까지 돌기 때문에 나중에 얻은 자리는 돌려줌
+            waiter.add_done_callback(self._release_abandoned)
+            raise
+        if not acquired:
+            raise TimeoutError(f"LLM 동시 호출 대기 시간 초과 (제한 {self.limit})")
+
+    def _release_abandoned(self, waiter: asyncio.Future) -> None:
+        if not waiter.cancelled() and waiter.exception() is None and waiter.result():
+            self._sem.release()
+
+    def release(self) -> None:
+        self._sem.release()
+
+
+class LLMGateway:
+    _lock = Lock()
+    _http_clients : Dict[str, Tuple[httpx.Client, httpx.AsyncClient]] = {}
+    _llms : Dict[tuple, "GatewayChatOpenAI"] = {}
+    _llms_version : Any = None  # _llms를 만들 때의 설정 파일 버전
+    _limiters : Dict[str, ConcurrencyLimiter] = {}
+
+    @classmethod
+    def config(cls) -> Dict[str, Any]:
+        return get_chain_config("llm_gateway")
+
+    @classmethod
+    def chain_config(cls, chain: str) -> Dict[str, Any]:
+        """기본값 위에 체인별 설정을 덮어쓴 값"""
+        conf = cls.config()
+        merged = {
+            "timeout": conf.get("request_timeout", 60),
+            "deadline": conf.get("deadline_seconds", 120),
+            "max_retries": conf.get("max_retries", 2),
+            "concurrency": None,
+        }
+        merged.update((conf.get("chains") or {}).get(chain) or {})
+        return merged
+
+    @classmethod
+    def get_llm(cls, model: str = "gpt-4o-mini", temperature: Optional[float] = None,
+                chain: str = "default", **kwargs) -> "GatewayChatOpenAI":
+        if model.startswith("gpt-5"):
+            temperature = 1.0  # gpt-5 계열은 temperature 1만 지원
+        key = (chain, model, temperature, _hashable(kwargs))
+        version = chain_config_version()
+        with cls._lock:
+            if cls._llms_version != version:
+                # 체인별 캐시 여부 / 타임아웃은 만들 때 정해지므로 설정이 바뀌면 모두 다시 만듦
+                cls._llms = {}
+                cls._llms_version = version
+            llm = cls._llms.get(key)
+            if llm is None:
+                llm = cls._create_llm(model, temperature, chain, **kwargs)
+                cls._llms[key] = llm
+            return llm
+
+    @classmethod
+    def _create_llm(cls, model: str, temperature: Optional[float], chain: str, **kwargs) -> "GatewayChatOpenAI":
+        # _lock을 잡은 상태에서 호출
+        http_client, http_async_client = cls._http_clients_for(model)
+        if temperature is not None:
+            kwargs["temperature"] = temperature
+        cache = llm_cache_for(chain, temperature)
+        replay = LLMReplay.active()
+        if replay:
+            # 녹화/재생 중에는 모든 호출이 기록을 거치도록 응답 캐시를 끔
+            cache = None
+            if replay.replaying and not os.getenv("OPENAI_API_KEY"):
+                kwargs.setdefault("api_key", "replay")  # 네트워크 없는 환경에서도 객체 생성 가능하도록
+        return GatewayChatOpenAI(
+            model=model,
+            gateway_chain=chain,
+            http_client=http_client,
+            http_async_client=http_async_client,
+            timeout=cls.chain_config(chain)["timeout"],
+            max_retries=0,  # 재시도는 게이트웨이에서 처리
+            stream_usage=True,  # 스트리밍 호출도 토큰 사용량이 집계되도록
+            cache=cache,
+            **kwargs
+        )
+
+    @classmethod
+    def _http_clients_for(cls, model: str) -> Tuple[httpx.Client, httpx.AsyncClient]:
+        # _lock을 잡은 상태에서 호출
+        # AsyncClient는 처음 사용한 이벤트 루프에 묶이므로 앱의 메인 루프에서만 사용
+        clients = cls._http_clients.get(model)
+        if clients is None:
+            conf = cls.config()
+            limits = httpx.Limits(
+                max_connections=conf.get("max_connections", 10),
+                max_keepalive_connections=conf.get("max_keepalive_connections", 5),
+            )
+            clients = (httpx.Client(limits=limits), httpx.AsyncClient(limits=limits))
+            cls._http_clients[model] = clients
+        return clients
+
+    @classmethod
+    def limiters_for(cls, chain: str) -> List[ConcurrencyLimiter]:
+        """전체 제한 + 체인별 제한 (설정이 없으면 생략)"""
+        limits = [("*", cls.config().get("max_concurrency", 8)),
+                  (chain, cls.chain_config(chain).get("concurrency"))]
+        limiters = []
+        with cls._lock:
+            for name, limit in limits:
+                if not limit:
+                    continue
+                limiter = cls._limiters.get(name)
+                if limiter is None or limiter.limit != limit:
+                    limiter = ConcurrencyLimiter(limit)
+                    cls._limiters[name] = limiter
+                limiters.append(limiter)
+        return limiters
+
+    @staticmethod
+    def backoff(attempt: int) -> float:
+        conf = LLMGateway.config()
+        base = conf.get("backoff_base", 0.5)
+        cap = conf.get("backoff_max", 8.0)
+        return min(cap, base * (2 ** attempt)) * random.uniform(0.5, 1.0)
+
+
+def _hashable(value: Any) -> Any:
+    """LLM 캐시 키용으로 dict / list 같은 kwargs 값을 해시 가능한 형태로 바꿈"""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _hashable(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(repr(_hashable(v)) for v in value))
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def get_llm(model: str = "gpt-4o-mini", temperature: Optional[float] = None,
+            chain: str = "default", **kwargs) -> "GatewayChatOpenAI":
+    return LLMGateway.get_llm(model=model, temperature=temperature, chain=chain, **kwargs)
+
+
+class GatewayChatOpenAI(ChatOpenAI):
+    """
+    ChatOpenAI 호출 경로(_generate/_agenerate/_stream/_astream)에 동시성 제한, 마감 시간, 재시도를 끼워 넣음
+    응답 캐시는 그 바깥(BaseChatModel)에서 먼저 확인하므로 캐시 적중 시에는 제한을 받지 않음
+    녹화/재생 모드에서는 _call_* (실제 호출) 앞뒤에서 기록하거나 기록된 응답을 돌려줌
+    """
+    gateway_chain: str = "default"
+
+    def _replay_entry(self, replay: LLMReplay, messages, stop, kwargs):
+        """(요청 키, 재생할 기록) 반환. 녹화 모드이거나 기록이 없으면 기록은 None"""
+        key = replay_request_key(self.gateway_chain, self._get_request_payload(messages, stop=stop, **kwargs))
+        return key, replay.lookup(key) if replay.replaying else None
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs: Any) -> ChatResult:
+        replay = LLMReplay.active()
+        if not replay:
+            return self._call_generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        key, entry = self._replay_entry(replay, messages, stop, kwargs)
+        if entry is not None:
+            return replay.replay_generate(entry)
+        start = time.monotonic()
+        result = self._call_generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        if replay.recording:
+            replay.record(key, self.gateway_chain, self.model_name, result, time.monotonic() - start)
+        return result
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager=None, **kwargs: Any) -> ChatResult:
+        replay = LLMReplay.active()
+        if not replay:
+            return await self._call_agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        key, entry = self._replay_entry(replay, messages, stop, kwargs)
+        if entry is not None:
+            return await replay.areplay_generate(entry)
+        start = time.monotonic()
+        result = await self._call_agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        if replay.recording:
+            replay.record(key, self.gateway_chain, self.model_name, result, time.monotonic() - start)
+        return result
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        replay = LLMReplay.active()
+        if not replay:
+            yield from self._call_stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+            return
+        key, entry = self._replay_entry(replay, messages, stop, kwargs)
+        if entry is not None:
+            yield from replay.replay_stream(entry)
+            return
+        start = time.monotonic()
+        chunks, timings = [], []
+        for chunk in self._call_stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+            chunks.append(chunk)
+            if chunk.text:
+                timings.append([time.monotonic() - start, chunk.text])
+            yield chunk
+        if replay.recording and chunks:
+            replay.record(key, self.gateway_chain, self.model_name, generate_from_stream(iter(chunks)),
+                          time.monotonic() - start, chunks=timings)
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        replay = LLMReplay.active()
+        if not replay:
+            async for chunk in self._call_astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                yield chunk
+            return
+        key, entry = self._replay_entry(replay, messages, stop, kwargs)
+        if entry is not None:
+            async for chunk in replay.areplay_stream(entry):
+                yield chunk
+            return
+        start = time.monotonic()
+        chunks, timings = [], []
+        async for chunk in self._call_astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+            chunks.append(chunk)
+            if chunk.text:
+                timings.append([time.monotonic() - start, chunk.text])
+            yield chunk
+        if replay.recording and chunks:
+            replay.record(key, self.gateway_chain, self.model_name, generate_from_stream(iter(chunks)),
+                          time.monotonic() - start, chunks=timings)
+
+    def _deadline_settings(self) -> Tuple[float, int]:
+        conf = LLMGateway.chain_config(self.gateway_chain)
+        return time.monotonic() + conf["deadline"], conf["max_retries"]
+
+    def _acquire(self, deadline: float) -> List[ConcurrencyLimiter]:
+        acquired = []
+        try:
+            for limiter in LLMGateway.limiters_for(self.gateway_chain):
+                limiter.acquire(max(0.0, deadline - time.monotonic()))
+                acquired.append(limiter)
+        except BaseException:
+            self._release(acquired)
+            raise
+        return acquired
+
+    async def _aacquire(self, deadline: float) -> List[ConcurrencyLimiter]:
+        acquired = []
+        try:
+            for limiter in LLMGateway.limiters_for(self.gateway_chain):
+                await limiter.aacquire(max(0.0, deadline - time.monotonic()))
+                acquired.append(limiter)
+        except BaseException:
+            self._release(acquired)
+            raise
+        return acquired
+
+    @staticmethod
+    def _release(acquired: List[ConcurrencyLimiter]) -> None:
+        for limiter in reversed(acquired):
+            limiter.release()
+
+    def _attempt_timeout(self, deadline: float) -> float:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"[LLMGateway] {self.gateway_chain} 마감 시간 초과")
+        return min(remaining, self.request_timeout or remaining)
+
+    def _retry_delay(self, error: Exception, attempt: int, max_retries: int, deadline: float) -> float:
+        """재시도할 대기 시간 반환. 재시도하지 않을 경우 에러를 그대로 올림"""
+        if not isinstance(error, RETRYABLE_ERRORS) or attempt >= max_retries:
+            raise error
+        delay = LLMGateway.backoff(attempt)
+        if time.monotonic() + delay >= deadline:
+            raise error
+        print(f"[LLMGateway] {self.gateway_chain} 재시도 {attempt + 1}/{max_retries} "
+              f"({delay:.1f}초 후): {type(error).__name__}")
+        return delay
+
+    def _record_usage(self, message: BaseMessage) -> None:
+        # 스트리밍은 usage가 담긴 마지막 청크에서만 기록됨
+        TokenUsageStats.record(self.gateway_chain, getattr(message, "usage_metadata", None))
+
+    def _call_generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs: Any) -> ChatResult:
+        deadline, max_retries = self._deadline_settings()
+        acquired = self._acquire(deadline)
+        try:
+            attempt = 0
+            while True:
+                try:
+                    result = super()._generate(messages, stop=stop, run_manager=run_manager,
+                                               timeout=self._attempt_timeout(deadline), **kwargs)
+                    self._record_usage(result.generations[0].message)
+                    return result
+                except Exception as e:
+                    time.sleep(self._retry_delay(e, attempt, max_retries, deadline))
+                    attempt += 1
+        finally:
+            self._release(acquired)
+
+    async def _call_agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager=None, **kwargs: Any) -> ChatResult:
+        deadline, max_retries = self._deadline_settings()
+        acquired = await self._aacquire(deadline)
+        try:
+            attempt = 0
+            while True:
+                try:
+                    result = await super()._agenerate(messages, stop=stop, run_manager=run_manager,
+                                                      timeout=self._attempt_timeout(deadline), **kwargs)
+                    self._record_usage(result.generations[0].message)
+                    return result
+                except Exception as e:
+                    await asyncio.sleep(self._retry_delay(e, attempt, max_retries, deadline))
+                    attempt += 1
+        finally:
+            self._release(acquired)
+
+    def _call_stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        # 첫 청크를 받기 전까지만 재시도 (이미 내보낸 토큰은 되돌릴 수 없음)
+        deadline, max_retries = self._deadline_settings()
+        acquired = self._acquire(deadline)
+        try:
+            attempt = 0
+            while True:
+                started = False
+                try:
+                    for chunk in super()._stream(messages, stop=stop, run_manager=run_manager,
+                                                 timeout=self._attempt_timeout(deadline), **kwargs):
+                        started = True
+                        self._record_usage(chunk.message)
+                        yield chunk
+                    return
+                except Exception as e:
+                    if started:
+                        raise
+                    time.sleep(self._retry_delay(e, attempt, max_retries, deadline))
+                    attempt += 1
+        finally:
+            self._release(acquired)
+
+    async def _call_astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        deadline, max_retries = self._deadline_settings()
+        acquired = await self._aacquire(deadline)
+        try:
+            attempt = 0
+            while True:
+                started = False
+                try:
+                    async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager,
+                                                        timeout=self._attempt_timeout(deadline), **kwargs):
+                        started = True
+                        self._record_usage(chunk.message)
+                        yield chunk
+                    return
+                except Exception as e:
+                    if started:
+                        raise
+                    await asyncio.sleep(self._retry_delay(e, attempt, max_retries, deadline))
+                    attempt += 1
+        finally:
+            self._release(acquired)
@@ -0,0 +1,167 @@
+"""
+LLM 호출 녹화/재생 (OpenAI API 없이 전체 파이프라인 부하 테스트/프로파일링용)
+- record : 실제 응답을 (요청 해시 → 응답 메시지, 걸린 시간, 스트리밍 청크 타이밍)으로 JSONL 파일에 기록
+- replay : 기록된 응답을 즉시 돌려줌 (timed: true면 기록된 시간만큼 기다리며 재생)
+- 요청 해시: 게이트웨이 체인 이름 + 실제 요청 payload(모델, temperature, 메시지, 도구/응답 형식 등)
+- tools/llm_gateway.py 의 GatewayChatOpenAI가 호출 직전에 사용 (녹화/재생 중에는 응답 캐시를 쓰지 않음)
+
+설정 : chain_config.yaml 의 llm_replay 섹션, 또는 환경 변수
+    LLM_REPLAY_MODE=record|replay   LLM_REPLAY_PATH=data/llm_replay/xxx.jsonl   LLM_REPLAY_TIMED=1
+
+사용 예시 :
+    LLM_REPLAY_MODE=record python main.py      # 한 번 실제로 플레이하며 녹화
+    LLM_REPLAY_MODE=replay python main.py      # 네트워크 없이 같은 흐름 재생
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from langchain_core.messages import AIMessageChunk, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from tools.chain_config import get_chain_config
+
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+
+
+class ReplayMissError(LookupError):
+    """재생 모드에서 녹화되지 않은 요청이 들어왔을 때"""
+
+
+def request_key(chain: str, payload: Dict[str, Any]) -> str:
+    # response_format/tools에 pydantic 클래스가 들어올 수 있어 default=str로 직렬화
+    body = json.dumps({"chain": chain, **payload}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class LLMReplay:
+    _lock = Lock()
+    _instance : "LLMReplay" = None
+
+    def __init__(self, mode: str, path: Path, timed: bool = False, on_miss: str = "error"):
+        self.mode = mode          # record / replay
+        self.path = path
+        self.timed = timed
+        self.on_miss = on_miss    # error / passthrough (재생 모드에서 기록이 없을 때 실제 호출)
+        self.hits = 0
+        self.misses = 0
+        self._entries : Dict[str, Dict[str, Any]] = {}
+        self._file_lock = Lock()
+        if self.path.exists():
+            self._load()
+
+    @classmethod
+    def active(cls) -> Optional["LLMReplay"]:
+        """설정된 녹화/재생 객체 (꺼져 있으면 None)"""
+        if cls._instance is not None:
+            return cls._instance if cls._instance.mode != "off" else None
+        with cls._lock:
+            if cls._instance is None:
+                conf = get_chain_config("llm_replay")
+                mode = os.getenv("LLM_REPLAY_MODE", conf.get("mode") or "off")
+                path = ROOT_DIR / os.getenv("LLM_REPLAY_PATH", conf.get("path", "data/llm_replay/recording.jsonl"))
+                timed = os.getenv("LLM_REPLAY_TIMED", str(conf.get("timed", False))).lower() in ("1", "true")
+                cls._instance = cls(mode, path, timed=timed, on_miss=conf.get("on_miss", "error"))
+                if mode != "off":
+                    print(f"[LLMReplay] {mode} 모드 ({path}, 기록 {len(cls._instance._entries)}개, timed={timed})")
+        return cls.active()
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _load(self) -> None:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries[entry["key"]] = entry
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            if self.on_miss != "passthrough":
+                raise ReplayMissError(f"[LLMReplay] 녹화되지 않은 요청: {key[:12]}")
+            return None
+        self.hits += 1
+        return entry
+
+    def record(self, key: str, chain: str, model: str, result: ChatResult, latency: float,
+               chunks: Optional[List[List[Any]]] = None) -> None:
+        message = result.generations[0].message
+        # 구조화 출력의 parsed(pydantic 객체)는 JSON으로 저장할 수 없어서 제외
+        message.additional_kwargs.pop("parsed", None)
+        entry = {
+            "key": key,
+            "chain": chain,
+            "model": model,
+            "latency": latency,
+            "message": message_to_dict(message),
+            "llm_output": result.llm_output,
+            "chunks": chunks,  # [[시작부터의 초, 텍스트], ...] (스트리밍 호출일 때만)
+        }
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+        with self._file_lock:
+            self._entries[key] = entry
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + "\n")
+
+    # -------------------- 재생 --------------------
+
+    @staticmethod
+    def to_result(entry: Dict[str, Any]) -> ChatResult:
+        message = messages_from_dict([entry["message"]])[0]
+        return ChatResult(generations=[ChatGeneration(message=message)], llm_output=entry.get("llm_output"))
+
+    def replay_generate(self, entry: Dict[str, Any]) -> ChatResult:
+        if self.timed:
+            time.sleep(entry["latency"])
+        return self.to_result(entry)
+
+    async def areplay_generate(self, entry: Dict[str, Any]) -> ChatResult:
+        if self.timed:
+            await asyncio.sleep(entry["latency"])
+        return self.to_result(entry)
+
+    def _stream_plan(self, entry: Dict[str, Any]) -> List[List[Any]]:
+        # 스트리밍으로 녹화하지 않은 응답은 마지막에 한 번에 내보냄
+        return entry.get("chunks") or [[entry["latency"], self.to_result(entry).generations[0].message.content]]
+
+    def _final_chunk(self, entry: Dict[str, Any]) -> ChatGenerationChunk:
+        message = self.to_result(entry).generations[0].message
+        return ChatGenerationChunk(message=AIMessageChunk(
+            content="",
+            usage_metadata=getattr(message, "usage_metadata", None),
+            response_metadata=message.response_metadata,
+        ))
+
+    def replay_stream(self, entry: Dict[str, Any]) -> Iterator[ChatGenerationChunk]:
+        start = time.monotonic()
+        for at, text in self._stream_plan(entry):
+            if self.timed:
+                time.sleep(max(0.0, at - (time.monotonic() - start)))
+            yield ChatGenerationChunk(message=AIMessageChunk(content=text))
+        yield self._final_chunk(entry)
+
+    async def areplay_stream(self, entry: Dict[str, Any]) -> AsyncIterator[ChatGenerationChunk]:
+        start = time.monotonic()
+        for at, text in self._stream_plan(entry):
+            if self.timed:
+                await asyncio.sleep(max(0.0, at - (time.monotonic() - start)))
+            yield ChatGenerationChunk(message=AIMessageChunk(content=text))
+        yield self._final_chunk(entry)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"mode": self.mode, "entries": len(self._entries), "hits": self.hits, "misses": self.misses}
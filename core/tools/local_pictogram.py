@@ -0,0 +1,236 @@
+"""
+로컬 픽토그램 생성 (Replicate 없이 PIL로 200×200 흑백 아이콘 생성, 수 ms)
+- 아이콘 라이브러리: 증거로 자주 나오는 물건을 도형으로 그리는 함수 모음 + 한국어/영어 별칭 색인
+- 아이콘 선택: 영어 키워드 단어 → 증거 이름(한국어) 부분 문자열 순으로 색인 조회
+- 맞는 아이콘이 없으면 증거 이름 첫 글자를 NanumGothic 글리프로 그린 카드로 대체
+- 결과는 data/evidence_resource/local/ 에 저장 (같은 입력이면 다시 그리지 않음)
+
+사용 예시 :
+    path = render_local_pictogram("CCTV 영상")                  # 한국어 이름만으로도 동작
+    path = render_local_pictogram("피 묻은 칼", "bloody knife")  # 영어 키워드가 있으면 우선 사용
+"""
+import hashlib
+import re
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+LOCAL_DIR = Path("data") / "evidence_resource" / "local"  # 저장소 루트 기준 (picture 경로 형식과 동일)
+FONT_PATH = Path(__file__).parent.parent / "ui" / "qt_designer" / "assets" / "NanumGothicLight.ttf"
+
+SIZE = 200
+BLACK, WHITE = 0, 1
+LINE = 8  # 기본 선 두께
+
+Drawer = Callable[[ImageDraw.ImageDraw], None]
+
+
+# ---------------------------- 아이콘 ----------------------------
+
+def _knife(d: ImageDraw.ImageDraw):
+    d.polygon([(40, 150), (140, 50), (160, 40), (150, 60), (55, 165)], outline=BLACK, width=LINE)
+    d.line([(45, 135), (70, 160)], fill=BLACK, width=LINE)
+    d.line([(52, 158), (30, 180)], fill=BLACK, width=18)
+
+def _phone(d: ImageDraw.ImageDraw):
+    d.rounded_rectangle([60, 25, 140, 175], radius=14, outline=BLACK, width=LINE)
+    d.line([(85, 40), (115, 40)], fill=BLACK, width=LINE - 2)
+    d.rectangle([72, 55, 128, 145], outline=BLACK, width=4)
+    d.ellipse([92, 153, 108, 169], fill=BLACK)
+
+def _camera(d: ImageDraw.ImageDraw):
+    d.rounded_rectangle([25, 65, 145, 135], radius=10, outline=BLACK, width=LINE)
+    d.polygon([(145, 85), (180, 65), (180, 135), (145, 115)], outline=BLACK, width=LINE)
+    d.ellipse([45, 80, 85, 120], outline=BLACK, width=LINE)
+    d.line([(60, 135), (60, 175), (110, 175)], fill=BLACK, width=LINE)
+
+def _document(d: ImageDraw.ImageDraw):
+    d.polygon([(50, 20), (125, 20), (150, 45), (150, 180), (50, 180)], outline=BLACK, width=LINE)
+    d.line([(125, 20), (125, 45), (150, 45)], fill=BLACK, width=LINE - 2)
+    for y in (70, 95, 120, 145):
+        d.line([(70, y), (130, y)], fill=BLACK, width=LINE - 2)
+
+def _key(d: ImageDraw.ImageDraw):
+    d.ellipse([25, 70, 85, 130], outline=BLACK, width=LINE + 2)
+    d.line([(85, 100), (175, 100)], fill=BLACK, width=LINE + 2)
+    d.line([(150, 100), (150, 130)], fill=BLACK, width=LINE + 2)
+    d.line([(170, 100), (170, 125)], fill=BLACK, width=LINE + 2)
+
+def _money(d: ImageDraw.ImageDraw):
+    d.rounded_rectangle([20, 55, 180, 145], radius=8, outline=BLACK, width=LINE)
+    d.ellipse([75, 75, 125, 125], outline=BLACK, width=LINE - 2)
+    d.line([(100, 82), (100, 118)], fill=BLACK, width=LINE - 2)
+    d.ellipse([35, 92, 51, 108], fill=BLACK)
+    d.ellipse([149, 92, 165, 108], fill=BLACK)
+
+def _bottle(d: ImageDraw.ImageDraw):
+    d.rectangle([85, 20, 115, 55], outline=BLACK, width=LINE)
+    d.polygon([(85, 55), (60, 90), (60, 180), (140, 180), (140, 90), (115, 55)], outline=BLACK, width=LINE)
+    d.rectangle([75, 110, 125, 150], outline=BLACK, width=LINE - 3)
+
+def _pill(d: ImageDraw.ImageDraw):
+    d.rounded_rectangle([30, 75, 170, 125], radius=25, outline=BLACK, width=LINE)
+    d.line([(100, 75), (100, 125)], fill=BLACK, width=LINE)
+    d.pieslice([30, 75, 80, 125], 90, 270, fill=BLACK)
+    d.rectangle([55, 75, 100, 125], fill=BLACK)
+
+def _car(d: ImageDraw.ImageDraw):
+    d.polygon([(20, 130), (20, 100), (50, 95), (75, 60), (130, 60), (155, 95), (180, 100), (180, 130)],
+              outline=BLACK, width=LINE)
+    d.line([(75, 95), (155, 95)], fill=BLACK, width=LINE - 3)
+    d.ellipse([40, 115, 80, 155], fill=WHITE, outline=BLACK, width=LINE)
+    d.ellipse([120, 115, 160, 155], fill=WHITE, outline=BLACK, width=LINE)
+
+def _footprint(d: ImageDraw.ImageDraw):
+    for dx, dy in ((0, 40), (60, 0)):
+        d.ellipse([45 + dx, 70 + dy, 85 + dx, 130 + dy], fill=BLACK)
+        d.ellipse([52 + dx, 135 + dy, 78 + dx, 160 + dy], fill=BLACK)
+        for i, x in enumerate((45, 57, 69, 81)):
+            d.ellipse([x + dx, 52 + dy + i * 2, x + 9 + dx, 63 + dy + i * 2], fill=BLACK)
+
+def _fingerprint(d: ImageDraw.ImageDraw):
+    for r in range(12, 80, 14):
+        d.arc([100 - r, 100 - r * 1.2, 100 + r, 100 + r * 1.2], 200, 520, fill=BLACK, width=LINE - 3)
+
+def _laptop(d: ImageDraw.ImageDraw):
+    d.rounded_rectangle([45, 40, 155, 120], radius=6, outline=BLACK, width=LINE)
+    d.polygon([(25, 135), (45, 120), (155, 120), (175, 135)], outline=BLACK, width=LINE)
+    d.line([(25, 140), (175, 140)], fill=BLACK, width=LINE)
+
+def _clock(d: ImageDraw.ImageDraw):
+    d.ellipse([30, 30, 170, 170], outline=BLACK, width=LINE + 2)
+    d.line([(100, 100), (100, 55)], fill=BLACK, width=LINE)
+    d.line([(100, 100), (135, 120)], fill=BLACK, width=LINE)
+    d.ellipse([93, 93, 107, 107], fill=BLACK)
+
+def _glove(d: ImageDraw.ImageDraw):
+    d.rounded_rectangle([60, 90, 140, 175], radius=12, outline=BLACK, width=LINE)
+    for x in (62, 82, 102, 122):
+        d.rounded_rectangle([x, 35, x + 16, 100], radius=8, outline=BLACK, width=LINE - 3)
+    d.rounded_rectangle([130, 85, 170, 105], radius=10, outline=BLACK, width=LINE - 3)
+    d.line([(60, 155), (140, 155)], fill=BLACK, width=LINE - 3)
+
+def _bag(d: ImageDraw.ImageDraw):
+    d.rounded_rectangle([35, 70, 165, 175], radius=12, outline=BLACK, width=LINE)
+    d.arc([65, 25, 135, 105], 180, 360, fill=BLACK, width=LINE)
+    d.line([(35, 110), (165, 110)], fill=BLACK, width=LINE - 3)
+    d.rectangle([90, 100, 110, 122], fill=BLACK)
+
+def _blood(d: ImageDraw.ImageDraw):
+    d.polygon([(100, 25), (55, 110), (145, 110)], fill=BLACK)
+    d.ellipse([55, 75, 145, 165], fill=BLACK)
+    d.ellipse([150, 140, 170, 160], fill=BLACK)
+    d.ellipse([30, 150, 45, 165], fill=BLACK)
+
+def _ring(d: ImageDraw.ImageDraw):
+    d.ellipse([45, 70, 155, 180], outline=BLACK, width=LINE + 4)
+    d.polygon([(100, 20), (75, 45), (100, 75), (125, 45)], outline=BLACK, width=LINE - 2)
+
+def _book(d: ImageDraw.ImageDraw):
+    d.rounded_rectangle([45, 25, 155, 175], radius=6, outline=BLACK, width=LINE)
+    d.line([(65, 25), (65, 175)], fill=BLACK, width=LINE)
+    d.rectangle([85, 55, 135, 80], outline=BLACK, width=LINE - 3)
+
+def _tool(d: ImageDraw.ImageDraw):
+    d.line([(50, 165), (125, 90)], fill=BLACK, width=16)
+    d.polygon([(105, 55), (150, 40), (165, 55), (150, 100), (125, 90), (115, 75)], fill=BLACK)
+
+
+# 아이콘 이름 → (그리기 함수, 영어 별칭, 한국어 별칭)
+ICON_LIBRARY: Dict[str, Tuple[Drawer, List[str], List[str]]] = {
+    "knife": (_knife, ["knife", "blade", "dagger", "weapon", "scissors"], ["칼", "흉기", "나이프", "과도", "가위"]),
+    "phone": (_phone, ["phone", "smartphone", "mobile", "call", "message", "text", "sms"],
+              ["휴대폰", "핸드폰", "전화", "스마트폰", "문자", "통화", "메시지", "카톡"]),
+    "camera": (_camera, ["camera", "cctv", "video", "footage", "recording", "photo", "picture", "surveillance"],
+               ["CCTV", "cctv", "카메라", "영상", "사진", "블랙박스", "녹화", "촬영"]),
+    "document": (_document, ["document", "paper", "contract", "letter", "note", "report", "receipt",
+                             "record", "file", "statement", "testimony", "will", "memo", "form"],
+                 ["문서", "서류", "계약서", "편지", "메모", "유서", "진술", "증언", "보고서", "기록",
+                  "영수증", "진단서", "각서", "쪽지", "소견서", "명세서", "차용증", "증서", "확인서", "합의서"]),
+    "key": (_key, ["key", "lock", "keycard"], ["열쇠", "키", "카드키", "자물쇠"]),
+    "money": (_money, ["money", "cash", "wallet", "bank", "coin", "payment", "transfer", "check", "bill"],
+              ["돈", "현금", "지갑", "계좌", "송금", "통장", "수표", "입금", "거래"]),
+    "bottle": (_bottle, ["bottle", "poison", "drink", "wine", "alcohol", "liquid", "chemical"],
+               ["병", "독", "술", "음료", "약품", "화학"]),
+    "pill": (_pill, ["pill", "medicine", "drug", "tablet", "prescription", "capsule"],
+             ["약", "알약", "수면제", "처방", "캡슐", "진통제"]),
+    "car": (_car, ["car", "vehicle", "taxi", "truck", "automobile"], ["차", "자동차", "차량", "택시", "트럭"]),
+    "footprint": (_footprint, ["footprint", "shoe", "sneaker", "boot", "track"], ["발자국", "신발", "운동화", "구두"]),
+    "fingerprint": (_fingerprint, ["fingerprint", "print", "dna"], ["지문", "DNA"]),
+    "laptop": (_laptop, ["laptop", "computer", "email", "mail", "server", "log", "usb"],
+               ["노트북", "컴퓨터", "이메일", "메일", "서버", "로그", "USB"]),
+    "clock": (_clock, ["clock", "watch", "time", "timer", "alarm", "alibi"], ["시계", "시간", "알리바이", "타이머"]),
+    "glove": (_glove, ["glove", "hand"], ["장갑", "손"]),
+    "bag": (_bag, ["bag", "backpack", "purse", "suitcase", "package", "box"], ["가방", "봉투", "택배", "상자", "캐리어"]),
+    "blood": (_blood, ["blood", "stain", "bloodstain"], ["혈흔", "피", "핏자국", "얼룩"]),
+    "ring": (_ring, ["ring", "jewelry", "necklace", "diamond", "earring", "bracelet"],
+             ["반지", "목걸이", "보석", "귀걸이", "팔찌"]),
+    "book": (_book, ["book", "diary", "notebook", "ledger", "journal", "album"], ["일기", "책", "장부", "수첩", "노트", "앨범"]),
+    "tool": (_tool, ["tool", "hammer", "wrench", "screwdriver", "crowbar"], ["공구", "망치", "렌치", "드라이버", "쇠지렛대"]),
+}
+
+# 별칭 색인 (영어는 단어 단위, 한국어는 부분 문자열 — 긴 별칭부터 확인해서 "약품"이 "약"보다 먼저 맞도록)
+_ENGLISH_INDEX: Dict[str, str] = {alias: icon for icon, (_, en, _) in ICON_LIBRARY.items() for alias in en}
+_KOREAN_INDEX: List[Tuple[str, str]] = sorted(
+    ((alias, icon) for icon, (_, _, ko) in ICON_LIBRARY.items() for alias in ko),
+    key=lambda item: len(item[0]), reverse=True
+)
+
+
+def find_icon(name: str, keyword: Optional[str] = None) -> Optional[str]:
+    """영어 키워드의 마지막 단어(보통 핵심 명사)부터 확인하고, 없으면 한국어 이름으로 확인"""
+    if keyword:
+        words = re.findall(r"[a-z]+", keyword.lower())
+        for word in reversed(words):
+            for candidate in (word, word[:-1] if word.endswith("s") else None):
+                if candidate and candidate in _ENGLISH_INDEX:
+                    return _ENGLISH_INDEX[candidate]
+    # 한국어는 핵심 명사가 보통 뒤에 오므로 마지막 단어부터 확인
+    # 한 글자 별칭("차", "피")은 단어 전체이거나 단어 끝일 때만 인정 ("차용증"이 차로 잡히지 않도록)
+    for word in reversed(name.split()):
+        for alias, icon in _KOREAN_INDEX:
+            if len(alias) > 1 and alias in word:
+                return icon
+            if len(alias) == 1 and word.endswith(alias):
+                return icon
+    return None
+
+
+def _glyph_of(name: str) -> str:
+    return next((ch for ch in name if not ch.isspace()), "?")
+
+
+def _draw_glyph(d: ImageDraw.ImageDraw, name: str):
+    """아이콘이 없을 때: 테두리 카드 + 이름 첫 글자"""
+    d.rounded_rectangle([15, 15, 185, 185], radius=20, outline=BLACK, width=LINE)
+    glyph = _glyph_of(name)
+    try:
+        font = ImageFont.truetype(str(FONT_PATH), 110)
+    except OSError:
+        font = ImageFont.load_default()
+    d.text((SIZE / 2, SIZE / 2), glyph, font=font, fill=BLACK, anchor="mm")
+
+
+def render_pictogram(name: str, keyword: Optional[str] = None) -> Image.Image:
+    """200×200 1비트 이미지 생성 (흰 바탕, 검은 선)"""
+    img = Image.new("1", (SIZE, SIZE), WHITE)
+    d = ImageDraw.Draw(img)
+    icon = find_icon(name, keyword)
+    if icon:
+        ICON_LIBRARY[icon][0](d)
+    else:
+        _draw_glyph(d, name)
+    return img
+
+
+def render_local_pictogram(name: str, keyword: Optional[str] = None) -> str:
+    """픽토그램을 그려서 저장하고 경로(저장소 루트 기준 상대 경로) 반환"""
+    icon = find_icon(name, keyword) or "glyph-" + hashlib.sha1(_glyph_of(name).encode("utf-8")).hexdigest()[:8]
+    path = LOCAL_DIR / f"{icon}.png"
+    if not (ROOT_DIR / path).is_file():
+        (ROOT_DIR / LOCAL_DIR).mkdir(parents=True, exist_ok=True)
+        render_pictogram(name, keyword).save(ROOT_DIR / path)
+    return path.as_posix()
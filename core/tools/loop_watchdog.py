@@ -0,0 +1,107 @@
+"""
+이벤트 루프 멈춤 감시 (qasync로 PyQt와 asyncio가 같은 루프를 쓰므로 루프가 막히면 UI / Typewriter 타이머 / FastAPI 브리지가 같이 멈춤)
+- 루프 안에서 interval(threshold의 절반)마다 하트비트를 갱신하고, 별도 스레드가 하트비트가 threshold 이상 늦어지는지 확인
+- 멈춘 동안 루프 스레드의 스택을 잡아서 어떤 동기 호출(chain.invoke, requests, time.sleep ...)이 막았는지 출력
+- 멈춘 시간은 LatencyMetrics의 event_loop.stall로 기록
+
+환경 변수 : LOOP_WATCHDOG=1 이면 켬 (기본 꺼짐, 개발/측정용), LOOP_STALL_THRESHOLD_MS (기본 50)
+
+사용 예시 :
+    LoopWatchdog.start()         # 이벤트 루프 안에서 한 번 (main.py)
+    LoopWatchdog.stalls()        # 최근 멈춤 [{"seconds": 0.84, "stack": [...]} ...]
+    LoopWatchdog.stop()
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from threading import Lock
+from typing import Any, Deque, Dict, List, Optional
+
+
+WATCHDOG_ENABLED = os.getenv("LOOP_WATCHDOG", "0") == "1"
+STALL_THRESHOLD = float(os.getenv("LOOP_STALL_THRESHOLD_MS", "50")) / 1000
+CORE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class LoopWatchdog:
+    _lock = Lock()
+    _task : Optional[asyncio.Task] = None
+    _thread : Optional[threading.Thread] = None
+    _stop = threading.Event()
+    _loop_thread_id : Optional[int] = None
+    _last_beat : float = 0.0
+    _stalls : Deque[Dict[str, Any]] = deque(maxlen=50)
+    interval : float = 0.025
+
+    @classmethod
+    def start(cls, threshold: float = STALL_THRESHOLD) -> bool:
+        """실행 중인 이벤트 루프 안에서 호출"""
+        if not WATCHDOG_ENABLED or cls._thread is not None:
+            return False
+        loop = asyncio.get_event_loop()
+        # 하트비트는 기준 시간의 절반 간격이면 충분함 (10ms 미만으로는 내리지 않음)
+        cls.interval = max(0.01, threshold / 2)
+        cls._stop.clear()
+        cls._loop_thread_id = threading.get_ident()
+        cls._last_beat = time.monotonic()
+        cls._task = loop.create_task(cls._heartbeat())
+        cls._thread = threading.Thread(target=cls._monitor, args=(threshold,), daemon=True, name="loop-watchdog")
+        cls._thread.start()
+        print(f"[LoopWatchdog] 이벤트 루프 감시 시작 (기준 {threshold * 1000:.0f}ms)")
+        return True
+
+    @classmethod
+    def stop(cls) -> None:
+        cls._stop.set()
+        if cls._task is not None:
+            cls._task.cancel()
+        cls._task = cls._thread = None
+
+    @classmethod
+    def stalls(cls) -> List[Dict[str, Any]]:
+        with cls._lock:
+            return list(cls._stalls)
+
+    @classmethod
+    async def _heartbeat(cls) -> None:
+        while not cls._stop.is_set():
+            cls._last_beat = time.monotonic()
+            await asyncio.sleep(cls.interval)
+
+    @classmethod
+    def _monitor(cls, threshold: float) -> None:
+        stalled_beat, stack = None, None
+        while not cls._stop.wait(cls.interval / 2):
+            beat = cls._last_beat
+            if stalled_beat is None:
+                if time.monotonic() - beat - cls.interval > threshold:
+                    # 멈춘 동안 한 번만 스택을 잡음 (막고 있는 호출 위치)
+                    stalled_beat, stack = beat, cls._capture_stack()
+            elif beat != stalled_beat:
+                # 하트비트가 다시 뛰면 두 하트비트 사이 간격으로 멈춘 시간 계산
+                cls._report(beat - stalled_beat - cls.interval, stack)
+                stalled_beat, stack = None, None
+
+    @classmethod
+    def _capture_stack(cls) -> List[str]:
+        frame = sys._current_frames().get(cls._loop_thread_id)
+        if frame is None:
+            return []
+        entries = traceback.extract_stack(frame)
+        # 코어 코드 안의 호출 위치를 우선 보여줌 (라이브러리 내부 프레임은 마지막 몇 개만)
+        own = [e for e in entries if e.filename.startswith(CORE_DIR)]
+        picked = own[-4:] + [e for e in entries[-3:] if e not in own]
+        return [f"{e.filename}:{e.lineno} {e.name}" for e in picked]
+
+    @classmethod
+    def _report(cls, seconds: float, stack: List[str]) -> None:
+        from tools.latency_metrics import LatencyMetrics
+        LatencyMetrics.record("event_loop.stall", seconds)
+        with cls._lock:
+            cls._stalls.append({"seconds": round(seconds, 3), "stack": stack})
+        lines = "\n    ".join(stack) if stack else "(스택 없음)"
+        print(f"[LoopWatchdog] 이벤트 루프 {seconds * 1000:.0f}ms 멈춤\n    {lines}")
@@ -0,0 +1,200 @@
+"""
+증거 픽토그램 저장소
+- get_evidence_name_for_prompt가 돌려주는 영어 키워드를 정규화해서 키로 사용
+  ("A Bloody Knife." / "knives bloody" → "bloody knife")
+- 한 번 그린 그림은 data/evidence_resource/pictograms/ 에 보관하고 index.json으로 관리
+- 같은 키워드가 다시 나오면 Replicate 호출 없이 저장된 그림 사용
+- max_entries를 넘으면 가장 오래 안 쓴 그림부터 삭제 (LRU, pin()으로 등록된 그림은 남김)
+- 그림을 쓴 증거 이름(한국어)도 기록해서 같은 이름이면 키워드 변환 LLM 호출도 생략
+
+사용 예시 :
+    path = PictogramStore.get("CCTV footage")          # 없으면 None
+    path = PictogramStore.put("CCTV footage", new_png)  # 파일을 저장소로 옮기고 경로 반환
+    keyword = PictogramStore.keyword_for_name("CCTV 영상")  # 전에 그린 증거 이름이면 키워드, 없으면 None
+    PictogramStore.pin([path])                          # 저장된 사건 번들이 쓰는 그림은 지우지 않음 (unpin으로 해제)
+"""
+import hashlib
+import json
+import os
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterable, Optional
+
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+STORE_DIR = Path("data") / "evidence_resource" / "pictograms"  # 저장소 루트 기준 (picture 경로 형식과 동일)
+INDEX_NAME = "index.json"
+
+_ARTICLES = {"a", "an", "the", "of"}
+_IRREGULAR_PLURALS = {"knives": "knife", "wives": "wife", "leaves": "leaf", "men": "man",
+                      "women": "woman", "children": "child", "teeth": "tooth", "feet": "foot"}
+
+
+def _singular(word: str) -> str:
+    if word in _IRREGULAR_PLURALS:
+        return _IRREGULAR_PLURALS[word]
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 4 and word.endswith(("sses", "xes", "ches", "shes")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def normalize_keyword(keyword: str) -> str:
+    """소문자화, 문장부호/관사 제거, 단수형, 단어 정렬 (순서만 다른 키워드도 같은 키)"""
+    words = re.findall(r"[a-z0-9]+", keyword.lower())
+    words = [_singular(w) for w in words if w not in _ARTICLES]
+    return " ".join(sorted(words))
+
+
+class PictogramStore:
+    _lock = Lock()
+    _index : Dict[str, Dict[str, Any]] = None
+    _names : Dict[str, str] = {}  # 증거 이름 → 정규화된 키
+    _pinned : Counter = Counter()  # 지우면 안 되는 그림 경로 → 참조 수 (사건 풀 번들 등)
+    max_entries : int = int(os.getenv("PICTOGRAM_CACHE_SIZE", "500"))
+    hits : int = 0
+    misses : int = 0
+    evictions : int = 0
+
+    @classmethod
+    def keyword_for_name(cls, name: str) -> Optional[str]:
+        """이 증거 이름으로 그림을 쓴 적이 있으면 그때의 키워드"""
+        with cls._lock:
+            cls._load_index()
+            key = cls._names.get(name.strip())
+            entry = cls._index.get(key) if key else None
+        return entry["keyword"] if entry else None
+
+    @classmethod
+    def get(cls, keyword: str, name: str = None) -> Optional[str]:
+        """저장된 그림의 경로 (저장소 루트 기준 상대 경로). 없으면 None"""
+        key = normalize_keyword(keyword)
+        if not key:
+            return None
+        with cls._lock:
+            index = cls._load_index()
+            entry = index.get(key)
+            if entry is None or not (ROOT_DIR / entry["path"]).is_file():
+                if entry is not None:
+                    del index[key]  # 파일이 지워진 항목 정리
+                cls.misses += 1
+                print(f"[PictogramStore] miss: '{keyword}' → '{key}' | {cls.stats()}")
+                return None
+            entry["last_access"] = time.time()
+            entry["hits"] = entry.get("hits", 0) + 1
+            cls._add_name(key, entry, name)
+            cls.hits += 1
+            cls._save_index()
+        print(f"[PictogramStore] hit: '{keyword}' → {entry['path']} | {cls.stats()}")
+        return entry["path"]
+
+    @classmethod
+    def put(cls, keyword: str, image_path: str, name: str = None) -> str:
+        """새로 그린 그림을 저장소로 옮기고 저장된 경로 반환 (키워드가 비어 있으면 원래 경로 그대로)"""
+        key = normalize_keyword(keyword)
+        if not key:
+            return image_path
+        name = re.sub(r"[^a-z0-9]+", "-", key).strip("-")[:40]
+        path = STORE_DIR / f"{name}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:8]}.png"
+        with cls._lock:
+            (ROOT_DIR / STORE_DIR).mkdir(parents=True, exist_ok=True)
+            source = Path(image_path)
+            os.replace(source if source.is_absolute() else ROOT_DIR / source, ROOT_DIR / path)
+            now = time.time()
+            entry = {
+                "path": path.as_posix(),
+                "keyword": keyword,
+                "names": [],
+                "created_at": now,
+                "last_access": now,
+                "hits": 0,
+            }
+            cls._load_index()[key] = entry
+            cls._add_name(key, entry, name)
+            cls._evict_lru(keep=key)
+            cls._save_index()
+        return path.as_posix()
+
+    @classmethod
+    def pin(cls, paths: Iterable[str]) -> None:
+        """다른 곳(사건 풀 번들 등)에서 경로로 참조하는 그림은 LRU로 지우지 않음"""
+        with cls._lock:
+            cls._pinned.update(Path(p).as_posix() for p in paths)
+
+    @classmethod
+    def unpin(cls, paths: Iterable[str]) -> None:
+        with cls._lock:
+            cls._pinned.subtract(Path(p).as_posix() for p in paths)
+            cls._pinned = +cls._pinned  # 0 이하 항목 정리
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        total = cls.hits + cls.misses
+        return {
+            "entries": len(cls._index or {}),
+            "hits": cls.hits,
+            "misses": cls.misses,
+            "hit_rate": round(cls.hits / total, 2) if total else 0.0,
+            "evictions": cls.evictions,
+        }
+
+    @classmethod
+    def _load_index(cls) -> Dict[str, Dict[str, Any]]:
+        # _lock을 잡은 상태에서 호출
+        if cls._index is None:
+            index_path = ROOT_DIR / STORE_DIR / INDEX_NAME
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    cls._index = json.load(f)
+            except FileNotFoundError:
+                cls._index = {}
+            except ValueError as e:
+                print(f"[PictogramStore] index.json 읽기 실패, 새로 만듦: {e}")
+                cls._index = {}
+            cls._names = {name: key for key, entry in cls._index.items() for name in entry.get("names", [])}
+        return cls._index
+
+    @classmethod
+    def _add_name(cls, key: str, entry: Dict[str, Any], name: Optional[str]) -> None:
+        # _lock을 잡은 상태에서 호출
+        if not name:
+            return
+        name = name.strip()
+        names = entry.setdefault("names", [])
+        if name not in names:
+            names.append(name)
+        cls._names[name] = key
+
+    @classmethod
+    def _save_index(cls) -> None:
+        # _lock을 잡은 상태에서 호출, 임시 파일에 쓴 뒤 교체
+        index_path = ROOT_DIR / STORE_DIR / INDEX_NAME
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = index_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cls._index, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, index_path)
+
+    @classmethod
+    def _evict_lru(cls, keep: str = None) -> None:
+        # _lock을 잡은 상태에서 호출, keep(방금 저장한 키)은 지우지 않음
+        overflow = len(cls._index) - cls.max_entries
+        if overflow <= 0:
+            return
+        from tools.evidence_assets import remove_renditions
+        candidates = sorted(cls._index.items(), key=lambda item: item[1]["last_access"])
+        oldest = [(key, entry) for key, entry in candidates
+                  if key != keep and entry["path"] not in cls._pinned][:overflow]
+        for key, entry in oldest:
+            remove_renditions(entry["path"])
+            (ROOT_DIR / entry["path"]).unlink(missing_ok=True)
+            del cls._index[key]
+            for name in entry.get("names", []):
+                cls._names.pop(name, None)
+            cls.evictions += 1
@@ -3,28 +3,56 @@ from typing import Dict, List, Optional
 
 
 def handler_send_initial_evidence(evidences : List[Evidence]) -> None:
-    """초기 증거 데이터를 WebSocket을 통해 전송하는 함수"""
+    """초기 증거 데이터를 WebSocket을 통해 전송하는 함수 (e-ink 프레임 정보 포함)"""
     from api.manager import sse_manager
+    from tools.eink_frame import EinkFrameStore
     import asyncio
     from dataclasses import asdict
     
     for e in evidences:
         evidence_dict = asdict(e)
+        evidence_dict["rev"] = e.rev
+        evidence_dict["frame"] = EinkFrameStore.render(e)
         asyncio.create_task(sse_manager.add_evidence(evidence_dict))
 
+def handler_reset_evidence() -> None:
+    """새 게임을 시작할 때 이전 게임의 증거/프레임 정리 (새 SSE 구독자에게 이전 게임 증거를 보내지 않도록)"""
+    from api.manager import sse_manager
+    from tools.eink_frame import EinkFrameStore
+
+    sse_manager.reset_evidence()
+    EinkFrameStore.reset()
+
 def handler_send_updated_evidence(evidence: Evidence) -> None:
-    """증거 업데이트 시 WebSocket을 통해 전송하는 함수"""
+    """
+    증거 설명이 추가됐을 때 WebSocket을 통해 전송하는 함수
+    구독자에게는 전체 증거 대신 {id, rev, frame}만 전송 (하드웨어는 새 리비전 프레임을 받아서 그대로 표시)
+    """
     from api.manager import sse_manager
+    from tools.eink_frame import EinkFrameStore
     import asyncio
     from dataclasses import asdict
     
+    frame = EinkFrameStore.render(evidence)
     evidence_dict = asdict(evidence)
-    payload = {
-        "id": evidence_dict.get("id"),
-        "description": evidence_dict.get("description"),
+    evidence_dict["rev"] = evidence.rev
+    evidence_dict["frame"] = frame
+    delta = {
+        "id": evidence.id,
+        "rev": evidence.rev,
+        "frame": frame,
     }
 
-    asyncio.create_task(sse_manager.broadcast("evidence_update", payload))
+    asyncio.create_task(sse_manager.update_evidence(evidence_dict, delta))
+
+def handler_send_evidence_picture(evidence: Evidence) -> None:
+    """증거 이미지가 교체됐을 때 WebSocket을 통해 전송하는 함수"""
+    from api.manager import sse_manager
+    from tools.eink_frame import EinkFrameStore
+    import asyncio
+
+    frame = EinkFrameStore.render(evidence)
+    asyncio.create_task(sse_manager.update_evidence_picture(evidence.id, evidence.picture, frame))
 
 
 
@@ -87,6 +115,16 @@ def run_chain_invoke(chain, as_markdown=False):
     return result
 
 
+async def arun_chain_invoke(chain, as_markdown=False):
+    """run_chain_invoke의 비동기 버전 (chain.ainvoke, 이벤트 루프를 막지 않음)"""
+    result = await chain.ainvoke({})
+    if not isinstance(result, str):
+        result = str(result)
+    if as_markdown:
+        result = markdown_to_html(result)
+    return result
+
+
 def markdown_to_html(markdown_text: str) -> str:
     """
     마크다운 텍스트를 HTML로 변환
@@ -108,6 +146,42 @@ def markdown_to_html(markdown_text: str) -> str:
 
 
 
+class IncrementalMarkdownRenderer:
+    """
+    토큰 단위로 들어오는 마크다운을 HTML로 변환
+    빈 줄로 닫힌 블록은 변환 결과를 캐시하고, 아직 작성 중인 마지막 블록만 매번 다시 변환함
+
+    사용 예시 :
+        renderer = IncrementalMarkdownRenderer()
+        for token in stream:
+            html = renderer.feed(token)   # 지금까지의 전체 HTML
+        html = renderer.close()           # 전체 텍스트 기준 최종 HTML
+    """
+    def __init__(self):
+        self.text = ""
+        self._closed_html = ""
+        self._open_block = ""
+
+    def feed(self, chunk: str) -> str:
+        self.text += chunk
+        self._open_block += chunk
+
+        split_at = self._open_block.rfind("\n\n")
+        if split_at != -1:
+            closed = self._open_block[:split_at]
+            self._open_block = self._open_block[split_at + 2:]
+            if closed.strip():
+                self._closed_html += markdown_to_html(closed)
+
+        if not self._open_block.strip():
+            return self._closed_html
+        return self._closed_html + markdown_to_html(self._open_block)
+
+    def close(self) -> str:
+        # 블록을 넘나드는 목록 등은 조각 변환과 결과가 다를 수 있으므로 마지막에 한 번 전체 변환
+        return markdown_to_html(self.text)
+
+
 async def run_chain_streaming(chain, callback=None):
     full_text = ""
     # chain이 문자열인 경우 run_str_streaming 사용
@@ -165,14 +239,38 @@ def sentence_streamer(
         callback: 문장이 완성될 때마다 호출될 콜백 함수
         sentence_endings: 종결 문자 정규표현식
     """
-    buffer = ""
+    splitter = SentenceSplitter(sentence_endings)
 
     for chunk in stream:
         content = getattr(chunk, "content", chunk)
-        buffer += content
+        for sent in splitter.feed(content):
+            callback(sent)
+
+    # 스트림 종료 시 버퍼가 남아있다면 보냄
+    for sent in splitter.close():
+        callback(sent)
+
+
+class SentenceSplitter:
+    """
+    토큰 단위로 들어오는 텍스트를 문장 단위로 자르는 push 파서 (sync/async 스트림 모두에서 사용)
+
+    사용 예시 :
+        splitter = SentenceSplitter()
+        async for chunk in llm.astream(messages):
+            for sentence in splitter.feed(chunk.content):
+                ...  # 완성된 문장
+        rest = splitter.close()
+    """
+    def __init__(self, sentence_endings: str = r"[.!?。！？]"):
+        self._pattern = re.compile(f"({sentence_endings})")
+        self._buffer = ""
+
+    def feed(self, chunk: str) -> List[str]:
+        self._buffer += chunk
 
         # 문장 끝 기준으로 분리
-        sentences = re.split(f"({sentence_endings})", buffer)
+        sentences = self._pattern.split(self._buffer)
 
         # 짝수 인덱스는 문장 앞부분, 홀수는 종결문자
         complete_sentences = []
@@ -184,16 +282,12 @@ def sentence_streamer(
                 temp = ""
 
         # 아직 끝나지 않은 문장은 버퍼에 다시 저장
-        buffer = temp
+        self._buffer = temp
+        return [sent for sent in complete_sentences if sent]
 
-        # 콜백 호출
-        for sent in complete_sentences:
-            if sent:
-                callback(sent)
-
-    # 스트림 종료 시 버퍼가 남아있다면 보냄
-    if buffer.strip():
-        callback(buffer.strip())
+    def close(self) -> List[str]:
+        rest, self._buffer = self._buffer.strip(), ""
+        return [rest] if rest else []
 
 
 
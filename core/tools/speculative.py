@@ -0,0 +1,109 @@
+"""
+불안정한 단계(등장인물, 증거품)를 후보 k개로 동시에 실행하는 모드
+- 후보가 끝나는 순서대로 검증해서 처음 통과한 결과를 사용하고 나머지 후보는 취소
+- 모두 실패하면 마지막 에러를 그대로 올림
+- chain_config.yaml 의 speculative 섹션에서 켜고 끔 (기본 꺼짐)
+
+통계 (단계별) :
+    failure_rate  : 끝까지 실행된 후보 중 검증 실패 비율
+    latency_saved : 순차 재시도였다면 걸렸을 시간 - 실제 걸린 시간 (누적)
+                    순차 재시도 시간 = 승자 이전에 실패한 후보들의 실행 시간 + 승자의 실행 시간
+
+사용 예시 :
+    if speculative_candidates("evidences") > 1:
+        evidences = await run_speculative("evidences", make_candidate, validate_evidences)
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+from tools.chain_config import get_chain_config
+
+
+T = TypeVar("T")
+
+
+@dataclass
+class SpeculativeStats:
+    runs: int = 0
+    candidates: int = 0         # 끝까지 실행되어 검증한 후보 수
+    failures: int = 0           # 그중 생성/검증 실패 수
+    cancelled: int = 0          # 승자가 나와서 취소된 후보 수
+    all_failed: int = 0         # 모든 후보가 실패한 실행 수
+    latency_saved: float = 0.0  # 초
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / self.candidates if self.candidates else 0.0
+
+    def summary(self) -> str:
+        return (f"실행 {self.runs}회, 후보 {self.candidates}개 중 실패 {self.failures}개 "
+                f"({self.failure_rate * 100:.0f}%), 취소 {self.cancelled}개, "
+                f"전체 실패 {self.all_failed}회, 절약 {self.latency_saved:.1f}초")
+
+
+_stats: Dict[str, SpeculativeStats] = {}
+
+
+def get_speculative_stats() -> Dict[str, SpeculativeStats]:
+    return _stats
+
+
+def speculative_candidates(stage: str) -> int:
+    """단계별 후보 수 (모드가 꺼져 있거나 해당 단계가 대상이 아니면 1)"""
+    conf = get_chain_config("speculative")
+    if not conf.get("enabled", False) or not (conf.get("stages") or {}).get(stage, False):
+        return 1
+    return max(1, int(conf.get("candidates", 3)))
+
+
+async def run_speculative(stage: str,
+                          make_candidate: Callable[[], Awaitable[T]],
+                          validate: Callable[[T], Any],
+                          k: int = None) -> T:
+    """
+    make_candidate()를 k번 동시에 실행하고 validate(result)가 예외 없이 끝난 첫 결과 반환
+    validate는 실패 시 예외를 던지면 됨 (반환값은 무시)
+    """
+    k = k or speculative_candidates(stage)
+    stats = _stats.setdefault(stage, SpeculativeStats())
+    stats.runs += 1
+
+    async def timed():
+        started = time.perf_counter()
+        result = await make_candidate()
+        return result, time.perf_counter() - started
+
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(timed()) for _ in range(k)]
+    failed_time = 0.0
+    last_error = None
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            stats.candidates += 1
+            try:
+                result, run_time = await next_done
+                validate(result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stats.failures += 1
+                failed_time += time.perf_counter() - start
+                last_error = e
+                print(f"[Speculative] {stage} 후보 실패: {e}")
+                continue
+
+            elapsed = time.perf_counter() - start
+            stats.latency_saved += max(0.0, failed_time + run_time - elapsed)
+            print(f"[Speculative] {stage} 후보 {k}개 중 선택 ({elapsed:.1f}초) | {stats.summary()}")
+            return result
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+                stats.cancelled += 1
+
+    stats.all_failed += 1
+    print(f"[Speculative] {stage} 후보 {k}개 모두 실패 | {stats.summary()}")
+    raise last_error
@@ -0,0 +1,168 @@
+"""
+비동기 작업 의존성 그래프(DAG) 실행기
+- 단계(stage)와 의존 관계만 선언하면 의존성이 풀린 단계부터 동시에 실행
+- 동시에 실행되는 단계 수는 max_concurrency로 제한
+- 단계별 결과는 wait(name)으로 await 가능, 단계별 소요 시간은 timings에 기록
+- on_failure(callback)으로 어느 단계든 처음 실패했을 때 한 번 알림 (뒤따라 건너뛴 단계는 제외)
+
+사용 예시 :
+    graph = StageGraph("case", max_concurrency=3)
+    graph.add_stage("case", lambda r: make_case())
+    graph.add_stage("profiles", lambda r: make_profiles(r["case"]), deps=["case"])
+    graph.on_failure(lambda name, e: print(f"{name} 실패: {e}"))
+    graph.start()
+    profiles = await graph.wait("profiles")
+"""
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: Callable[[Dict[str, Any]], Any]  # 의존 단계 결과 dict를 받아 결과(또는 awaitable)를 반환
+    deps: List[str] = field(default_factory=list)
+
+
+@dataclass
+class StageTiming:
+    scheduled_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    status: str = "pending"  # pending, running, done, failed, skipped, cancelled
+
+    @property
+    def wait_time(self) -> float:
+        """의존성/동시성 제한 때문에 대기한 시간(초)"""
+        if self.started_at is None:
+            return 0.0
+        return self.started_at - self.scheduled_at
+
+    @property
+    def run_time(self) -> float:
+        """실제 실행 시간(초)"""
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+
+class StageGraph:
+    def __init__(self, name: str = "pipeline", max_concurrency: int = 3):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.timings: Dict[str, StageTiming] = {}
+        self._stages: Dict[str, Stage] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._semaphore: asyncio.Semaphore = None
+        self._started_at: float = None
+        self._failure_callbacks: List[Callable[[str, BaseException], None]] = []
+        self._failed: bool = False
+        self._reported: bool = False
+
+    def add_stage(self, name: str, fn: Callable[[Dict[str, Any]], Any], deps: List[str] = None) -> "StageGraph":
+        """단계 추가. 의존하는 단계는 먼저 추가되어 있어야 함 (순환 의존 방지)"""
+        if self._tasks:
+            raise RuntimeError(f"[StageGraph:{self.name}] 실행 중에는 단계를 추가할 수 없습니다.")
+        if name in self._stages:
+            raise ValueError(f"[StageGraph:{self.name}] 중복된 단계 이름: {name}")
+        deps = list(deps or [])
+        for dep in deps:
+            if dep not in self._stages:
+                raise ValueError(f"[StageGraph:{self.name}] '{name}'의 의존 단계 '{dep}'가 없습니다.")
+        self._stages[name] = Stage(name, fn, deps)
+        return self
+
+    def start(self) -> "StageGraph":
+        """모든 단계를 태스크로 등록 (이벤트 루프 안에서 호출)"""
+        if self._tasks:
+            return self
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._started_at = time.perf_counter()
+        for stage in self._stages.values():
+            self.timings[stage.name] = StageTiming(scheduled_at=self._started_at)
+            task = asyncio.create_task(self._run_stage(stage), name=f"{self.name}:{stage.name}")
+            task.add_done_callback(self._on_stage_done)
+            self._tasks[stage.name] = task
+        return self
+
+    def on_failure(self, callback: Callable[[str, BaseException], None]) -> "StageGraph":
+        """단계가 처음 실패했을 때 (단계 이름, 예외)로 한 번 호출 (취소는 실패로 보지 않음)"""
+        self._failure_callbacks.append(callback)
+        return self
+
+    def wait(self, name: str) -> Awaitable[Any]:
+        """단계 결과를 기다리는 awaitable 반환 (여러 번 await 가능)"""
+        if name not in self._tasks:
+            raise KeyError(f"[StageGraph:{self.name}] 시작되지 않았거나 없는 단계: {name}")
+        return self._tasks[name]
+
+    async def wait_all(self) -> Dict[str, Any]:
+        """모든 단계가 끝날 때까지 기다리고 성공한 단계의 결과를 반환"""
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        return {
+            name: task.result()
+            for name, task in self._tasks.items()
+            if not task.cancelled() and task.exception() is None
+        }
+
+    def done(self, name: str) -> bool:
+        task = self._tasks.get(name)
+        return task is not None and task.done()
+
+    def cancel(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+
+    def report(self) -> str:
+        """단계별 대기/실행 시간 요약 문자열"""
+        lines = [f"[StageGraph:{self.name}] 단계별 소요 시간"]
+        for name, t in self.timings.items():
+            lines.append(f"  - {name:<12} {t.status:<9} 대기 {t.wait_time:6.2f}s / 실행 {t.run_time:6.2f}s")
+        if self._started_at is not None:
+            end = max((t.finished_at or 0.0) for t in self.timings.values()) if self.timings else self._started_at
+            lines.append(f"  = 전체 {max(end - self._started_at, 0.0):.2f}s")
+        return "\n".join(lines)
+
+    async def _run_stage(self, stage: Stage) -> Any:
+        timing = self.timings[stage.name]
+        try:
+            results = {dep: await self._tasks[dep] for dep in stage.deps}
+        except BaseException:
+            # 의존 단계가 실패하거나 취소되면 이 단계는 실행하지 않음
+            timing.status = "skipped"
+            raise
+
+        async with self._semaphore:
+            timing.started_at = time.perf_counter()
+            timing.status = "running"
+            try:
+                result = stage.fn(results)
+                if inspect.isawaitable(result):
+                    result = await result
+            except asyncio.CancelledError:
+                timing.status = "cancelled"
+                raise
+            except Exception:
+                timing.status = "failed"
+                raise
+            finally:
+                timing.finished_at = time.perf_counter()
+
+        timing.status = "done"
+        return result
+
+    def _on_stage_done(self, task: asyncio.Task) -> None:
+        stage_name = task.get_name().split(":", 1)[-1]
+        if not task.cancelled() and task.exception() is not None and self.timings[stage_name].status == "failed":
+            print(f"[StageGraph:{self.name}] '{stage_name}' 단계 실패: {task.exception()}")
+            if not self._failed:
+                self._failed = True
+                for callback in self._failure_callbacks:
+                    callback(stage_name, task.exception())
+
+        if not self._reported and all(t.done() for t in self._tasks.values()):
+            self._reported = True
+            print(self.report())
@@ -0,0 +1,55 @@
+"""
+체인별 토큰 사용량 / 프롬프트 캐시 적중 집계
+- OpenAI는 1024토큰 이상 같은 앞부분(prefix)으로 시작하는 요청의 입력 토큰을 캐시해서 더 빠르고 싸게 처리함
+- 응답의 usage_metadata.input_token_details.cache_read(= prompt_tokens_details.cached_tokens)로 적중량 확인
+- tools/llm_gateway.py 의 GatewayChatOpenAI가 실제 호출이 끝날 때마다 기록 (스트리밍은 마지막 usage 청크)
+
+사용 예시 :
+    TokenUsageStats.stats("interrogation_answer")
+    # {"calls": 5, "input_tokens": 6200, "cached_tokens": 4096, "uncached_tokens": 2104, "cache_hit_rate": 0.66, ...}
+"""
+from threading import Lock
+from typing import Any, Dict, Optional
+
+
+class TokenUsageStats:
+    _lock = Lock()
+    _chains : Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def record(cls, chain: str, usage: Optional[Dict[str, Any]]) -> None:
+        if not usage:
+            return
+        input_tokens = usage.get("input_tokens", 0)
+        cached = (usage.get("input_token_details") or {}).get("cache_read") or 0
+        output_tokens = usage.get("output_tokens", 0)
+        with cls._lock:
+            entry = cls._chains.setdefault(chain, {
+                "calls": 0, "input_tokens": 0, "cached_tokens": 0, "output_tokens": 0,
+            })
+            entry["calls"] += 1
+            entry["input_tokens"] += input_tokens
+            entry["cached_tokens"] += cached
+            entry["output_tokens"] += output_tokens
+        print(f"[TokenUsage] {chain} 입력 {input_tokens} (캐시 {cached} / 미캐시 {input_tokens - cached}), 출력 {output_tokens}")
+
+    @classmethod
+    def stats(cls, chain: Optional[str] = None) -> Dict[str, Any]:
+        """체인 하나 또는 전체({체인: 집계})의 집계"""
+        with cls._lock:
+            if chain is not None:
+                return cls._summary(cls._chains.get(chain, {}))
+            return {name: cls._summary(entry) for name, entry in cls._chains.items()}
+
+    @staticmethod
+    def _summary(entry: Dict[str, int]) -> Dict[str, Any]:
+        input_tokens = entry.get("input_tokens", 0)
+        cached = entry.get("cached_tokens", 0)
+        return {
+            "calls": entry.get("calls", 0),
+            "input_tokens": input_tokens,
+            "cached_tokens": cached,
+            "uncached_tokens": input_tokens - cached,
+            "output_tokens": entry.get("output_tokens", 0),
+            "cache_hit_rate": round(cached / input_tokens, 2) if input_tokens else 0.0,
+        }
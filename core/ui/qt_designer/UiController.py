@@ -44,6 +44,8 @@ class UiController(QObject):
         UiController._instance = self
         self.game_controller = GameController.get_instance()
         self.isTurnProsecutor = True # 처음에는 검사 턴으로 시작
+        self.generateWindowInstance = None
+        self.isCaseStreaming = False # 사건 개요를 토큰 단위로 받는 중인지
 
         self.descriptionWindowInstance = GameDescriptionWindow(self._instance)
         self.startWindowInstance = StartWindow(self._instance, self.game_controller)
@@ -147,7 +149,27 @@ class UiController(QObject):
             else: 
                 # 케이스만 생성된 상태 - generateWindow만 생성
                 self.case_data = self.game_controller._case_data
-                self.generateWindowInstance = GenerateWindow(self._instance, self.case_data.case.outline)
+                if self.isCaseStreaming:
+                    # 스트리밍으로 이미 열려 있는 창에 최종 HTML 반영
+                    self.isCaseStreaming = False
+                    self.generateWindowInstance.finish_stream(self.case_data.case.outline)
+                else:
+                    self.generateWindowInstance = GenerateWindow(self._instance, self.case_data.case.outline)
+
+        elif code == "case_stream":
+            # 사건 개요 첫 토큰이 오면 바로 생성 화면을 띄우고 이후 토큰은 이어서 표시
+            if not self.isCaseStreaming:
+                self.isCaseStreaming = True
+                self.generateWindowInstance = GenerateWindow(self._instance, "", streaming=True)
+                self.open_generate_window()
+                self.startWindowInstance.close()
+            self.generateWindowInstance.update_stream(arg)
+        elif code == "profile":
+            # 등장인물이 하나씩 완성될 때마다 생성 중에 떠 있는 사건 설명 화면에 표시
+            # (case_data는 "initialized"에서만 설정, 재판 화면은 그때 새로 만듦)
+            window = getattr(self, "generateWindowInstance", None)
+            if window is not None:
+                window.add_profile(arg)
         elif code == "no_context":
             if isinstance(arg, dict):
                 self.warningWindowInstance.set_label_text(arg.get("message"))
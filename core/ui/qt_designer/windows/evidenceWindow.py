@@ -5,6 +5,8 @@ from PyQt5.QtGui import QPixmap
 from PyQt5 import uic
 from typing import List
 from data_models import Evidence 
+from tools.evidence_assets import rendition_path
+from tools.local_pictogram import render_local_pictogram
 
 class EvidenceWindow(QDialog):
     """생성자에 evidence 리스트랑 부모 윈도우 받기"""
@@ -48,10 +50,11 @@ class EvidenceWindow(QDialog):
             evidence_labels[i].setText(evidence.name)
             evidence_descriptions[i].setText("\n".join(evidence.description))
 
-            image_path = default_path + "/" + str(evidence.picture)
-            if not(os.path.exists(image_path)):
-                image_path = default_path + "/data/evidence_resource/deafult_image.png"
-            evidence_images[i].setPixmap(QPixmap(f"{image_path}").scaled(90, 90))
+            # 90px 썸네일 렌디션을 그대로 사용 (이미지가 없으면 로컬 픽토그램의 썸네일)
+            thumb = rendition_path(evidence.picture, "thumb")
+            if thumb is None:
+                thumb = rendition_path(render_local_pictogram(evidence.name), "thumb")
+            evidence_images[i].setPixmap(QPixmap(default_path + "/" + thumb))
             
         
 # 테스트용 메인 함수
@@ -6,10 +6,13 @@ import asyncio
 
 class GenerateWindow(QDialog):
     # 뒤로가기 시그널
-    def __init__(self, uiController, case_outline , parent=None):
+    def __init__(self, uiController, case_outline , streaming=False, parent=None):
+        """streaming=True이면 타자 효과 없이 update_stream()으로 들어오는 HTML을 그대로 표시"""
         super().__init__(parent)
         self.uc = uiController
         self.case_outline = case_outline
+        self.streaming = streaming
+        self.profiles = []
         
         # UI 파일 로드
         ui_path = os.path.join(os.path.dirname(__file__), '..', 'generateWindow.ui')
@@ -32,7 +35,8 @@ class GenerateWindow(QDialog):
         """)
         
         self.typewriter = Typewriter(update_fn=self.overviewText.setHtml, html_mode=True)
-        self.typewriter.enqueue(self.case_outline)
+        if not self.streaming:
+            self.typewriter.enqueue(self.case_outline)
     
     def _setup_connections(self):
         """버튼 연결 설정"""
@@ -48,6 +52,23 @@ class GenerateWindow(QDialog):
     def update_overview_text(self, text):
         """사건 개요 텍스트 업데이트 (typewriter용)"""
         self.overviewText.setHtml(text)
+
+    def update_stream(self, html):
+        """스트리밍 중인 사건 개요 HTML 표시 (항상 마지막 줄이 보이도록 스크롤)"""
+        self.overviewText.setHtml(html)
+        scroll_bar = self.overviewText.verticalScrollBar()
+        scroll_bar.setValue(scroll_bar.maximum())
+
+    def finish_stream(self, html):
+        """스트리밍 종료 시 전체 텍스트 기준으로 변환한 최종 HTML 표시"""
+        self.case_outline = html
+        self.overviewText.setHtml(html)
+
+    def add_profile(self, profile):
+        """생성 중 완성된 등장인물을 상단 제목에 표시"""
+        self.profiles.append(profile)
+        names = ", ".join(p.name for p in self.profiles)
+        self.caseGenerateLabel.setText(f"사건 설명 (등장인물 : {names})")
     
 
 
@@ -1,22 +1,22 @@
 import os
 import time
+import asyncio
 from pathlib import Path
 from docx import Document
 from tqdm import tqdm
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from langchain_openai import OpenAIEmbeddings
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_pinecone import PineconeVectorStore
 from pinecone import Pinecone
 from dotenv import load_dotenv
+from tools.llm_gateway import get_llm
 
 # 환경 변수 로드
 load_dotenv()
 
-def get_llm(model="gpt-4o"):
-    llm = ChatOpenAI(model=model)  
-    return llm
+
 
 def extract_text_from_docx(docx_path):
     """
@@ -300,10 +300,26 @@ def get_judge_result(message_list):
     """
     형법을 참고하여 판결 결과 생성
     """
+    chain, inputs = _prepare_judgement(message_list)
+    return chain.invoke(inputs)
+
+async def aget_judge_result(message_list):
+    """
+    get_judge_result의 비동기 버전 (UI 이벤트 루프를 막지 않음)
+    - Pinecone 확인/검색은 동기 클라이언트라서 별도 스레드에서 실행
+    - 판결 LLM 호출은 ainvoke
+    """
+    chain, inputs = await asyncio.to_thread(_prepare_judgement, message_list)
+    return await chain.ainvoke(inputs)
+
+def _prepare_judgement(message_list):
+    """
+    판결 체인과 입력값 준비 (형법 검색 포함, 네트워크 I/O가 있는 동기 함수)
+    """
     # 형법 데이터베이스 자동 설정 (필요시에만)
     db_ready = auto_setup_criminal_law_db()
     
-    llm = get_llm()
+    llm = get_llm(model="gpt-4o", chain="judge")
     
     # 형법 검색 및 컨텍스트 생성
     criminal_law_context = ""
@@ -350,18 +366,18 @@ def get_judge_result(message_list):
     # 메시지 포맷팅
     messages_joined = "\n".join([f"[{m['role']}]: {m['content']}" for m in message_list if m['role'] in ['검사', '변호사']])
     
-    # 체인 생성 및 실행
+    # 체인 생성
     chain = prompt | llm | StrOutputParser()
     
     if criminal_law_context:
-        result = chain.invoke({
+        inputs = {
             "messages": messages_joined,
             "criminal_law_context": criminal_law_context
-        })
+        }
     else:
-        result = chain.invoke({"messages": messages_joined})
+        inputs = {"messages": messages_joined}
     
-    return result
+    return chain, inputs
 
 # 테스트 사례 추가
 def get_test_case_messages():
@@ -3,7 +3,14 @@ import asyncio
 import websockets
 import json
 from data_models import Evidence
-from devices.eink_display import update_and_sand_image
+from devices.eink_display import update_and_sand_image, send_frame
+
+CORE_URL = "http://localhost:8000"
+
+# 증거 id → 마지막으로 보낸 프레임 리비전 (늦게 도착한 이전 리비전은 건너뜀)
+_frame_revs = {}
+# 증거 id → asyncio.Lock (SSE 줄마다 태스크를 만들므로 같은 증거의 이벤트는 받은 순서대로 하나씩 처리)
+_frame_locks = {}
 
 # 나중에 도커로 돌릴 때는 host를 localhost가 아닌 도커 컨테이너 core 로 바꿔주세용 
 async def listen_sse_async():
@@ -36,6 +43,15 @@ async def sse_data_handler(raw_data: str):
     try:
         parsed = json.loads(data)
         evidence_id = parsed.get("id")  # ID를 미리 추출
+        if parsed.get("frame"):
+            # 코어가 그린 프레임이 있으면 받아서 그대로 전송 (증거 생성 / 설명 추가 delta / 그림 교체)
+            is_delta = "name" not in parsed and "picture" not in parsed
+            if "name" in parsed:
+                # 새 증거(새 게임이면 id와 리비전이 1부터 다시 시작)는 이전 리비전 기록을 지움
+                _frame_revs.pop(evidence_id, None)
+            if await apply_evidence_frame(evidence_id, parsed["frame"]) and not is_delta:
+                asyncio.create_task(evidence_ack(id=str(evidence_id), status="received"))
+            return parsed
         filtered = {
             "name": parsed["name"],
             "type": parsed["type"],
@@ -49,13 +65,52 @@ async def sse_data_handler(raw_data: str):
         # update_and_sand_image(evidence.id, evidence)
         await asyncio.to_thread(update_and_sand_image, evidence.id, evidence) #blocking 부분 스레드로 처리
         return evidence
-    except (json.JSONDecodeError, KeyError) as e:
+    except (json.JSONDecodeError, KeyError, httpx.HTTPError) as e:
         print(f"[HW/sse] sse data convert error: {e}")
         # evidence_id가 있으면 failed ack 전송
         if evidence_id is not None:
             asyncio.create_task(evidence_ack(id=str(evidence_id), status="failed"))
         return None
 
+async def apply_evidence_frame(evidence_id: int, frame_info: dict) -> bool:
+    """
+    프레임 정보({rev, url})의 15000바이트 프레임을 받아서 디스플레이로 전송
+    - 디스플레이 펌웨어는 전체 프레임만 받으므로 설명 추가도 전체 프레임을 보냄
+    - 이미 더 새 리비전을 보냈으면 건너뜀, 코어가 409(리비전 지남)를 주면 최신 상태로 재동기화
+    """
+    lock = _frame_locks.setdefault(evidence_id, asyncio.Lock())
+    async with lock:
+        rev = frame_info["rev"]
+        last_rev = _frame_revs.get(evidence_id)
+        if last_rev is not None and rev < last_rev:
+            print(f"[HW/sse] 증거 {evidence_id} 이전 리비전 건너뜀 (보유 {last_rev}, 수신 {rev})")
+            return False
+        try:
+            frame = await fetch_frame(frame_info["url"])
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code != 409:
+                raise
+            print(f"[HW/sse] 증거 {evidence_id} rev {rev} 프레임이 지났음, 재동기화")
+            state = await fetch_evidence_state(evidence_id)
+            rev = state["frame"]["rev"]
+            frame = await fetch_frame(state["frame"]["url"])
+        _frame_revs[evidence_id] = rev
+        await asyncio.to_thread(send_frame, evidence_id, frame)
+        return True
+
+async def fetch_evidence_state(evidence_id: int) -> dict:
+    async with httpx.AsyncClient() as client:
+        response = await client.get(f"{CORE_URL}/evidence/{evidence_id}/state")
+        response.raise_for_status()
+        return response.json()
+
+async def fetch_frame(url: str) -> bytes:
+    """코어의 e-ink 프레임 엔드포인트에서 15000바이트 프레임 수신"""
+    async with httpx.AsyncClient() as client:
+        response = await client.get(CORE_URL + url)
+        response.raise_for_status()
+        return response.content
+
 async def handle_button_press(press_id: str):
     try:
         async with httpx.AsyncClient() as client:
@@ -33,6 +33,18 @@ def update_and_sand_image(epd_index: int, evidence: Evidence):
     return
 
 
+# 코어에서 미리 그린 프레임(미러링 + 1-bit 패킹, 15000 bytes)을 그대로 전송
+def send_frame(epd_index: int, frame: bytes):
+    try:
+        epd_mac = EPD_MacAddress[epd_index]
+        rfcomm = bind_rfcomm(epd_index, epd_mac)
+        send_bytes_over_serial(rfcomm, np.frombuffer(frame, dtype=np.uint8))
+    except Exception as e:
+        print(f"[HW/EPD] epd frame send error: {e}")
+        traceback.print_exc()
+    return
+
+
 def bind_rfcomm(epd_index, mac_addr): #바인딩 이후, RFCOMM_DEV를 USBSerial처럼 사용
     epd_rfcomm = f"{RFCOMM_DEV}{epd_index - 1}"
     if not os.path.exists(epd_rfcomm):